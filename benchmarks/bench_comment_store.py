@@ -0,0 +1,126 @@
+##### store_comments 벤치마크: 댓글이 이미 N개(기본 100만, 1000만) 저장된 DB에 100개짜리 페이지를 저장하는 시간 #####
+# 비교 대상
+#   - 지금 방식: 페이지의 댓글 ID로 한 번에 조회 (comment_id 인덱스) --> 새 댓글과 바뀐 댓글만 executemany로 upsert
+#   - 예전 방식: 댓글마다 [영상ID + 작성자채널ID + 작성시간]으로 SELECT 후 UPDATE/INSERT
+#     (예전 DB에는 이 키의 인덱스가 없었으므로 NOT INDEXED로 그때처럼 전체 검색, --old-indexed면 지금의 idx_comments_legacy_key 사용)
+# 경우: 새 댓글 / 그대로인 댓글 / 내용이 수정된 댓글 (모두 댓글이 가장 많은 영상 하나의 페이지)
+# 실행: python benchmarks/bench_comment_store.py --rows 1000000 10000000 (1000만 개는 DB 약 8GB, 채우는 데 3분 이상)
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from common import file_size, load_module, quiet, use_database
+
+PAGE_SIZE = 100
+BASE_EPOCH = 1672531200 # 2023-01-01T00:00:00Z
+
+
+def seed_row(n: int, video_id: str) -> tuple: # 채워 둘 n번째 댓글 (video_id, comment_id, parent_id, comment, author_name, author_channel_id, author_channel_url, comment_time_kst)
+    author = f"UC{n % 50000:022d}"
+    time_kst = time.strftime("%Y-%m-%dT%H:%M:%S+0900", time.gmtime(BASE_EPOCH + 9 * 3600 + n))
+    return (video_id, f"Ugx{n:020d}", "", f"벤치마크 댓글 {n} 입니다. 좋은 영상 감사합니다", f"@user{n % 50000}", author, f"https://www.youtube.com/channel/{author}", time_kst)
+
+
+def seed(ym, total: int, target_rows: int) -> None: # 댓글 total개를 채움 (앞의 target_rows개는 target 영상, 나머지는 영상마다 1만 개씩)
+    cur = ym.conn.cursor()
+    indexes = cur.execute("SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = 'comments' AND sql IS NOT NULL").fetchall()
+    for name, _ in indexes: # 인덱스는 다 채운 뒤 한 번에 만드는 것이 훨씬 빠름
+        cur.execute(f"DROP INDEX {name}")
+    rows = (seed_row(n, "vidBenchTarget" if n < target_rows else f"vidBench{n // 10000:06d}") for n in range(total))
+    cur.executemany(
+        "INSERT INTO comments (video_id, comment_id, parent_id, comment, author_name, author_channel_id, author_channel_url, comment_time_kst, revision_count) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0)",
+        rows,
+    )
+    for _, sql in indexes:
+        cur.execute(sql)
+    ym.conn.commit()
+    cur.execute("ANALYZE")
+    ym.conn.commit()
+
+
+def old_store_comments(ym, rows: list, indexed: bool) -> None: # user-017 이전의 store_comments (댓글마다 SELECT 후 UPDATE 또는 INSERT)
+    table = "comments" if indexed else "comments NOT INDEXED"
+    cur = ym.conn.cursor()
+    for vid, _, _, comment_text, author_name, author_channel_id, author_channel_url, comment_time_kst in rows:
+        cur.execute(
+            f"SELECT comment, author_name, author_channel_url, comment_time_kst, revised_contents FROM {table} WHERE video_id = ? AND author_channel_id = ? AND comment_time_kst = ?",
+            (vid, author_channel_id, comment_time_kst),
+        )
+        existing = cur.fetchone()
+        if existing is None:
+            cur.execute(
+                "INSERT INTO comments (video_id, comment, author_name, author_channel_id, author_channel_url, comment_time_kst, revised_contents) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (vid, comment_text, author_name, author_channel_id, author_channel_url, comment_time_kst, ""),
+            )
+        elif existing[0] != comment_text:
+            cur.execute(
+                f"UPDATE {table} SET comment = ?, revised_contents = ? WHERE video_id = ? AND author_channel_id = ? AND comment_time_kst = ?",
+                (comment_text, (existing[4] or "") + f"[1] (comment: {existing[0]} --> {comment_text})", vid, author_channel_id, comment_time_kst),
+            )
+    ym.conn.commit()
+
+
+def make_pages(kind: str, start: int, pages: int) -> list: # kind별 페이지 목록 (seed_row의 start번째부터 PAGE_SIZE개씩)
+    result = []
+    for p in range(pages):
+        rows = []
+        for n in range(start + p * PAGE_SIZE, start + (p + 1) * PAGE_SIZE):
+            row = seed_row(n, "vidBenchTarget")
+            if kind == "new": # 아직 없는 댓글: 다른 ID, 다른 작성 시간
+                row = (row[0], f"Ugn{n:020d}", "", row[3], row[4], row[5], row[6], time.strftime("%Y-%m-%dT%H:%M:%S+0900", time.gmtime(BASE_EPOCH - n)))
+            elif kind == "edited":
+                row = (*row[:3], row[3] + " (수정됨)", *row[4:])
+            rows.append(row)
+        result.append(rows)
+    return result
+
+
+def measure(store, pages: list) -> float: # 페이지 하나를 저장하는 데 걸린 시간의 중앙값(ms)
+    times = []
+    for rows in pages:
+        started = time.perf_counter()
+        with quiet():
+            store(rows)
+        times.append((time.perf_counter() - started) * 1000)
+    return statistics.median(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="store_comments: 지금 방식(ID로 한 번에 upsert)과 예전 방식(댓글마다 SELECT)의 페이지 저장 시간 비교")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 10_000_000], help="미리 채워 둘 댓글 수")
+    parser.add_argument("--pages", type=int, default=20, help="지금 방식으로 경우마다 저장할 페이지 수")
+    parser.add_argument("--old-pages", type=int, default=1, help="예전 방식으로 경우마다 저장할 페이지 수 (인덱스 없이 전체 검색하므로 오래 걸림, 0이면 생략)")
+    parser.add_argument("--old-indexed", action="store_true", help="예전 방식도 지금의 idx_comments_legacy_key 인덱스를 사용")
+    parser.add_argument("--workdir", default="", help="DB를 만들 폴더 (기본: 임시 폴더)")
+    args = parser.parse_args()
+
+    ym = load_module(args.workdir or tempfile.mkdtemp(prefix="ytm-bench-comments-"))
+    for total in args.rows:
+        path = os.path.abspath(f"comments_{total}.db")
+        for p in (path, path + "-wal", path + "-shm"):
+            if os.path.exists(p):
+                os.remove(p)
+        use_database(ym, path)
+        target_rows = max(total // 10, 3 * PAGE_SIZE * (args.pages + args.old_pages))
+        started = time.perf_counter()
+        seed(ym, total, target_rows)
+        print(f"\n📊 댓글 {total:,}개 (한 영상에 {target_rows:,}개) 채움: {time.perf_counter() - started:.0f}초 / DB {file_size(path) / 1024 / 1024:.0f}MB")
+
+        # 경우마다 서로 다른 댓글을 사용 (지금 방식이 먼저 쓴 값이 예전 방식의 측정에 영향을 주지 않도록)
+        step = PAGE_SIZE * (args.pages + args.old_pages)
+        for i, kind in enumerate(("new", "unchanged", "edited")):
+            pages = make_pages(kind, i * step, args.pages + args.old_pages)
+            now_ms = measure(lambda rows: ym.store_comments("vidBenchTarget", rows), pages[:args.pages])
+            line = f"  --> {kind:9s}: 지금 방식 {now_ms:8.1f}ms/페이지"
+            if args.old_pages:
+                old_ms = measure(lambda rows: old_store_comments(ym, rows, args.old_indexed), pages[args.pages:])
+                line += f" / 예전 방식{'(인덱스 사용)' if args.old_indexed else ''} {old_ms:10.1f}ms/페이지 ({old_ms / now_ms:,.0f}배)"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+##### 영상 ID 수집 벤치마크: 같은 (검색어, 필터)로 http 방식(collect_video_ids_via_http)과 selenium 방식(scroll_and_collect_video_ids) 비교 #####
+# 방식마다 따로 프로세스를 띄워 실행하고, 그 프로세스와 자식 프로세스(chromedriver, 크롬의 모든 프로세스) RSS 합계의 최댓값과 걸린 시간을 잼
+# 네트워크와 크롬이 필요하고 /proc를 읽으므로 리눅스에서만 동작
+# 실행: python benchmarks/bench_discovery.py --query DFRC --filter "업로드 날짜" --repeat 3
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from typing import Optional
+
+from common import load_module, process_tree_rss
+
+SAMPLE_INTERVAL = 0.1 # RSS를 재는 간격(초)
+
+
+def run_backend(backend: str, query: str, sp: str) -> None: # 자식 프로세스에서 실행: 한 방식으로 ID를 수집하고 결과를 JSON 한 줄로 출력
+    ym = load_module()
+    ym.BROWSER_DAEMON_ADDRESS = "" # 데몬의 크롬은 이 프로세스의 자식이 아니라 RSS에 잡히지 않으므로 항상 크롬을 직접 실행
+    started = time.perf_counter()
+    if backend == "http":
+        ids = ym.collect_video_ids_via_http(query, sp, label=query)
+    else:
+        try:
+            ids = ym.scroll_and_collect_video_ids(query, sp)
+        finally:
+            ym.release_driver()
+    print(json.dumps({"ids": ids, "sec": time.perf_counter() - started}))
+
+
+def measure(backend: str, query: str, sp: str) -> Optional[dict]: # 자식 프로세스로 한 방식을 실행하고 걸린 시간과 RSS 최댓값 반환, 실패하면 None
+    started = time.perf_counter()
+    child = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "--run", backend, "--query", query, "--sp", sp],
+        stdout=subprocess.PIPE, text=True,
+    )
+    peak = {"rss": 0}
+
+    def sample() -> None:
+        while child.poll() is None:
+            peak["rss"] = max(peak["rss"], process_tree_rss(child.pid))
+            time.sleep(SAMPLE_INTERVAL)
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    out, _ = child.communicate()
+    wall = time.perf_counter() - started
+    sampler.join()
+    if child.returncode != 0:
+        print(f"[Error! {backend} 방식 실행 실패 (종료 코드 {child.returncode})]")
+        return None
+    result = json.loads(out.strip().splitlines()[-1])
+    return {"ids": result["ids"], "collect_sec": result["sec"], "wall_sec": wall, "peak_rss": peak["rss"]}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="영상 ID 수집: http 방식과 selenium 방식의 시간, 최대 메모리(RSS, 크롬 포함) 비교")
+    parser.add_argument("--query", default="DFRC")
+    parser.add_argument("--filter", default="업로드 날짜", help="SEARCH_FILTERS의 필터 이름")
+    parser.add_argument("--sp", default="", help="필터 대신 sp 값을 직접 지정")
+    parser.add_argument("--repeat", type=int, default=3, help="방식마다 번갈아 실행할 횟수")
+    parser.add_argument("--run", choices=["http", "selenium"], help=argparse.SUPPRESS) # 자식 프로세스용
+    args = parser.parse_args()
+
+    if args.run:
+        run_backend(args.run, args.query, args.sp)
+        return
+
+    sp = args.sp or load_module().SEARCH_FILTERS[args.filter]
+    results = {"http": [], "selenium": []}
+    for n in range(args.repeat):
+        for backend in ("http", "selenium") if n % 2 == 0 else ("selenium", "http"): # 순서에 따른 캐시 영향을 줄이기 위해 번갈아 실행
+            r = measure(backend, args.query, sp)
+            if r is None:
+                continue
+            results[backend].append(r)
+            print(f"  --> [{backend}] {n + 1}회차: 영상 {len(r['ids'])}개 / 수집 {r['collect_sec']:.2f}초 (프로세스 전체 {r['wall_sec']:.2f}초) / 최대 RSS {r['peak_rss'] / 1024 / 1024:.0f}MB")
+
+    print(f"\n📊 [{args.query} / sp={sp}] {args.repeat}회 평균")
+    for backend, runs in results.items():
+        if not runs:
+            continue
+        collect_sec = sum(r["collect_sec"] for r in runs) / len(runs)
+        wall_sec = sum(r["wall_sec"] for r in runs) / len(runs)
+        videos = sum(len(r["ids"]) for r in runs) / len(runs)
+        peak_rss = max(r["peak_rss"] for r in runs)
+        print(f"  --> {backend:8s}: 수집 {collect_sec:.2f}초 / 프로세스 전체 {wall_sec:.2f}초 / 최대 RSS {peak_rss / 1024 / 1024:.0f}MB / 영상 {videos:.0f}개")
+    http_ids = set().union(*(r["ids"] for r in results["http"]))
+    selenium_ids = set().union(*(r["ids"] for r in results["selenium"]))
+    print(f"  --> 두 방식 모두 찾은 영상 {len(http_ids & selenium_ids)}개 / http만 {len(http_ids - selenium_ids)}개 / selenium만 {len(selenium_ids - http_ids)}개")
+
+
+if __name__ == "__main__":
+    main()
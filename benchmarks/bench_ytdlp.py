@@ -0,0 +1,88 @@
+##### yt-dlp 메타데이터 추출 벤치마크: 같은 영상 목록으로 영상 1개당 추출 시간 비교 #####
+# 비교 대상
+#   - 예전 방식(user-009 이전): 영상마다 yt_dlp.YoutubeDL(ydl_opts)를 새로 만들고 전체 처리(포맷 목록, DASH/HLS 매니페스트, 플레이어 JS)
+#   - 지금 방식: extract_video_info (스레드마다 YoutubeDL 하나를 재사용, YTDLP_METADATA_ONLY = True)
+# 영상마다 두 방식을 번갈아 먼저 실행해 순서에 따른 영향을 줄임 (네트워크 필요)
+# 실행: python benchmarks/bench_ytdlp.py --ids VIDEO_ID1 VIDEO_ID2 ... 또는 --ids-file ids.txt
+#       (ID를 주지 않으면 QUERIES의 첫 검색어로 최근 1시간 영상을 --limit개까지 찾아서 사용)
+
+import argparse
+import statistics
+import time
+
+from common import load_module, quiet
+
+OLD_YDL_OPTS = { # user-009 이전의 ydl_opts
+    "quiet": True,
+    "skip_download": True,
+    "forcejson": True,
+    "extract_flat": False,
+}
+
+
+def extract_old(ym, video_url: str) -> dict: # 예전 방식: 영상마다 새 YoutubeDL, 전체 처리
+    with ym.yt_dlp.YoutubeDL(OLD_YDL_OPTS) as ydl:
+        return ydl.extract_info(video_url, download=False)
+
+
+def extract_new(ym, video_url: str) -> dict: # 지금 방식
+    return ym.extract_video_info(video_url)
+
+
+def summarize(name: str, times: list, errors: int) -> None: # 영상 1개당 추출 시간 통계 출력
+    if not times:
+        print(f"  --> {name}: 성공한 영상 없음 (실패 {errors}개)")
+        return
+    ordered = sorted(times)
+    p90 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.9))]
+    print(
+        f"  --> {name}: 평균 {statistics.mean(times):.2f}초 / 중앙값 {statistics.median(times):.2f}초 / "
+        f"p90 {p90:.2f}초 / 최대 {max(times):.2f}초 / 합계 {sum(times):.1f}초 (영상 {len(times)}개, 실패 {errors}개)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="yt-dlp: 영상마다 새 YoutubeDL + 전체 처리(예전)와 재사용 + 메타데이터만 추출(지금)의 영상 1개당 시간 비교")
+    parser.add_argument("--ids", nargs="*", default=[], help="영상 ID 목록")
+    parser.add_argument("--ids-file", default="", help="한 줄에 영상 ID 하나씩 적힌 파일")
+    parser.add_argument("--limit", type=int, default=20, help="ID를 주지 않았을 때 검색으로 찾을 영상 수")
+    parser.add_argument("--repeat", type=int, default=1, help="영상 목록을 반복할 횟수")
+    args = parser.parse_args()
+
+    ym = load_module()
+    ym.YTDLP_METADATA_ONLY = True
+    ids = list(args.ids)
+    if args.ids_file:
+        with open(args.ids_file, encoding="utf-8") as f:
+            ids += [line.strip() for line in f if line.strip()]
+    if not ids:
+        query = ym.QUERIES[0]["query"]
+        with quiet():
+            ids = ym.collect_video_ids_via_http(query, ym.SEARCH_FILTERS["업로드 날짜"], label=query)[:args.limit]
+        print(f"🔍 [{query}] 최근 1시간 영상 {len(ids)}개로 측정")
+
+    paths = {"예전 방식(새 YoutubeDL + 전체 처리)": extract_old, "지금 방식(재사용 + 메타데이터만)": extract_new}
+    times = {name: [] for name in paths}
+    errors = {name: 0 for name in paths}
+    for n in range(args.repeat):
+        for i, vid in enumerate(ids):
+            video_url = f"https://www.youtube.com/watch?v={vid}"
+            order = list(paths.items()) if (i + n) % 2 == 0 else list(paths.items())[::-1]
+            for name, extract in order:
+                started = time.perf_counter()
+                try:
+                    extract(ym, video_url)
+                except Exception as e:
+                    errors[name] += 1
+                    print(f"[Error! {name} 추출 실패] {vid}: {e}")
+                    continue
+                times[name].append(time.perf_counter() - started)
+
+    print(f"\n📊 영상 {len(ids)}개 x {args.repeat}회, 영상 1개당 추출 시간")
+    for name in paths:
+        summarize(name, times[name], errors[name])
+    ym.release_ydl()
+
+
+if __name__ == "__main__":
+    main()
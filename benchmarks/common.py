@@ -0,0 +1,63 @@
+##### 벤치마크 공통 설정 #####
+# 벤치마크는 오래 걸리거나 네트워크, 크롬을 사용하므로 python -m pytest에 포함하지 않고 따로 실행
+# 실행: 저장소 최상위 폴더에서 python benchmarks/<파일 이름>.py --help
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_module(workdir: str = ""): # youtube_monitoring 모듈 (import할 때 만드는 DB 파일은 workdir(기본: 임시 폴더)에 생성)
+    os.chdir(workdir or tempfile.mkdtemp(prefix="ytm-bench-"))
+    if ROOT_DIR not in sys.path:
+        sys.path.insert(0, ROOT_DIR)
+    with contextlib.redirect_stdout(io.StringIO()): # 마이그레이션 로그는 출력하지 않음
+        import youtube_monitoring
+    return youtube_monitoring
+
+
+def use_database(ym, path: str) -> None: # 모듈이 쓰는 DB를 path 파일로 바꾸고 마이그레이션 적용
+    ym.conn.close()
+    ym.DATABASE_FILE = path
+    ym.conn = ym.connect_db()
+    ym.cursor = ym.conn.cursor(ym.BusyRetryCursor)
+    with contextlib.redirect_stdout(io.StringIO()):
+        ym.run_migrations(ym.conn)
+
+
+def quiet(): # 페이지마다 찍는 로그가 측정 결과를 가리지 않도록 stdout을 버림
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def file_size(path: str) -> int: # DB 파일 크기 (WAL 파일 포함)
+    return sum(os.path.getsize(p) for p in (path, path + "-wal") if os.path.exists(p))
+
+
+def process_tree_rss(pid: int) -> int: # pid와 그 자식 프로세스(크롬, chromedriver 포함)의 RSS 합계(바이트), 리눅스의 /proc에서 읽음
+    children: dict = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue # 그 사이에 종료된 프로세스
+        children.setdefault(ppid, []).append(int(entry))
+
+    total = 0
+    stack = [pid]
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    while stack:
+        current = stack.pop()
+        try:
+            with open(f"/proc/{current}/statm") as f:
+                total += int(f.read().split()[1]) * page_size
+        except (OSError, IndexError, ValueError):
+            continue
+        stack.extend(children.get(current, []))
+    return total
@@ -0,0 +1,164 @@
+##### DB 크기 재현 벤치마크: 영상 info dict의 시간별 스냅샷을 store_video_metadata로 저장하며 이력 저장 방식별 DB 크기 비교 #####
+# 스냅샷: tests/fixtures/ytdlp_info_full.json을 바탕으로 영상 --videos개를 --hours시간 동안 매시간 다시 수집한 것처럼 만듦
+#   - 매시간: 조회수, 좋아요 수, 댓글 수, 구독자 수가 바뀜 (video_stats)
+#   - 영상마다 --edit-every시간에 한 번꼴로 설명의 한 줄을 고치거나 덧붙이고, 그중 몇 번은 태그나 제목도 바꿈
+#   - --whole-info면 raw_json에 info dict 전체를 저장 (RAW_JSON_FIELDS = None, 포맷 URL의 서명이 매시간 바뀜)
+# 비교 대상 (같은 스냅샷을 DB 파일 하나씩에 저장)
+#   - full : 설명은 예전 값과 새 값 전체를 video_revisions에, raw_json 이력은 예전 raw_json 전체를 압축 없이 video_raw_history에 저장
+#   - zlib : full과 같지만 raw_json 이력을 zlib으로 압축
+#   - delta: 지금 방식 (설명은 단어 단위 차이, raw_json 이력은 JSON 패치, 둘 다 zlib 압축)
+# 실행: python benchmarks/replay_db_growth.py --videos 100 --hours 168
+
+import argparse
+import copy
+import json
+import os
+import random
+import tempfile
+import time
+
+from common import ROOT_DIR, file_size, load_module, quiet, use_database
+
+FIXTURE = os.path.join(ROOT_DIR, "tests", "fixtures", "ytdlp_info_full.json")
+HISTORY_TABLES = ("video_revisions", "video_raw_history")
+
+
+def _full_json_patch(new_doc, old_doc): # full, zlib: 예전 raw_json 전체를 그대로 남기는 패치
+    return {"v": old_doc}
+
+
+def _plain_json(obj) -> bytes: # full: 압축하지 않은 JSON
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _plain_json_load(blob: bytes): # _plain_json의 반대
+    return json.loads(blob.decode("utf-8"))
+
+
+MODES = { # 방식 이름: 바꿀 모듈 속성
+    "full": {"DELTA_FIELDS": set(), "make_json_patch": _full_json_patch, "_compress_json": _plain_json, "_decompress_json": _plain_json_load},
+    "zlib": {"DELTA_FIELDS": set(), "make_json_patch": _full_json_patch},
+    "delta": {},
+}
+
+
+class Replay: # 영상마다 바뀌어 가는 info dict (같은 seed면 방식마다 같은 스냅샷)
+    def __init__(self, base: dict, videos: int, edit_every: int, whole_info: bool, seed: int):
+        self.rng = random.Random(seed)
+        self.edit_every = edit_every
+        self.whole_info = whole_info
+        self.infos = []
+        for v in range(videos):
+            info = copy.deepcopy(base)
+            vid = f"vidReplay{v:04d}"
+            info.update(id=vid, display_id=vid, webpage_url=f"https://www.youtube.com/watch?v={vid}", title=f"{base['title']} #{v}", fulltitle=f"{base['title']} #{v}")
+            lines = [f"{n:02d}:{n * 7 % 60:02d} 구간 {n}: " + " ".join(f"설명{v}-{n}-{k}" for k in range(self.rng.randint(4, 16))) for n in range(self.rng.randint(10, 40))]
+            info["description"] = base["description"] + "\n\n" + "\n".join(lines)
+            info["view_count"] = self.rng.randint(100, 100000)
+            self.infos.append(info)
+
+    def snapshot(self, v: int, hour: int) -> dict: # v번째 영상을 hour시간째에 수집한 info dict
+        info = self.infos[v]
+        rng = self.rng
+        info["view_count"] += rng.randint(0, 500)
+        info["like_count"] = info["view_count"] // 20 + rng.randint(0, 5)
+        info["comment_count"] = info["view_count"] // 80
+        info["channel_follower_count"] += rng.randint(-3, 10)
+        if hour and rng.random() < 1 / self.edit_every:
+            lines = info["description"].split("\n")
+            i = rng.randrange(len(lines))
+            if rng.random() < 0.5:
+                lines[i] = lines[i] + f" (수정 {hour})"
+            else:
+                lines.insert(i, f"추가된 안내 {hour}: 고정 댓글도 확인해 주세요")
+            info["description"] = "\n".join(lines)
+            if rng.random() < 0.2:
+                info["tags"] = info["tags"] + [f"태그{hour}"]
+            if rng.random() < 0.1:
+                info["title"] = info["fulltitle"] = info["title"] + " [업데이트]"
+        if self.whole_info: # 포맷과 자막 URL은 수집할 때마다 서명과 만료 시간이 바뀜
+            info["epoch"] = 1714540230 + hour * 3600
+            for f in info["formats"]:
+                f["url"] = f["url"].replace(f"expire={1714561600 + (hour - 1) * 3600}", f"expire={1714561600 + hour * 3600}")
+        return info
+
+
+def table_bytes(ym, tables: tuple) -> dict: # 테이블(인덱스 포함)마다 차지하는 페이지 크기 합계 (sqlite dbstat)
+    rows = ym.conn.execute(
+        "SELECT m.tbl_name, SUM(s.pgsize) FROM dbstat s JOIN sqlite_master m ON m.name = s.name GROUP BY m.tbl_name"
+    ).fetchall()
+    sizes = dict(rows)
+    return {table: sizes.get(table, 0) for table in tables}
+
+
+def replay(ym, path: str, mode: str, args, base: dict) -> dict: # 한 방식으로 스냅샷 전체를 저장하고 크기 반환
+    for p in (path, path + "-wal", path + "-shm"):
+        if os.path.exists(p):
+            os.remove(p)
+    use_database(ym, path)
+    saved = {name: getattr(ym, name) for name in MODES[mode]}
+    saved_fields = ym.RAW_JSON_FIELDS
+    for name, value in MODES[mode].items():
+        setattr(ym, name, value)
+    if args.whole_info:
+        ym.RAW_JSON_FIELDS = None
+    try:
+        source = Replay(base, args.videos, args.edit_every, args.whole_info, args.seed)
+        started = time.perf_counter()
+        first_hour = 0
+        for hour in range(args.hours):
+            with quiet():
+                for v in range(args.videos):
+                    info = source.snapshot(v, hour)
+                    ym.store_video_metadata(info["id"], info, None, 0.0)
+                ym.flush_video_writes()
+            if hour == 0:
+                ym.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                first_hour = file_size(path)
+        ym.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        history = table_bytes(ym, HISTORY_TABLES + ("video_raw", "video_stats"))
+        versions = ym.conn.execute("SELECT COUNT(*) FROM video_raw_history").fetchone()[0]
+        revisions = ym.conn.execute("SELECT COUNT(*) FROM video_revisions").fetchone()[0]
+        ym.conn.commit()
+        return {
+            "sec": time.perf_counter() - started, "first_hour": first_hour, "total": file_size(path),
+            "history": history, "raw_versions": versions, "revisions": revisions,
+        }
+    finally:
+        for name, value in saved.items():
+            setattr(ym, name, value)
+        ym.RAW_JSON_FIELDS = saved_fields
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="info dict 스냅샷을 store_video_metadata로 재현해 이력 저장 방식(full, zlib, delta)별 DB 크기 비교")
+    parser.add_argument("--videos", type=int, default=100, help="영상 수")
+    parser.add_argument("--hours", type=int, default=168, help="재현할 시간 (매시간 한 번 수집, 기본 1주)")
+    parser.add_argument("--edit-every", type=int, default=24, help="영상마다 평균 몇 시간에 한 번 설명을 고치는지")
+    parser.add_argument("--whole-info", action="store_true", help="raw_json에 info dict 전체를 저장 (RAW_JSON_FIELDS = None)")
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=list(MODES), help="비교할 방식")
+    parser.add_argument("--seed", type=int, default=20240501, help="스냅샷을 만드는 난수 seed")
+    parser.add_argument("--workdir", default="", help="DB를 만들 폴더 (기본: 임시 폴더)")
+    args = parser.parse_args()
+
+    with open(FIXTURE, encoding="utf-8") as f:
+        base = json.load(f)
+    ym = load_module(args.workdir or tempfile.mkdtemp(prefix="ytm-bench-replay-"))
+    ym.DB_DURABILITY = "batch"
+    ym.COMMIT_BATCH_VIDEOS = args.videos # 한 시간 분량을 한 번에 커밋
+
+    print(f"📊 영상 {args.videos}개 x {args.hours}시간 재현 (설명 수정: 영상마다 평균 {args.edit_every}시간에 한 번, raw_json: {'info dict 전체' if args.whole_info else 'RAW_JSON_FIELDS'})")
+    week = 168 / max(args.hours - 1, 1)
+    for mode in args.modes:
+        r = replay(ym, os.path.abspath(f"replay_{mode}.db"), mode, args, base)
+        growth = r["total"] - r["first_hour"]
+        h = r["history"]
+        print(
+            f"  --> {mode:5s}: DB {r['total'] / 1024 / 1024:8.2f}MB (첫 수집 후 {r['first_hour'] / 1024 / 1024:.2f}MB, 1주 증가량 {growth * week / 1024 / 1024:8.2f}MB) / "
+            f"video_revisions {h['video_revisions'] / 1024:,.0f}KB ({r['revisions']}행), video_raw_history {h['video_raw_history'] / 1024:,.0f}KB ({r['raw_versions']}행), "
+            f"video_raw {h['video_raw'] / 1024:,.0f}KB, video_stats {h['video_stats'] / 1024:,.0f}KB / {r['sec']:.0f}초"
+        )
+
+
+if __name__ == "__main__":
+    main()
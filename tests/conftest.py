@@ -0,0 +1,50 @@
+##### youtube_monitoring.py 테스트 공통 설정 #####
+# 실행: 저장소 최상위 폴더에서 python -m pytest -q (selenium, yt-dlp, requests가 설치되어 있어야 함, 크롬과 네트워크는 사용하지 않음)
+
+import os
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+BENCHMARK = os.environ.get("YTM_BENCHMARK") == "1" # YTM_BENCHMARK=1이면 벤치마크 테스트를 요청서의 원래 크기로 실행 (기본은 빠르게 끝나는 작은 크기)
+
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+
+@pytest.fixture(scope="session")
+def ym(tmp_path_factory): # youtube_monitoring 모듈 (import할 때 만드는 DB 파일은 임시 폴더에 생성)
+    # DATABASE_FILE은 상대 경로이고 다른 스레드도 connect_db()로 같은 파일을 열기 때문에 테스트가 끝날 때까지 임시 폴더에서 실행
+    old_cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("db"))
+    import youtube_monitoring
+    yield youtube_monitoring
+    youtube_monitoring.conn.close()
+    os.chdir(old_cwd)
+
+
+def read_fixture(name: str) -> str: # tests/fixtures 아래의 파일 내용
+    with open(os.path.join(FIXTURE_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def make_info(video_id: str, **overrides) -> dict: # yt-dlp의 info dict 형태 (store_video_metadata가 읽는 값)
+    info = {
+        "id": video_id,
+        "title": f"제목 {video_id}",
+        "fulltitle": f"제목 {video_id}",
+        "channel": "DFRC",
+        "channel_id": "UCfixturechannel0000000",
+        "description": "첫 줄\n둘째 줄 설명입니다",
+        "duration": 125,
+        "timestamp": 1714540000,
+        "live_status": "not_live",
+        "view_count": 10,
+        "like_count": 1,
+        "comment_count": 0,
+        "formats": [{"url": "https://example.invalid/stream", "format_id": "18"}],
+    }
+    info.update(overrides)
+    return info
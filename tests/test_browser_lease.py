@@ -0,0 +1,61 @@
+##### 크롬 데몬 사용 기한(browser_leases): 스크롤 중 연장, 종료할 때 이 실행의 기한만 삭제 #####
+
+import time
+
+
+class FakeService:
+    def stop(self) -> None:
+        pass
+
+
+class FakeDriver: # release_driver가 호출하는 WebDriver의 일부
+    def __init__(self):
+        self.service = FakeService()
+
+    def close(self) -> None:
+        pass
+
+
+def _leases(ym) -> dict:
+    rows = ym.conn.execute("SELECT holder, lease_until FROM browser_leases WHERE address = ?", (ym.BROWSER_DAEMON_ADDRESS,)).fetchall()
+    ym.conn.commit()
+    return dict(rows)
+
+
+def _attach(ym, monkeypatch):
+    monkeypatch.setattr(ym, "BROWSER_DAEMON_ADDRESS", "127.0.0.1:9222")
+    monkeypatch.setattr(ym, "driver", FakeDriver())
+    monkeypatch.setattr(ym, "driver_attached", True)
+    monkeypatch.setitem(ym._daemon_lease, "until", 0.0)
+    ym.conn.execute("DELETE FROM browser_leases")
+    ym.conn.commit()
+
+
+def test_lease_is_renewed_only_when_half_used(ym, monkeypatch):
+    _attach(ym, monkeypatch)
+    ym._renew_daemon_lease()
+    first = _leases(ym)[ym.DAEMON_LEASE_HOLDER]
+    assert first > time.time() + ym.BROWSER_LEASE_SECONDS - 5
+
+    ym._renew_daemon_lease() # 아직 절반 넘게 남음 --> 그대로
+    assert _leases(ym)[ym.DAEMON_LEASE_HOLDER] == first
+
+    # 긴 스크롤로 기한이 절반 이하로 남은 상황
+    monkeypatch.setitem(ym._daemon_lease, "until", time.time() + ym.BROWSER_LEASE_SECONDS / 2 - 1)
+    ym._renew_daemon_lease()
+    assert ym._daemon_lease["until"] > first - 1
+    assert _leases(ym)[ym.DAEMON_LEASE_HOLDER] == ym._daemon_lease["until"]
+
+
+def test_release_keeps_other_runs_lease(ym, monkeypatch):
+    _attach(ym, monkeypatch)
+    other_until = time.time() + 300
+    ym.conn.execute("INSERT INTO browser_leases (address, holder, lease_until) VALUES (?, 'other-run', ?)", (ym.BROWSER_DAEMON_ADDRESS, other_until))
+    ym.conn.commit()
+    ym._renew_daemon_lease()
+    assert set(_leases(ym)) == {"other-run", ym.DAEMON_LEASE_HOLDER}
+
+    ym.release_driver()
+
+    assert _leases(ym) == {"other-run": other_until}
+    assert ym.driver is None and not ym.driver_attached
@@ -0,0 +1,67 @@
+##### 댓글 수 기준 수집 생략 (should_fetch_comments, finish_comment_fetch): 댓글 수가 그대로인 영상과 댓글 사용이 중지된 영상 #####
+
+
+def _finish_full_fetch(ym, monkeypatch, video_id: str, count: int) -> None: # 댓글을 끝까지 가져왔을 때처럼 comment_fetch_state 기록
+    monkeypatch.setitem(ym.comment_count_hints, video_id, count)
+    ym.finish_comment_fetch(video_id, None, {"complete": True, "newest": {"thread_id": "t1", "time_kst": "2024-05-01T12:00:00+0900"}})
+
+
+def test_unknown_video_is_fetched(ym):
+    assert ym.should_fetch_comments("vidGateNew01") is True
+
+
+def test_unchanged_count_is_skipped_until_full_sweep(ym, monkeypatch):
+    vid = "vidGate01"
+    _finish_full_fetch(ym, monkeypatch, vid, 5)
+    skipped = ym.comment_gate_stats["unchanged"]
+
+    assert ym.should_fetch_comments(vid) is False
+    assert ym.comment_gate_stats["unchanged"] == skipped + 1
+
+    monkeypatch.setitem(ym.comment_count_hints, vid, 6) # 새 댓글
+    assert ym.should_fetch_comments(vid) is True
+
+    # 댓글 수가 그대로여도 마지막 전체 수집이 COMMENT_FULL_SWEEP_HOURS보다 오래되었으면 수정된 댓글 반영을 위해 수집
+    monkeypatch.setitem(ym.comment_count_hints, vid, 5)
+    ym.conn.execute("UPDATE comment_fetch_state SET last_full_sweep_kst = ? WHERE video_id = ?", (ym._hours_ago_kst(ym.COMMENT_FULL_SWEEP_HOURS + 1), vid))
+    ym.conn.commit()
+    assert ym.should_fetch_comments(vid) is True
+
+
+def test_incomplete_fetch_keeps_previous_count(ym, monkeypatch):
+    vid = "vidGate02"
+    _finish_full_fetch(ym, monkeypatch, vid, 5)
+    monkeypatch.setitem(ym.comment_count_hints, vid, 9)
+    ym.finish_comment_fetch(vid, None, {"complete": False, "newest": None}) # 중간에 실패 --> 기준을 바꾸지 않음
+    assert ym.should_fetch_comments(vid) is True
+
+
+def test_gate_can_be_turned_off(ym, monkeypatch):
+    vid = "vidGate03"
+    _finish_full_fetch(ym, monkeypatch, vid, 5)
+    monkeypatch.setattr(ym, "COMMENT_COUNT_GATE", False)
+    assert ym.should_fetch_comments(vid) is True
+
+
+def test_disabled_comments_are_cached(ym, monkeypatch):
+    vid = "vidGateOff01"
+    ym.finish_comment_fetch(vid, None, {"disabled": True, "complete": False})
+    skipped = ym.comment_gate_stats["disabled"]
+
+    assert ym.should_fetch_comments(vid) is False
+    assert ym.comment_gate_stats["disabled"] == skipped + 1
+
+    # 메타데이터에 댓글 수가 다시 나타나면 바로 다시 확인
+    monkeypatch.setitem(ym.comment_count_hints, vid, 2)
+    assert ym.should_fetch_comments(vid) is True
+
+    # COMMENTS_DISABLED_RECHECK_HOURS가 지나도 다시 확인
+    monkeypatch.delitem(ym.comment_count_hints, vid)
+    ym.conn.execute("UPDATE comment_fetch_state SET disabled_checked_kst = ? WHERE video_id = ?", (ym._hours_ago_kst(ym.COMMENTS_DISABLED_RECHECK_HOURS + 1), vid))
+    ym.conn.commit()
+    assert ym.should_fetch_comments(vid) is True
+
+    # 다시 확인해서 댓글을 모두 가져왔으면 사용 중지 표시를 지움
+    _finish_full_fetch(ym, monkeypatch, vid, 2)
+    assert ym.conn.execute("SELECT comments_disabled FROM comment_fetch_state WHERE video_id = ?", (vid,)).fetchone()[0] == 0
+    ym.conn.commit()
@@ -0,0 +1,70 @@
+##### 댓글 수집의 메모리 사용량: 200k개가 넘는 댓글도 한 페이지씩 저장하므로 최대 메모리가 페이지 수와 관계없이 일정해야 함 #####
+# 가짜 api_get이 답글이 달린 100개 스레드짜리 페이지를 COMMENT_MEMORY_PAGES개 만들어 iter_comment_pages --> store_comments로 저장
+# 기본은 100페이지(약 2만 개), 요청서 크기(2000페이지, 약 40만 개)로 실행: YTM_BENCHMARK=1 python -m pytest -q -s tests/test_comment_memory.py (약 1~2분)
+
+import os
+import time
+import tracemalloc
+
+from conftest import BENCHMARK
+from test_comment_pages import FakeApiResponse, _thread
+
+COMMENT_MEMORY_PAGES = int(os.environ.get("COMMENT_MEMORY_PAGES", "2000" if BENCHMARK else "100"))
+WARMUP_PAGES = COMMENT_MEMORY_PAGES // 10 # 처음 이만큼의 최대 메모리를 기준으로 삼음
+
+
+def _fake_comment_api(monkeypatch, ym, video_id: str, pages: int, served: list) -> None: # 요청받을 때마다 페이지를 새로 만들어 돌려주는 api_get (최신 댓글부터)
+    def fake_api_get(endpoint, params, fields=None):
+        n = int(params.get("pageToken") or 0)
+        served.append(n)
+        newest = (pages - n) * 100
+        items = []
+        for i in range(100):
+            item = _thread(f"{video_id}-{n}-{i}", time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(1714500000 + newest - i)), replies=i % 3) # 페이지당 답글 99개
+            item["snippet"]["topLevelComment"]["snippet"]["textDisplay"] = f"댓글 {n}-{i} " + "본문 " * 20
+            items.append(item)
+        payload = {"items": items}
+        if n + 1 < pages:
+            payload["nextPageToken"] = str(n + 1)
+        return FakeApiResponse(payload)
+
+    monkeypatch.setattr(ym, "api_get", fake_api_get)
+
+
+def test_comment_memory_stays_flat(ym, monkeypatch, capsys):
+    vid = "vidMemory01"
+    served = []
+    _fake_comment_api(monkeypatch, ym, vid, COMMENT_MEMORY_PAGES, served)
+    store_comments = ym.store_comments
+    peaks = {}
+
+    def tracked_store(video_id, rows): # 처음 WARMUP_PAGES 페이지의 최대 메모리를 따로 기록
+        store_comments(video_id, rows)
+        if len(served) == WARMUP_PAGES:
+            peaks["warmup"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.reset_peak()
+
+    monkeypatch.setattr(ym, "store_comments", tracked_store)
+    started = time.perf_counter()
+    tracemalloc.start()
+    try:
+        ym.scroll_and_collect_all_comments(vid)
+        peaks["rest"] = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    elapsed = time.perf_counter() - started
+    capsys.readouterr() # store_comments가 페이지마다 출력한 로그는 버림
+
+    stored = ym.conn.execute("SELECT COUNT(*) FROM comments WHERE video_id = ?", (vid,)).fetchone()[0]
+    ym.conn.commit()
+    with capsys.disabled():
+        print(
+            f"\n📊 댓글 {stored}개 ({COMMENT_MEMORY_PAGES}페이지) 저장: {elapsed:.1f}초 / "
+            f"최대 메모리(tracemalloc) 처음 {WARMUP_PAGES}페이지 {peaks['warmup'] / 1024 / 1024:.2f}MB, "
+            f"나머지 {COMMENT_MEMORY_PAGES - WARMUP_PAGES}페이지 {peaks['rest'] / 1024 / 1024:.2f}MB"
+        )
+
+    assert len(served) == COMMENT_MEMORY_PAGES
+    assert stored == COMMENT_MEMORY_PAGES * 199 # 페이지마다 스레드 100개 + 답글 99개
+    # 모든 댓글을 모아 두면 나머지 구간의 최대 메모리가 페이지 수에 비례해 커짐 --> 처음 구간의 1.5배를 넘지 않아야 함
+    assert peaks["rest"] <= peaks["warmup"] * 1.5
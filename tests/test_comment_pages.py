@@ -0,0 +1,122 @@
+##### 댓글 수집: commentThreads 페이지 넘기기, 증분 수집 기준(watermark) 기록 (api_get을 가짜 응답으로 바꿔 네트워크 사용 안 함) #####
+
+import json
+
+
+class FakeApiResponse: # iter_comment_pages가 읽는 requests.Response의 일부
+    def __init__(self, payload: dict, status_code: int = 200):
+        self.status_code = status_code
+        self.text = json.dumps(payload)
+
+    def json(self):
+        return json.loads(self.text)
+
+
+def _thread(thread_id: str, published_at: str, replies: int = 0) -> dict: # commentThreads 응답의 항목 하나
+    def snippet(text: str, at: str) -> dict:
+        return {"textDisplay": text, "authorDisplayName": "@tester", "authorChannelId": {"value": "UCtester"}, "publishedAt": at}
+
+    item = {"id": thread_id, "snippet": {"topLevelComment": {"id": thread_id, "snippet": snippet(f"댓글 {thread_id}", published_at)}}}
+    if replies:
+        item["replies"] = {"comments": [{"id": f"{thread_id}.r{n}", "snippet": snippet(f"답글 {n}", published_at)} for n in range(replies)]}
+    return item
+
+
+PAGE_1 = {"items": [_thread("t5", "2024-05-01T05:00:00Z", replies=2), _thread("t4", "2024-05-01T04:00:00Z")], "nextPageToken": "PAGE2"}
+PAGE_2 = {"items": [_thread("t3", "2024-05-01T03:00:00Z"), _thread("t2", "2024-05-01T02:00:00Z")]}
+
+
+def _fake_api(monkeypatch, ym, pages: dict, calls: list) -> None: # pageToken별로 미리 정한 응답을 돌려주는 api_get
+    def fake_api_get(endpoint, params, fields=None):
+        assert endpoint == "commentThreads"
+        calls.append(dict(params))
+        return pages[params.get("pageToken")]
+
+    monkeypatch.setattr(ym, "api_get", fake_api_get)
+
+
+def test_iter_comment_pages_follows_next_page_token(ym, monkeypatch):
+    calls = []
+    _fake_api(monkeypatch, ym, {None: FakeApiResponse(PAGE_1), "PAGE2": FakeApiResponse(PAGE_2)}, calls)
+
+    result = {}
+    pages = list(ym.iter_comment_pages("vidPaging01", None, result))
+
+    assert [len(rows) for rows in pages] == [4, 2] # 첫 페이지: 댓글 2 + 답글 2
+    assert [row[1] for row in pages[0]] == ["t5", "t5.r0", "t5.r1", "t4"]
+    assert pages[0][1][2] == "t5" # 답글의 parent_id
+    assert [c.get("pageToken") for c in calls] == [None, "PAGE2"]
+    assert result["complete"] is True
+    assert result["newest"]["thread_id"] == "t5"
+
+
+def test_iter_comment_pages_single_page(ym, monkeypatch):
+    _fake_api(monkeypatch, ym, {None: FakeApiResponse(PAGE_2)}, [])
+    result = {}
+    assert len(list(ym.iter_comment_pages("vidPaging02", None, result))) == 1
+    assert result["complete"] is True
+
+
+def test_iter_comment_pages_stops_at_watermark(ym, monkeypatch):
+    calls = []
+    _fake_api(monkeypatch, ym, {None: FakeApiResponse(PAGE_1), "PAGE2": FakeApiResponse(PAGE_2)}, calls)
+    result = {}
+    watermark = {"thread_id": "t4", "time_kst": ym.iso8601_to_kst("2024-05-01T04:00:00Z")}
+    list(ym.iter_comment_pages("vidPaging03", watermark, result))
+    assert len(calls) == 1 # 첫 페이지에서 기준에 도달 --> 다음 페이지 요청 안 함
+    assert result["complete"] is True and result["newest"]["thread_id"] == "t5"
+
+
+def test_iter_comment_pages_comments_disabled(ym, monkeypatch):
+    disabled = FakeApiResponse({"error": {"errors": [{"reason": "commentsDisabled"}]}}, status_code=403)
+    _fake_api(monkeypatch, ym, {None: disabled}, [])
+    result = {}
+    assert list(ym.iter_comment_pages("vidPaging04", None, result)) == []
+    assert result["disabled"] is True and result["complete"] is False
+
+
+def test_collect_comments_records_watermark(ym, monkeypatch):
+    calls = []
+    _fake_api(monkeypatch, ym, {None: FakeApiResponse(PAGE_1), "PAGE2": FakeApiResponse(PAGE_2)}, calls)
+    monkeypatch.setitem(ym.comment_count_hints, "vidPaging05", 6)
+
+    ym.collect_comments_for_videos(["vidPaging05"])
+
+    stored = ym.conn.execute("SELECT COUNT(*) FROM comments WHERE video_id = 'vidPaging05'").fetchone()[0]
+    state = ym.conn.execute(
+        "SELECT newest_thread_id, last_full_sweep_kst, last_comment_count FROM comment_fetch_state WHERE video_id = 'vidPaging05'"
+    ).fetchone()
+    assert stored == 6
+    assert state[0] == "t5" and state[1] and state[2] == 6
+
+    # 다음 실행: 댓글 수가 그대로면 commentThreads를 호출하지 않음
+    ym.collect_comments_for_videos(["vidPaging05"])
+    assert len(calls) == 2
+
+
+def test_collect_comments_survives_state_write_failure(ym, monkeypatch):
+    import sqlite3
+    import faulthandler
+
+    def fake_api_get(endpoint, params, fields=None): # 영상마다 다른 댓글 ID로 2페이지씩
+        vid = params["videoId"]
+        if params.get("pageToken"):
+            return FakeApiResponse({"items": [_thread(f"{vid}-2", "2024-05-01T02:00:00Z")]})
+        return FakeApiResponse({"items": [_thread(f"{vid}-1", "2024-05-01T03:00:00Z", replies=1)], "nextPageToken": "PAGE2"})
+
+    monkeypatch.setattr(ym, "api_get", fake_api_get)
+    monkeypatch.setattr(ym, "COMMENT_PAGE_QUEUE_SIZE", 1)
+
+    def broken_finish(video_id, watermark, result):
+        raise sqlite3.OperationalError("disk I/O error")
+
+    monkeypatch.setattr(ym, "finish_comment_fetch", broken_finish)
+
+    # 상태 저장이 실패해도 나머지 영상의 댓글은 저장되고, 수집 스레드를 기다리다 멈추지 않아야 함 (멈추면 30초 뒤 강제 종료)
+    faulthandler.dump_traceback_later(30, exit=True)
+    try:
+        ym.collect_comments_for_videos(["vidPaging06", "vidPaging07", "vidPaging08"])
+    finally:
+        faulthandler.cancel_dump_traceback_later()
+    stored = ym.conn.execute("SELECT COUNT(*) FROM comments WHERE video_id IN ('vidPaging06', 'vidPaging07', 'vidPaging08')").fetchone()[0]
+    assert stored == 9
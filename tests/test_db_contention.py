@@ -0,0 +1,67 @@
+##### DB 동시 쓰기 부하 테스트: 여러 프로세스가 한 DB 파일에 동시에 쓰기 (WAL, busy_timeout, 잠금 재시도) #####
+# 결과(처리량, 쓰기 잠금 대기 시간, 재시도 횟수)는 python -m pytest -s tests/test_db_contention.py로 확인
+
+import multiprocessing
+import os
+import time
+
+WRITERS = 4              # 동시에 쓰는 프로세스 수 (모니터링 스크립트 4개가 동시에 도는 상황)
+TXNS_PER_WRITER = 1000   # 프로세스마다 커밋할 쓰기 트랜잭션 수
+
+
+def _writer(args) -> dict: # 별도 프로세스에서 실행: 읽고 -> 두 번 쓰고 -> 커밋하는 트랜잭션을 TXNS_PER_WRITER번 반복
+    db_dir, writer_no = args
+    os.chdir(db_dir)
+    import youtube_monitoring as ym
+
+    # busy_timeout을 일부러 짧게 해서 잠금 재시도(jitter) 경로도 함께 확인
+    ym.DB_BUSY_TIMEOUT = 0.05
+    ym.DB_BUSY_RETRIES = 20
+    db = ym.connect_db()
+    cur = db.cursor(ym.BusyRetryCursor)
+
+    # 모든 프로세스가 준비될 때까지 기다렸다가 동시에 시작 (import 시간 차이로 차례로 쓰게 되지 않도록)
+    open(f"ready_{writer_no}", "w").close()
+    while sum(os.path.exists(f"ready_{n}") for n in range(WRITERS)) < WRITERS:
+        time.sleep(0.01)
+
+    started = time.perf_counter()
+    for i in range(TXNS_PER_WRITER):
+        cur.execute("SELECT COUNT(*) FROM contention WHERE writer = ?", (writer_no,)).fetchone()
+        cur.execute("INSERT INTO contention (writer, seq) VALUES (?, ?)", (writer_no, i))
+        cur.execute("UPDATE contention_totals SET n = n + 1 WHERE id = 1")
+        if i % 200 == 0:
+            time.sleep(0.1) # 가끔 busy_timeout보다 오래 쓰기 잠금을 잡고 있는 트랜잭션 (다른 프로세스는 재시도 경로로 기다림)
+        db.commit()
+    elapsed = time.perf_counter() - started
+    db.close()
+    return dict(ym.db_stats, sec=elapsed)
+
+
+def test_concurrent_writers_lose_no_writes(ym):
+    ym.conn.execute("CREATE TABLE IF NOT EXISTS contention (writer INTEGER, seq INTEGER)")
+    ym.conn.execute("CREATE TABLE IF NOT EXISTS contention_totals (id INTEGER PRIMARY KEY, n INTEGER)")
+    ym.conn.execute("DELETE FROM contention")
+    ym.conn.execute("INSERT OR REPLACE INTO contention_totals (id, n) VALUES (1, 0)")
+    ym.conn.commit()
+
+    for n in range(WRITERS):
+        if os.path.exists(f"ready_{n}"):
+            os.remove(f"ready_{n}")
+
+    with multiprocessing.get_context("spawn").Pool(WRITERS) as pool:
+        results = pool.map(_writer, [(os.getcwd(), n) for n in range(WRITERS)])
+    elapsed = max(r["sec"] for r in results)
+
+    total = WRITERS * TXNS_PER_WRITER
+    assert ym.conn.execute("SELECT COUNT(*) FROM contention").fetchone()[0] == total
+    assert ym.conn.execute("SELECT n FROM contention_totals WHERE id = 1").fetchone()[0] == total
+    assert ym.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    ym.conn.commit()
+
+    lock_wait = sum(r["lock_wait_sec"] for r in results)
+    retries = sum(r["busy_retries"] for r in results)
+    print(
+        f"\n🗄️ 프로세스 {WRITERS}개 x 트랜잭션 {TXNS_PER_WRITER}개: {total / elapsed:.0f} 트랜잭션/초 (동시에 쓴 시간 {elapsed:.2f}초)"
+        f" / 쓰기 잠금 대기 합계 {lock_wait:.2f}초 / database is locked 재시도 {retries}회"
+    )
@@ -0,0 +1,101 @@
+##### DISCOVERY_BACKEND = "http": 저장해 둔 검색 결과 페이지와 continuation 응답으로 파싱 확인 (네트워크 사용 안 함) #####
+# fixtures/search_results.html: 검색 결과 HTML에서 파서가 읽는 부분(ytcfg.set, ytInitialData)의 구조만 남겨 줄인 것
+# fixtures/search_continuation.json: /youtubei/v1/search continuation 응답을 같은 방식으로 줄인 것
+
+import json
+import datetime
+
+from conftest import read_fixture
+
+PAGE_1_IDS = ["vidPage1_01", "vidPage1_02", "vidPage1_03"]
+PAGE_2_IDS = ["vidPage1_03", "vidPage2_01", "vidPage2_02"]
+
+
+class FakeResponse: # collect_video_ids_via_http가 읽는 requests.Response의 일부
+    def __init__(self, text: str):
+        self.text = text
+        self.content = text.encode("utf-8")
+        self.elapsed = datetime.timedelta(milliseconds=5)
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class FakeCookies:
+    def set(self, *args, **kwargs) -> None:
+        pass
+
+
+class FakeSession: # 첫 GET에는 검색 결과 HTML, 이후 POST에는 continuation 응답을 차례로 돌려줌
+    def __init__(self, html: str, continuations: list):
+        self.cookies = FakeCookies()
+        self.html = html
+        self.continuations = list(continuations)
+        self.posts = []
+
+    def get(self, url, timeout=None):
+        return FakeResponse(self.html)
+
+    def post(self, url, params=None, json=None, timeout=None):
+        self.posts.append({"url": url, "params": params, "json": json})
+        return FakeResponse(self.continuations.pop(0))
+
+
+def test_extract_json_after_handles_braces_inside_strings(ym):
+    html = read_fixture("search_results.html")
+    data = ym._extract_json_after(html, "var ytInitialData = ")
+    assert data is not None
+    assert data["estimatedResults"] == "42"
+
+
+def test_extract_json_after_missing_marker_or_broken_json(ym):
+    assert ym._extract_json_after("<html></html>", "var ytInitialData = ") is None
+    assert ym._extract_json_after("var ytInitialData = {\"a\": ", "var ytInitialData = ") is None
+
+
+def test_extract_ytcfg_merges_all_set_calls(ym):
+    cfg = ym._extract_ytcfg(read_fixture("search_results.html"))
+    assert cfg["INNERTUBE_API_KEY"] == "AIzaSyFIXTURE_KEY_000000000000000000"
+    assert cfg["INNERTUBE_CONTEXT"]["client"]["clientName"] == "WEB"
+    assert cfg["DEVICE"].startswith("cbr=Chrome") # 앞쪽 ytcfg.set 호출의 값도 합쳐짐
+
+
+def test_parse_search_results_initial_page(ym):
+    data = ym._extract_json_after(read_fixture("search_results.html"), "var ytInitialData = ")
+    ids, token = ym._parse_search_results(data)
+    assert ids == PAGE_1_IDS # Shorts 선반(reelItemRenderer)과 채널은 제외, 원래 순서 유지
+    assert token == "TOKEN_PAGE_2"
+
+
+def test_parse_search_results_continuation(ym):
+    ids, token = ym._parse_search_results(json.loads(read_fixture("search_continuation.json")))
+    assert ids == PAGE_2_IDS
+    assert token == "TOKEN_PAGE_3"
+
+
+def test_collect_video_ids_via_http_follows_continuations(ym, monkeypatch):
+    last_page = json.dumps({"onResponseReceivedCommands": [{"appendContinuationItemsAction": {"continuationItems": []}}]})
+    session = FakeSession(read_fixture("search_results.html"), [read_fixture("search_continuation.json"), last_page])
+    monkeypatch.setattr(ym, "new_http_session", lambda headers=None: session)
+
+    found = []
+    ids = ym.collect_video_ids_via_http("DFRC", "CAISBAgBEAE%253D", on_found=found.extend)
+
+    assert ids == ["vidPage1_01", "vidPage1_02", "vidPage1_03", "vidPage2_01", "vidPage2_02"]
+    assert found == ids # on_found에는 새로 나타난 영상만 한 번씩 전달
+    assert [p["json"]["continuation"] for p in session.posts] == ["TOKEN_PAGE_2", "TOKEN_PAGE_3"]
+    assert session.posts[0]["params"]["key"] == "AIzaSyFIXTURE_KEY_000000000000000000"
+
+
+def test_collect_video_ids_via_http_stops_on_known_ids(ym, monkeypatch):
+    session = FakeSession(read_fixture("search_results.html"), [read_fixture("search_continuation.json")])
+    monkeypatch.setattr(ym, "new_http_session", lambda headers=None: session)
+    monkeypatch.setattr(ym, "KNOWN_ID_EARLY_STOP", 2)
+
+    ids = ym.collect_video_ids_via_http("DFRC", "CAISBAgBEAE%253D", known_ids={"vidPage1_02", "vidPage1_03"})
+
+    assert ids == PAGE_1_IDS
+    assert session.posts == [] # 첫 페이지 끝에서 이미 저장된 영상이 2개 연속 --> continuation 요청 안 함
@@ -0,0 +1,75 @@
+##### 영상 메타데이터 쓰기 묶음 (flush_video_writes): 여러 영상을 한 트랜잭션으로, 실패한 영상만 버림 #####
+
+from conftest import make_info
+
+
+def _stored(ym, video_ids) -> set:
+    marks = ",".join("?" * len(video_ids))
+    rows = ym.conn.execute(f"SELECT id FROM videos WHERE id IN ({marks})", list(video_ids)).fetchall()
+    ym.conn.commit()
+    return {r[0] for r in rows}
+
+
+def test_batch_is_committed_once(ym, monkeypatch):
+    monkeypatch.setattr(ym, "DB_DURABILITY", "batch")
+    monkeypatch.setattr(ym, "COMMIT_BATCH_VIDEOS", 3)
+    monkeypatch.setattr(ym, "COMMIT_BATCH_SECONDS", 3600)
+    commits = ym.write_stats["commits"]
+
+    ids = ["vidBatch001", "vidBatch002", "vidBatch003"]
+    for vid in ids[:2]:
+        ym.store_video_metadata(vid, make_info(vid), None, 0.0)
+    assert _stored(ym, ids) == set() # 아직 COMMIT_BATCH_VIDEOS개가 모이지 않음
+    ym.store_video_metadata(ids[2], make_info(ids[2]), None, 0.0)
+
+    assert _stored(ym, ids) == set(ids)
+    assert ym.write_stats["commits"] == commits + 1
+    assert ym._pending_video_writes == []
+
+
+def test_failed_statement_does_not_poison_later_batches(ym, monkeypatch):
+    monkeypatch.setattr(ym, "DB_DURABILITY", "batch")
+    monkeypatch.setattr(ym, "COMMIT_BATCH_VIDEOS", 100)
+    failed = ym.write_stats["failed"]
+
+    # 이미 있는 (video_id, version)에 또 INSERT --> PRIMARY KEY 위반으로 실패하는 영상
+    ym.conn.execute("INSERT INTO video_raw_history (video_id, version, patch) VALUES ('vidPoison01', 0, x'00')")
+    ym.conn.commit()
+    ym.queue_video_write("INSERT INTO video_raw_history (video_id, version, patch) VALUES (?, 0, x'00')", ("vidPoison01",))
+    ym.finish_video_write("vidPoison01")
+    ym.store_video_metadata("vidPoison02", make_info("vidPoison02"), None, 0.0)
+    ym.flush_video_writes()
+
+    # 실패한 영상만 버리고 같은 묶음의 다른 영상은 저장, 남은 문장 없음
+    assert _stored(ym, ["vidPoison02"]) == {"vidPoison02"}
+    assert ym.write_stats["failed"] == failed + 1
+    assert ym._pending_video_writes == []
+
+    # 다음 묶음은 정상적으로 저장
+    ym.store_video_metadata("vidPoison03", make_info("vidPoison03"), None, 0.0)
+    ym.flush_video_writes()
+    assert _stored(ym, ["vidPoison03"]) == {"vidPoison03"}
+
+
+def test_counter_change_skips_raw_rewrite(ym):
+    vid = "vidCounter01"
+    ym.store_video_metadata(vid, make_info(vid), None, 0.0)
+    ym.flush_video_writes()
+    raw_skipped = ym.skip_stats["raw_skipped"]
+
+    # 조회수, 좋아요 수, 댓글 수만 바뀜 --> video_raw와 video_raw_history는 그대로, video_stats에만 한 행 추가
+    ym.store_video_metadata(vid, make_info(vid, view_count=250, like_count=7, comment_count=3), None, 0.0)
+    ym.flush_video_writes()
+    assert ym.skip_stats["raw_skipped"] == raw_skipped + 1
+    assert ym.conn.execute("SELECT COUNT(*) FROM video_raw_history WHERE video_id = ?", (vid,)).fetchone()[0] == 0
+    assert "view_count" not in ym.conn.execute("SELECT raw_json FROM video_raw WHERE id = ?", (vid,)).fetchone()[0]
+
+    # 숫자도 그대로면 video_stats에도 쓰지 않음
+    stats_skipped = ym.skip_stats["stats_skipped"]
+    ym.store_video_metadata(vid, make_info(vid, view_count=250, like_count=7, comment_count=3), None, 0.0)
+    ym.flush_video_writes()
+    assert ym.skip_stats["stats_skipped"] == stats_skipped + 1
+
+    rows = ym.conn.execute("SELECT view_count, like_count, comment_count FROM video_stats WHERE video_id = ? ORDER BY observed_kst, rowid", (vid,)).fetchall()
+    ym.conn.commit()
+    assert rows == [(10, 1, 0), (250, 7, 3)]
@@ -0,0 +1,66 @@
+##### DB 마이그레이션: 예전 스크립트(youtube_rate.py 등)가 만든 DB를 최신 스키마로 옮기기 #####
+
+import sqlite3
+
+
+def _legacy_db(path) -> sqlite3.Connection: # user_version이 없던 시절의 DB (댓글에 ID가 없고 수정 이력은 revised_contents 문자열)
+    db = sqlite3.connect(str(path))
+    db.executescript("""
+    CREATE TABLE videos (id TEXT PRIMARY KEY, title TEXT, channel TEXT, publish_time TEXT, description TEXT, duration TEXT, status TEXT, url TEXT, revised_contents TEXT);
+    CREATE TABLE comments (video_id TEXT, comment TEXT, author_name TEXT, author_channel_id TEXT, author_channel_url TEXT, comment_time_kst TEXT, revised_contents TEXT);
+    CREATE TABLE video_raw (id TEXT PRIMARY KEY, raw_json TEXT, revised_count INTEGER DEFAULT 0);
+    INSERT INTO videos (id, title, revised_contents) VALUES ('oldVideo001', '새 제목', '1. (title: 옛 제목 --> 새 제목)');
+    INSERT INTO comments VALUES ('oldVideo001', '고친 댓글', '@a', 'UCa', '', '2023-01-01T00:00:00+0900', '1. (comment: 처음 댓글 --> 고친 댓글) 2. (author_name: @b --> @a)');
+    INSERT INTO comments VALUES ('oldVideo001', '그대로인 댓글', '@c', 'UCc', '', '2023-01-01T00:05:00+0900', NULL);
+    """)
+    db.commit()
+    return db
+
+
+def test_migrations_move_revisions_of_comments_without_id(ym, tmp_path):
+    db = _legacy_db(tmp_path / "legacy.db")
+    ym.run_migrations(db)
+
+    assert db.execute("PRAGMA user_version").fetchone()[0] == ym.MIGRATIONS[-1][0]
+    # 다시 수집되지 않아도 모든 예전 댓글이 ID를 갖고, 수정 이력은 comment_revisions로 옮겨짐
+    comments = db.execute("SELECT rowid, comment_id, revised_contents, revision_count FROM comments ORDER BY rowid").fetchall()
+    assert [c[1] for c in comments] == [f"{ym.LEGACY_COMMENT_ID_PREFIX}{c[0]}" for c in comments]
+    assert [c[2] for c in comments] == [None, None]
+    assert [c[3] for c in comments] == [2, 0]
+    revisions = db.execute("SELECT comment_id, revision, field, old_value, new_value FROM comment_revisions ORDER BY revision").fetchall()
+    assert revisions == [
+        (comments[0][1], 1, "comment", "처음 댓글", "고친 댓글"),
+        (comments[0][1], 2, "author_name", "@b", "@a"),
+    ]
+    assert db.execute("SELECT revision_count, revised_contents FROM videos").fetchone() == (1, None)
+
+    ym.run_migrations(db) # 이미 최신이면 아무것도 하지 않음
+    assert db.execute("SELECT COUNT(*) FROM comment_revisions").fetchone()[0] == 2
+    db.close()
+
+
+def test_store_comments_replaces_legacy_id_and_keeps_history(ym):
+    legacy_id = f"{ym.LEGACY_COMMENT_ID_PREFIX}900001"
+    ym.conn.execute(
+        "INSERT INTO comments (video_id, comment_id, comment, author_name, author_channel_id, author_channel_url, comment_time_kst, revision_count) "
+        "VALUES ('oldVideo002', ?, '고친 댓글', '@a', 'UCa', '', '2023-01-01T00:00:00+0900', 1)",
+        (legacy_id,),
+    )
+    ym.conn.execute(
+        "INSERT INTO comment_revisions (comment_id, video_id, revision, field, old_value, new_value) VALUES (?, 'oldVideo002', 1, 'comment', '처음 댓글', '고친 댓글')",
+        (legacy_id,),
+    )
+    ym.conn.commit()
+
+    # 다시 수집된 댓글: 같은 작성자, 같은 작성시간 --> 임시 ID가 API의 ID로 바뀌고, 이번 수정은 2번째 수정
+    ym.store_comments("oldVideo002", [("oldVideo002", "UgxRealId", "", "또 고친 댓글", "@a", "UCa", "", "2023-01-01T00:00:00+0900")])
+
+    assert ym.conn.execute("SELECT COUNT(*) FROM comments WHERE comment_id = ?", (legacy_id,)).fetchone()[0] == 0
+    revisions = ym.conn.execute("SELECT comment_id, revision, new_value FROM comment_revisions WHERE video_id = 'oldVideo002' ORDER BY revision").fetchall()
+    assert revisions == [("UgxRealId", 1, "고친 댓글"), ("UgxRealId", 2, "또 고친 댓글")]
+
+
+def test_legacy_probe_uses_partial_index(ym):
+    # 새 댓글이 있는 페이지마다 실행하는 확인 --> 영상의 댓글 전체(idx_comments_video_time)가 아니라 예전 댓글만 담은 인덱스를 사용해야 함
+    plan = ym.conn.execute(f"EXPLAIN QUERY PLAN SELECT 1 FROM comments WHERE video_id = ? AND {ym._legacy_comment_sql()} LIMIT 1", ("vidAny",)).fetchall()
+    assert "idx_comments_legacy " in plan[0][3] + " "
@@ -0,0 +1,41 @@
+##### video_raw.raw_json: info dict 전체(json.dumps)와 RAW_JSON_FIELDS projection(serialize_raw_info)의 직렬화 시간과 크기 #####
+# tests/fixtures/ytdlp_info_full.json: 12분짜리 일반 영상을 전체 처리(process=True)한 info dict와 같은 구조와 크기로 만든 값 (ID와 서명은 가짜)
+#   (포맷 35개 + 서명된 googlevideo URL, 썸네일 32개, 자동 자막 126개 언어 x 7형식, heatmap, requested_formats)
+# 기본은 200회, 더 많이 반복: YTM_BENCHMARK=1 python -m pytest -q -s tests/test_raw_json_size.py
+
+import json
+import time
+
+from conftest import BENCHMARK, read_fixture
+
+RAW_JSON_REPEAT = 2000 if BENCHMARK else 200
+
+
+def _median_ms(fn, repeat: int) -> float: # fn 1회 실행 시간의 중앙값(ms)
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - started) * 1000)
+    return sorted(times)[len(times) // 2]
+
+
+def test_projection_is_smaller_and_faster_than_full_dump(ym, capsys):
+    info = json.loads(read_fixture("ytdlp_info_full.json"))
+    full = json.dumps(info, ensure_ascii=False)
+    projected = ym.serialize_raw_info(info)
+    full_bytes, projected_bytes = len(full.encode("utf-8")), len(projected.encode("utf-8"))
+
+    full_ms = _median_ms(lambda: json.dumps(info, ensure_ascii=False), RAW_JSON_REPEAT)
+    projected_ms = _median_ms(lambda: ym.serialize_raw_info(info), RAW_JSON_REPEAT)
+    with capsys.disabled():
+        print(
+            f"\n📊 raw_json ({RAW_JSON_REPEAT}회 중앙값): json.dumps(info) {full_ms:.3f}ms / {full_bytes:,}바이트, "
+            f"serialize_raw_info {projected_ms:.3f}ms / {projected_bytes:,}바이트 "
+            f"(시간 {full_ms / projected_ms:.0f}배, 크기 {full_bytes / projected_bytes:.0f}배)"
+        )
+
+    assert json.loads(projected)["description"] == info["description"]
+    assert "googlevideo.com" not in projected and "timedtext" not in projected
+    assert projected_bytes * 20 < full_bytes
+    assert projected_ms < full_ms
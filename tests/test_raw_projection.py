@@ -0,0 +1,99 @@
+##### video_raw.raw_json에 저장할 info dict의 projection (RAW_JSON_FIELDS, RAW_JSON_FULL_ON_FIRST_SIGHT) #####
+
+import json
+
+from conftest import make_info
+
+
+def test_projection_keeps_only_allowlisted_fields(ym):
+    info = make_info("vidProj01", thumbnails=[{"url": "https://example.invalid/t.jpg"}], automatic_captions={"en": []})
+    projected = ym.project_raw_info(info)
+    assert set(projected) <= set(ym.RAW_JSON_FIELDS)
+    assert projected["title"] == info["title"]
+    for key in ("formats", "thumbnails", "automatic_captions", *ym.RAW_JSON_COUNTER_FIELDS):
+        assert key not in projected
+
+
+def test_full_dict_only_on_first_sighting(ym, monkeypatch):
+    monkeypatch.setattr(ym, "RAW_JSON_FULL_ON_FIRST_SIGHT", True)
+    info = make_info("vidProj02")
+    first = ym.project_raw_info(info, first_sighting=True)
+    assert "formats" in first # 처음 보는 영상은 전체 (조회수 같은 숫자는 video_stats에 따로 기록하므로 제외)
+    assert "view_count" not in first
+    assert "formats" not in ym.project_raw_info(info, first_sighting=False)
+
+
+def test_none_allowlist_stores_whole_dict(ym, monkeypatch):
+    monkeypatch.setattr(ym, "RAW_JSON_FIELDS", None)
+    assert "formats" in ym.project_raw_info(make_info("vidProj03"))
+
+
+def test_serialize_records_time_and_bytes(ym):
+    videos, size = ym.raw_stats["videos"], ym.raw_stats["bytes"]
+    raw_json_str = ym.serialize_raw_info(make_info("vidProj04", description="설명"))
+    assert json.loads(raw_json_str)["description"] == "설명"
+    assert ym.raw_stats["videos"] == videos + 1
+    assert ym.raw_stats["bytes"] == size + len(raw_json_str.encode("utf-8"))
+
+
+def test_stored_raw_json_has_no_stream_urls(ym):
+    ym.store_video_metadata("vidProj05", make_info("vidProj05"), None, 0.0)
+    ym.flush_video_writes()
+    raw_json = ym.conn.execute("SELECT raw_json FROM video_raw WHERE id = 'vidProj05'").fetchone()[0]
+    ym.conn.commit()
+    assert "example.invalid/stream" not in raw_json
+    assert json.loads(raw_json)["id"] == "vidProj05"
+
+
+def _ytdlp_info(video_id: str) -> dict: # yt-dlp(YTDLP_METADATA_ONLY)가 돌려주는 info dict 중 RAW_JSON_FIELDS에 해당하는 부분
+    return {
+        "id": video_id, "title": "DFRC 신제품 리뷰", "description": "설명 첫 줄\n#DFRC", "channel": "DFRC 채널",
+        "channel_id": "UCfixturechannel0000000", "channel_url": "https://www.youtube.com/channel/UCfixturechannel0000000",
+        "uploader": "DFRC 채널", "uploader_id": "@dfrc", "duration": 754, "live_status": "not_live", "availability": "public",
+        "age_limit": 0, "timestamp": 1714540000, "release_timestamp": None, "upload_date": "20240501",
+        "categories": ["Science & Technology"], "tags": ["DFRC", "리뷰"], "chapters": None,
+        "webpage_url": f"https://www.youtube.com/watch?v={video_id}", "media_type": "video",
+        "view_count": 120, "like_count": 8, "comment_count": 3, "formats": [{"url": "https://example.invalid/stream"}],
+    }
+
+
+def _api_item(video_id: str) -> dict: # 같은 영상의 videos.list 항목 (part=snippet,contentDetails,liveStreamingDetails,statistics)
+    return {
+        "id": video_id,
+        "snippet": {
+            "publishedAt": "2024-05-01T05:06:40Z", "channelId": "UCfixturechannel0000000", "title": "DFRC 신제품 리뷰",
+            "description": "설명 첫 줄\n#DFRC", "channelTitle": "DFRC 채널", "tags": ["DFRC", "리뷰"], "categoryId": "28",
+            "liveBroadcastContent": "none",
+        },
+        "contentDetails": {"duration": "PT12M34S", "contentRating": {}},
+        "statistics": {"viewCount": "135", "likeCount": "9", "commentCount": "3"},
+    }
+
+
+def test_api_and_ytdlp_project_to_the_same_raw_json(ym):
+    ytdlp = ym.project_raw_info(_ytdlp_info("vidSource01"))
+    api = ym.project_raw_info(ym._api_item_to_info(_api_item("vidSource01")), previous=ytdlp)
+    assert list(api) == list(ytdlp) == list(ym.RAW_JSON_FIELDS)
+    assert api == ytdlp
+
+    # 처음 보는 영상을 api로 가져오면 videos.list로 알 수 없는 값은 비워 둠
+    first = ym.project_raw_info(ym._api_item_to_info(_api_item("vidSource01")))
+    assert all(first[key] is None for key in ym.RAW_JSON_YTDLP_ONLY_FIELDS)
+
+
+def test_switching_backend_does_not_rewrite_video_raw(ym):
+    vid = "vidSource02"
+    ym.store_video_metadata(vid, _ytdlp_info(vid), None, 0.0)
+    ym.flush_video_writes()
+    skipped = ym.skip_stats["raw_skipped"]
+
+    # 할당량이나 API 실패로 방식이 바뀌어도 (조회수만 바뀐 상태) raw_json과 변경 이력은 그대로
+    ym.store_video_metadata(vid, ym._api_item_to_info(_api_item(vid)), None, 0.0)
+    ym.flush_video_writes()
+    ym.store_video_metadata(vid, _ytdlp_info(vid), None, 0.0)
+    ym.flush_video_writes()
+
+    assert ym.skip_stats["raw_skipped"] == skipped + 2
+    assert ym.conn.execute("SELECT COUNT(*) FROM video_raw_history WHERE video_id = ?", (vid,)).fetchone()[0] == 0
+    assert ym.load_raw_json_version(vid)["uploader_id"] == "@dfrc"
+    ym.conn.commit()
@@ -0,0 +1,62 @@
+##### 압축된 변경 이력: 설명의 단어 단위 차이, raw_json의 JSON 패치, 어떤 버전이든 다시 만들기 #####
+
+import sqlite3
+
+from conftest import make_info
+
+
+def _store(ym, video_id: str, info: dict) -> None:
+    ym.store_video_metadata(video_id, info, None, 0.0)
+    ym.flush_video_writes()
+
+
+def test_text_delta_round_trip(ym):
+    old = "첫 줄\n둘째 줄 설명입니다 https://example.com/a"
+    new = "첫 줄 (수정)\n둘째 줄 설명입니다 https://example.com/b\n셋째 줄"
+    assert ym.apply_text_delta(new, ym.make_text_delta(new, old)) == old
+
+
+def test_json_patch_round_trip(ym):
+    old = {"title": "a", "tags": ["x"], "chapters": {"n": 1, "m": 2}, "gone": 1}
+    new = {"title": "b", "tags": ["x", "y"], "chapters": {"n": 1, "m": 3}, "added": True}
+    assert ym.apply_json_patch(new, ym.make_json_patch(new, old)) == old
+
+
+def test_raw_history_version_is_assigned_at_flush(ym, monkeypatch):
+    monkeypatch.setattr(ym, "COMMIT_BATCH_VIDEOS", 100)
+    _store(ym, "vidHistory01", make_info("vidHistory01", tags=["a"]))
+
+    # 바뀐 raw_json을 모아 두는 사이에, 겹쳐 도는 다른 실행이 먼저 버전 0을 추가
+    ym.store_video_metadata("vidHistory01", make_info("vidHistory01", tags=["a", "b"]), None, 0.0)
+    other = sqlite3.connect(ym.DATABASE_FILE)
+    other.execute("INSERT INTO video_raw_history (video_id, version, patch) VALUES ('vidHistory01', 0, ?)", (ym._compress_json({}),))
+    other.commit()
+    other.close()
+    failed = ym.write_stats["failed"]
+    ym.flush_video_writes()
+
+    assert ym.write_stats["failed"] == failed
+    versions = ym.conn.execute("SELECT version FROM video_raw_history WHERE video_id = 'vidHistory01' ORDER BY version").fetchall()
+    assert [v[0] for v in versions] == [0, 1]
+    assert ym.load_raw_json_version("vidHistory01", 1)["tags"] == ["a"]
+
+
+def test_description_change_is_stored_as_word_delta_everywhere(ym):
+    old_description = " ".join(f"단어{n}" for n in range(800))
+    new_description = old_description.replace("단어400", "바뀐단어")
+    _store(ym, "vidHistory02", make_info("vidHistory02", description=old_description))
+    _store(ym, "vidHistory02", make_info("vidHistory02", description=new_description))
+
+    # video_raw_history의 패치에도 예전 설명 전체가 아니라 단어 단위 차이만 들어감
+    (blob,) = ym.conn.execute("SELECT patch FROM video_raw_history WHERE video_id = 'vidHistory02'").fetchone()
+    patch = ym._decompress_json(blob)
+    assert "description" in patch["t"] and "description" not in patch.get("s", {})
+    assert len(blob) < len(old_description.encode("utf-8")) / 20
+
+    assert ym.load_raw_json_version("vidHistory02", 0)["description"] == old_description
+    assert ym.load_video_field_history("vidHistory02", "description")[-1][2:] == (old_description, new_description)
+
+
+def test_short_string_change_keeps_old_value(ym):
+    patch = ym.make_json_patch({"title": "새 제목"}, {"title": "옛 제목"})
+    assert patch == {"s": {"title": "옛 제목"}} # 차이가 값보다 길면 예전 값을 그대로
@@ -0,0 +1,121 @@
+##### selenium 방식: 여러 검색 작업을 MAX_CONCURRENT_TABS개의 탭으로 나눠 스크롤 (WebDriver를 가짜 객체로 바꿔 크롬 사용 안 함) #####
+
+import json
+import shutil
+import subprocess
+
+import pytest
+from selenium.common.exceptions import NoSuchWindowException
+
+
+class FakeSwitchTo:
+    def __init__(self, drv):
+        self.drv = drv
+
+    def new_window(self, kind):
+        if self.drv.current not in self.drv.windows: # WebDriver 명세: 닫힌 창에서는 no such window
+            raise NoSuchWindowException("no such window")
+        handle = f"tab{len(self.drv.opened)}"
+        self.drv.windows[handle] = None
+        self.drv.opened.append(handle)
+        self.drv.current = handle
+
+    def window(self, handle):
+        if handle not in self.drv.windows:
+            raise NoSuchWindowException("no such window")
+        self.drv.current = handle
+
+
+class FakeTabDriver: # scroll_jobs_in_tabs가 쓰는 WebDriver의 일부, 검색어마다 rounds번째 회차에 검색 결과의 끝에 도달
+    def __init__(self, rounds: dict):
+        self.rounds = rounds
+        self.windows = {"home": None}
+        self.opened = []
+        self.current = "home"
+        self.progress = {}
+        self.switch_to = FakeSwitchTo(self)
+
+    @property
+    def current_window_handle(self):
+        return self.current
+
+    def set_script_timeout(self, seconds):
+        pass
+
+    def get(self, url):
+        self.windows[self.current] = url.split("search_query=", 1)[1].split("&", 1)[0]
+
+    def execute_async_script(self, script, *args):
+        query = self.windows[self.current]
+        n = self.progress.get(query, 0)
+        self.progress[query] = n + 1
+        return {"ids": [f"{query}_{n}"], "ended": n + 1 >= self.rounds[query], "reason": "grew", "waited_ms": 0, "first": n == 0}
+
+    def close(self):
+        del self.windows[self.current]
+
+    def get_log(self, kind):
+        return []
+
+
+def test_more_jobs_than_tabs_when_last_tab_finishes_first(ym, monkeypatch):
+    # 두 번째 탭(한 회차에서 가장 나중에 처리하는 탭)이 먼저 끝남 --> 그 탭을 닫은 뒤에도 남은 작업의 탭을 열 수 있어야 함
+    rounds = {"slow": 3, "fast": 1, "third": 2, "fourth": 1}
+    drv = FakeTabDriver(rounds)
+    monkeypatch.setattr(ym, "get_driver", lambda: drv)
+    monkeypatch.setattr(ym, "MAX_CONCURRENT_TABS", 2)
+    monkeypatch.setattr(ym, "LEAN_PAGE_LOAD", False)
+    monkeypatch.setattr(ym, "KNOWN_ID_EARLY_STOP", 0)
+    jobs = [{"query": q, "filter": "", "sp": "CAI%253D", "label": q, "known_ids": None} for q in rounds]
+
+    results = ym.scroll_jobs_in_tabs(jobs)
+
+    assert results == {idx: [f"{q}_{n}" for n in range(rounds[q])] for idx, q in enumerate(rounds)}
+    assert len(drv.opened) == 4
+    assert list(drv.windows) == ["home"] # 끝난 탭은 모두 닫고 처음 탭만 남김
+    assert drv.current == "home"
+
+
+##### _SCROLL_ROUND_JS의 harvest: node로 실제 스크립트를 가짜 DOM에서 실행 (node가 없으면 건너뜀) #####
+
+_NODE_HARNESS = """
+const script = %s;
+const rounds = %s;
+const retryRounds = %d;
+let links = [];
+globalThis.window = {scrollTo() {}};
+globalThis.document = {
+    documentElement: {scrollHeight: 0},
+    querySelectorAll: (sel) => sel === "a#video-title" ? links : links.map(() => ({})),
+    querySelector: () => null, // 로딩 스피너 없음 --> 매 회차 바로 "end"로 반환
+};
+globalThis.MutationObserver = class { observe() {} disconnect() {} };
+const round = new Function(script);
+const results = [];
+for (const hrefs of rounds) {
+    links = hrefs.map((href) => ({href: href ? "https://www.youtube.com/watch?v=" + href : ""}));
+    round(1000, 1000, retryRounds, (r) => results.push({ids: r.ids, dropped: r.dropped}));
+}
+console.log(JSON.stringify(results));
+"""
+
+
+def _run_harvest_rounds(ym, rounds: list, retry_rounds: int) -> list: # 회차마다 보이는 링크의 href 목록(빈 문자열은 아직 채워지지 않은 링크)을 주고 회차별 결과를 반환
+    node = shutil.which("node")
+    if not node:
+        pytest.skip("node가 없어 _SCROLL_ROUND_JS를 실행할 수 없음")
+    harness = _NODE_HARNESS % (json.dumps(ym._SCROLL_ROUND_JS), json.dumps(rounds), retry_rounds)
+    out = subprocess.run([node, "-e", harness], capture_output=True, text=True, timeout=30, check=True).stdout
+    return json.loads(out)
+
+
+def test_harvest_skips_links_without_href_and_retries_them(ym):
+    # 두 번째 링크의 href가 늦게 채워져도 그 뒤의 링크는 같은 회차에 수집하고, 늦은 링크는 채워진 회차에 수집
+    results = _run_harvest_rounds(ym, [["a", "", "c"], ["a", "b", "c", "d"]], 3)
+    assert results == [{"ids": ["a", "c"], "dropped": 0}, {"ids": ["b", "d"], "dropped": 0}]
+
+
+def test_harvest_gives_up_on_link_after_retry_rounds(ym):
+    results = _run_harvest_rounds(ym, [["a", ""], ["a", "", "c"], ["a", "", "c", "d"], ["a", "x", "c", "d"]], 2)
+    assert [r["ids"] for r in results] == [["a"], ["c"], ["d"], []]
+    assert [r["dropped"] for r in results] == [0, 0, 1, 0]
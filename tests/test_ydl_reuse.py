@@ -0,0 +1,82 @@
+##### yt-dlp: 스레드마다 YoutubeDL 객체 하나를 재사용하고 메타데이터만 추출 (YoutubeDL을 가짜 객체로 바꿔 네트워크 사용 안 함) #####
+
+import threading
+
+import pytest
+
+
+class FakeYoutubeDL: # get_ydl, extract_video_info, release_ydl가 쓰는 yt_dlp.YoutubeDL의 일부
+    created = []
+
+    def __init__(self, opts):
+        self.opts = opts
+        self.calls = []
+        self.closed = False
+        FakeYoutubeDL.created.append(self)
+
+    def extract_info(self, url, download=True, process=True):
+        self.calls.append({"url": url, "download": download, "process": process})
+        return {"id": url.rsplit("=", 1)[-1], "formats": [], "_raw": object()}
+
+    def sanitize_info(self, info):
+        return {key: value for key, value in info.items() if not key.startswith("_")}
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_ydl(ym, monkeypatch):
+    FakeYoutubeDL.created = []
+    monkeypatch.setattr(ym.yt_dlp, "YoutubeDL", FakeYoutubeDL)
+    monkeypatch.setattr(ym, "_ydl_local", threading.local())
+    monkeypatch.setattr(ym, "_ydl_instances", [])
+    return FakeYoutubeDL
+
+
+def test_one_instance_per_thread(ym, fake_ydl):
+    assert ym.get_ydl() is ym.get_ydl()
+
+    other = []
+    worker = threading.Thread(target=lambda: other.append(ym.get_ydl()))
+    worker.start()
+    worker.join()
+
+    assert len(fake_ydl.created) == 2
+    assert other[0] is not ym.get_ydl()
+
+
+def test_metadata_only_skips_processing(ym, fake_ydl, monkeypatch):
+    monkeypatch.setattr(ym, "YTDLP_METADATA_ONLY", True)
+    ym.extract_video_info("https://www.youtube.com/watch?v=vidYdl01")
+    info = ym.extract_video_info("https://www.youtube.com/watch?v=vidYdl02")
+
+    extractor = fake_ydl.created[0]
+    assert len(fake_ydl.created) == 1 # 영상마다 새로 만들지 않음
+    assert [c["process"] for c in extractor.calls] == [False, False]
+    assert info == {"id": "vidYdl02", "formats": []} # JSON으로 바꿀 수 없는 값은 sanitize_info로 정리
+
+
+def test_full_extraction_when_metadata_only_is_off(ym, fake_ydl, monkeypatch):
+    monkeypatch.setattr(ym, "YTDLP_METADATA_ONLY", False)
+    ym.extract_video_info("https://www.youtube.com/watch?v=vidYdl03")
+    assert fake_ydl.created[0].calls[0]["process"] is True
+
+
+def test_metadata_only_extractor_args(ym):
+    if not ym.YTDLP_METADATA_ONLY:
+        pytest.skip("YTDLP_METADATA_ONLY = False")
+    youtube_args = ym.ydl_opts["extractor_args"]["youtube"]
+    assert {"dash", "hls"} <= set(youtube_args["skip"])
+    assert youtube_args["player_skip"] == ["js"]
+
+
+def test_release_closes_every_instance(ym, fake_ydl):
+    ym.get_ydl()
+    worker = threading.Thread(target=ym.get_ydl)
+    worker.start()
+    worker.join()
+
+    ym.release_ydl()
+    assert [extractor.closed for extractor in fake_ydl.created] == [True, True]
+    assert ym._ydl_instances == []
@@ -0,0 +1,180 @@
+##### Made by Paleshift, DFRC #####
+
+##### 기본 라이브러리 #####
+import time
+import sqlite3
+import datetime
+from typing import Optional
+
+##### 유튜브 비공식 라이브러리 2 (Selenium) #####
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+##### HTTP 요청 라이브러리 #####
+import requests
+
+##### (선택) 메모리 측정 라이브러리: 설치되어 있지 않으면 메모리 기준 재시작은 건너뜀 #####
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+##########
+
+##### 사용자 입력 기반 기본 설정 #####
+
+DATABASE_FILE = "youtube_data.db" # youtube_monitoring.py와 같은 DB 파일 (크롬 사용 기록 공유)
+
+DEBUG_PORT = 9222 # youtube_monitoring.py가 연결할 크롬의 원격 디버깅 포트 (BROWSER_DAEMON_ADDRESS = "127.0.0.1:9222")
+
+WINDOW_SIZE = "1024,768" # 크롬 창 크기 (youtube_monitoring.py의 WINDOW_SIZE와 같게 유지)
+
+HEALTH_CHECK_INTERVAL = 30 # 30초마다 크롬 상태 확인
+MAX_PAGES_PER_SESSION = 300 # 크롬 하나로 300페이지를 열면 새 크롬으로 교체
+MAX_BROWSER_MEMORY_MB = 1500 # 크롬 전체 메모리가 1500MB를 넘으면 새 크롬으로 교체 (psutil 필요)
+
+KST = datetime.timezone(datetime.timedelta(hours=9)) # 모든 시간은 KST를 기준으로 저장
+
+##########
+
+##### DB 초기화 #####
+
+conn = sqlite3.connect(DATABASE_FILE, timeout=30) # 다른 프로세스가 쓰는 중이면 최대 30초 기다림 (busy_timeout)
+cursor = conn.cursor()
+cursor.execute("PRAGMA journal_mode=WAL")   # youtube_monitoring.py와 같은 설정: 읽기와 쓰기가 서로 막지 않음
+cursor.execute("PRAGMA synchronous=NORMAL")
+
+cursor.execute("""
+CREATE TABLE IF NOT EXISTS browser_daemon (
+    address TEXT PRIMARY KEY,
+    started_kst TEXT,
+    pages_loaded INTEGER DEFAULT 0,
+    lease_until REAL DEFAULT 0
+);
+""") # browser_daemon 테이블(크롬의 원격 디버깅 주소, 중복 불가 / 크롬을 실행한 시간 / 지금까지 연 페이지 수 / 예전 버전의 수집 작업이 크롬을 사용 중인 기한(epoch 초))
+
+cursor.execute("""
+CREATE TABLE IF NOT EXISTS browser_leases (
+    address TEXT,
+    holder TEXT,
+    lease_until REAL DEFAULT 0,
+    PRIMARY KEY(address, holder)
+);
+""") # browser_leases 테이블(크롬의 원격 디버깅 주소 / 크롬을 사용 중인 실행의 이름 / 그 실행이 크롬을 사용 중인 기한(epoch 초)), 수집 작업마다 한 행
+
+conn.commit()
+
+##########
+
+ADDRESS = f"127.0.0.1:{DEBUG_PORT}"
+
+##### 함수 #####
+
+def start_browser() -> webdriver.Chrome: # 원격 디버깅 포트를 연 크롬을 실행하고 DB의 사용 기록 초기화
+    chrome_options = Options()
+    chrome_options.add_argument("--headless=new")     # 화면을 띄우지 않고 백그라운드에서 실행
+    chrome_options.add_argument("--disable-gpu")      # GPU 가속 끄기
+    chrome_options.add_argument("--no-sandbox")       # 리눅스 환경에선 보안 샌드박스 끄기
+    chrome_options.add_argument(f"--window-size={WINDOW_SIZE}")
+    chrome_options.add_argument("--blink-settings=imagesEnabled=false")        # 이미지 그리지 않기
+    chrome_options.add_argument("--autoplay-policy=user-gesture-required")     # 미리보기 영상 자동 재생 끄기
+    chrome_options.add_argument("--mute-audio")
+    chrome_options.add_argument(f"--remote-debugging-port={DEBUG_PORT}") # 다른 프로세스가 이 크롬에 연결할 수 있도록 포트 개방
+
+    drv = webdriver.Chrome(options=chrome_options)
+
+    cursor.execute(
+        "INSERT INTO browser_daemon (address, started_kst, pages_loaded, lease_until) VALUES (?, ?, 0, 0) "
+        "ON CONFLICT(address) DO UPDATE SET started_kst = excluded.started_kst, pages_loaded = 0, lease_until = 0",
+        (ADDRESS, datetime.datetime.now(KST).strftime("%Y-%m-%dT%H:%M:%S%z")),
+    )
+    cursor.execute("DELETE FROM browser_leases WHERE address = ? AND lease_until < ?", (ADDRESS, time.time())) # 비정상 종료한 실행이 남긴 지난 기한 정리
+    conn.commit()
+
+    print(f"🚀 크롬 실행 완료: {ADDRESS}")
+    return drv
+
+
+def stop_browser(drv: Optional[webdriver.Chrome]) -> None: # 크롬 종료 (이미 죽은 경우도 무시)
+    if drv is None:
+        return
+    try:
+        drv.quit()
+    except Exception as e:
+        print(f"[Error! 크롬 종료 실패]: {e}")
+
+
+def is_browser_healthy(drv: webdriver.Chrome) -> bool: # WebDriver 세션과 원격 디버깅 포트가 모두 응답하는지 확인
+    try:
+        if drv.execute_script("return 1") != 1:
+            return False
+        resp = requests.get(f"http://{ADDRESS}/json/version", timeout=5)
+        return resp.status_code == 200
+    except Exception:
+        return False
+
+
+def get_browser_memory_mb(drv: webdriver.Chrome) -> Optional[float]: # chromedriver 아래의 크롬 프로세스 전체가 사용하는 메모리(MB), 측정할 수 없으면 None
+    if psutil is None:
+        return None
+    try:
+        root = psutil.Process(drv.service.process.pid)
+        total = 0
+        for proc in root.children(recursive=True):
+            try:
+                total += proc.memory_info().rss
+            except psutil.Error:
+                continue
+        return total / (1024 * 1024)
+    except Exception:
+        return None
+
+
+def get_usage() -> tuple: # (지금까지 연 페이지 수, 사용 기한) 조회 --> 사용 기한은 크롬을 사용 중인 실행들의 기한 중 가장 늦은 것
+    cursor.execute("SELECT pages_loaded, lease_until FROM browser_daemon WHERE address = ?", (ADDRESS,))
+    row = cursor.fetchone()
+    cursor.execute("SELECT MAX(lease_until) FROM browser_leases WHERE address = ?", (ADDRESS,))
+    lease_row = cursor.fetchone()
+    conn.commit() # 읽기 트랜잭션을 바로 끝내 다른 프로세스의 쓰기를 막지 않음
+    pages_loaded = (row[0] or 0) if row else 0
+    lease_until = max((row[1] or 0.0) if row else 0.0, (lease_row[0] or 0.0) if lease_row else 0.0)
+    return pages_loaded, lease_until
+
+##### main #####
+
+if __name__ == "__main__":
+    if psutil is None:
+        print("📌 psutil이 설치되어 있지 않아 메모리 기준 재시작은 사용하지 않음 (pip install psutil)")
+
+    drv = start_browser()
+    try:
+        while True:
+            time.sleep(HEALTH_CHECK_INTERVAL)
+
+            # 응답하지 않는 크롬은 사용 중이어도 쓸모가 없으므로 바로 교체
+            if not is_browser_healthy(drv):
+                print("[Error! 크롬이 응답하지 않음 --> 재시작]")
+                stop_browser(drv)
+                drv = start_browser()
+                continue
+
+            pages_loaded, lease_until = get_usage()
+            memory_mb = get_browser_memory_mb(drv)
+
+            reason = ""
+            if pages_loaded >= MAX_PAGES_PER_SESSION:
+                reason = f"페이지 {pages_loaded}개 사용"
+            elif memory_mb is not None and memory_mb >= MAX_BROWSER_MEMORY_MB:
+                reason = f"메모리 {memory_mb:.0f}MB 사용"
+
+            # 수집 작업이 크롬을 사용 중일 때는 교체하지 않고 사용 기한이 끝난 뒤에 교체
+            if reason and time.time() >= lease_until:
+                print(f"♻️ {reason} --> 크롬 재시작")
+                stop_browser(drv)
+                drv = start_browser()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_browser(drv)
+        conn.close()
+        print("\n✅ 종료")
@@ -1,4 +1 @@
-start python youtube_rate.py
-start python youtube_recent.py
-start python youtube_relevance.py
-start python youtube_view.py
\ No newline at end of file
+start python youtube_monitoring.py
\ No newline at end of file
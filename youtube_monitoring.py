@@ -0,0 +1,2748 @@
+##### Made by Paleshift, DFRC #####
+
+##### 기본 라이브러리 #####
+import os
+import time
+import sqlite3
+import datetime
+import re
+import json
+import zlib
+import hashlib
+import difflib
+import asyncio
+import threading
+import queue
+import random
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, Iterator, List, Set, Optional, Tuple
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:
+    ZoneInfo = None
+
+##### 유튜브 비공식 라이브러리 1 (yt-dlp) #####
+import yt_dlp
+
+##### 유튜브 비공식 라이브러리 2 (Selenium) #####
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import (
+    StaleElementReferenceException,
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+)
+
+##### 유튜브 공식 라이브러리 (YouTube Data API v3) #####
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+##########
+
+##### 사용자 입력 기반 기본 설정 #####
+
+# 모니터링할 검색어 목록 (TODO: 원하는 검색어로 교체)
+# "filters"를 생략하면 아래 SEARCH_FILTERS의 모든 필터로 검색하고, 필터 이름의 리스트를 주면 그 필터로만 검색
+QUERIES = [
+    {"query": "DFRC"},
+    # {"query": "다른 검색어", "filters": ["업로드 날짜", "조회수"]},
+]
+
+# 한 번의 실행에서 차례로 검색할 필터 목록 (필터 이름: sp 값)
+# 모든 필터는 업로드 날짜(지난 1시간) + 구분(동영상)이며 정렬기준만 다름
+SEARCH_FILTERS = {
+    "평점": "CAESBAgBEAE%253D",
+    "업로드 날짜": "CAISBAgBEAE%253D",
+    "관련성": "CAASBAgBEAE%253D",
+    "조회수": "CAMSBAgBEAE%253D",
+}
+
+DATABASE_FILE = "youtube_data.db" # 검색 결과가 저장될 DB의 파일명
+DB_BUSY_TIMEOUT = 30.0 # 다른 프로세스가 DB에 쓰는 중이면 최대 30초까지 기다림 (busy_timeout)
+DB_BUSY_RETRIES = 5 # 그래도 잠겨 있으면(database is locked) 잠시 쉬었다가 최대 5번 재시도
+DB_BUSY_BACKOFF = 0.2 # 재시도 전에 쉬는 시간의 상한 (0~0.2초, 0~0.4초, 0~0.8초, ... 중 임의의 시간)
+
+# 영상 메타데이터(videos, video_raw)를 DB에 확정(커밋)하는 빈도
+# "batch": 영상 COMMIT_BATCH_VIDEOS개 또는 COMMIT_BATCH_SECONDS초마다 한 트랜잭션으로 커밋
+#          (비정상 종료 시 커밋하지 않은 마지막 묶음을 잃음 --> 다음 실행에서 다시 검색된 영상만 다시 저장되고, 검색 기간(지난 1시간)을 벗어난 영상은 잃은 채로 남음)
+# "every": 영상마다 커밋 (디스크 동기화가 영상 수만큼 일어나지만 잃을 수 있는 건 저장 중이던 영상 하나)
+DB_DURABILITY = "batch"
+COMMIT_BATCH_VIDEOS = 50
+COMMIT_BATCH_SECONDS = 10.0
+
+DISCOVERY_BACKEND = "http" # 영상 ID 수집 방식 ("http": 브라우저 없이 검색 결과 JSON 파싱 / "selenium": 크롬으로 스크롤), http가 실패하면 selenium으로 대체
+
+INITIAL_LOAD_TIMEOUT = 15.0 # 검색 결과 페이지의 첫 결과가 뜰 때까지 최대 15초 대기
+SCROLL_WAIT_TIMEOUT = 8.0 # 한 번 스크롤 내린 후 새 영상이 로딩될 때까지 최대 8초 대기
+SCROLL_STABLE_ROUNDS = 2 # 새 영상 없이 대기 시간을 2번 연속 다 쓰면 스크롤 종료
+MAX_SCROLL_TRIES = 100 # 최대 100번까지만 스크롤하고 정지
+HARVEST_RETRY_ROUNDS = 3 # href가 비어 있는 영상 링크는 건너뛰고 다음 회차부터 최대 3회차까지 다시 확인한 뒤 포기
+
+LEAN_PAGE_LOAD = True # 검색 결과 페이지에서 영상 링크 외의 이미지, 영상, 폰트, 광고/통계 요청을 차단
+WINDOW_SIZE = "1024,768" # 크롬 창 크기 (작을수록 화면을 그리는 비용이 줄어듦)
+BLOCKED_URL_PATTERNS = [ # LEAN_PAGE_LOAD일 때 차단할 요청 (CDP Network.setBlockedURLs 형식, *는 와일드카드)
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.svg", "*.ico",   # 이미지
+    "*.woff", "*.woff2", "*.ttf", "*.otf",                              # 폰트
+    "*i.ytimg.com/*", "*yt3.ggpht.com/*", "*googlevideo.com/*",         # 썸네일, 미리보기 영상
+    "*doubleclick.net/*", "*googlesyndication.com/*", "*googleadservices.com/*", "*/pagead/*", # 광고
+    "*google-analytics.com/*", "*googletagmanager.com/*", "*play.google.com/log*",            # 통계
+    "*/api/stats/*", "*/ptracking*", "*/generate_204*", "*/youtubei/v1/log_event*",
+]
+
+MAX_CONCURRENT_TABS = 4 # 하나의 크롬 안에서 동시에 열어둘 검색 결과 탭의 최대 개수 (http 방식에서는 동시 요청 수)
+
+BROWSER_DAEMON_ADDRESS = "" # youtube_browser_daemon.py가 띄워둔 크롬에 연결할 주소 (Ex: "127.0.0.1:9222"), 비어 있거나 연결에 실패하면 크롬을 직접 실행
+BROWSER_LEASE_SECONDS = 600 # 데몬의 크롬을 사용 중이라고 알리는 기한(초), 페이지를 열거나 스크롤할 때 기한이 절반 이하로 남았으면 연장되며 기한 안에는 데몬이 크롬을 재시작하지 않음
+
+KNOWN_ID_EARLY_STOP = 20 # 새로 나타난 영상이 20개 연속으로 이미 DB에 저장된 영상이면 스크롤(다음 페이지 요청) 중단, 0이면 사용 안 함
+KNOWN_ID_LOOKBACK_HOURS = 3 # 최근 3시간 안에 업로드되어 저장된 영상을 "이미 저장된 영상"으로 간주
+EARLY_STOP_FILTERS = {"업로드 날짜"} # 위 조기 중단을 적용할 필터 (최신순 정렬이라 이미 본 영상이 나오면 그 뒤도 이미 본 영상)
+
+MAX_CONTINUATION_PAGES = 100 # http 방식에서 최대 100페이지까지만 다음 검색 결과를 요청하고 정지
+HTTP_TIMEOUT = 15 # http 요청 1회의 최대 대기 시간(초)
+HTTP_HEADERS = { # 일반 브라우저처럼 보이도록 보내는 헤더
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+    "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
+}
+
+METADATA_BACKEND = "api" # 영상 메타데이터 수집 방식 ("api": YouTube Data API v3 videos.list로 50개씩 한 번에 / "yt-dlp": 영상마다 yt-dlp), api가 돌려주지 않은 영상은 yt-dlp로 대체
+METADATA_WORKERS = 4 # yt-dlp로 동시에 메타데이터를 추출할 스레드 수 (1이면 한 영상씩 차례로 처리), DB 저장은 항상 메인 스레드 하나가 담당
+PIPELINE_MODE = "streaming" # "streaming": 검색 중에 찾은 영상을 바로 메타데이터/댓글 단계로 흘려보냄 / "batch": 검색을 모두 끝낸 뒤 차례로 처리
+COMMENT_WORKERS = 2 # 동시에 댓글을 가져올 스레드 수 (DB 저장은 항상 메인 스레드 하나가 담당)
+COMMENT_PAGE_QUEUE_SIZE = 8 # 저장을 기다리는 댓글 페이지(최대 100 스레드 + 답글)를 8개까지만 쌓아둠 (가득 차면 수집 스레드가 기다림)
+STREAM_QUEUE_SIZE = 100 # streaming 방식에서 단계 사이에 쌓아둘 수 있는 최대 영상 수 (가득 차면 앞 단계가 기다림)
+STREAM_BATCH_WAIT = 2.0 # streaming + api 방식에서 50개가 모이지 않아도 마지막 영상이 들어온 뒤 2초가 지나면 videos.list 호출
+
+COMMENT_INCREMENTAL = True # 영상마다 지난번에 가져온 가장 최신 댓글을 기억해두고, 그보다 오래된 댓글이 나오는 페이지에서 수집 중단
+COMMENT_FULL_SWEEP_HOURS = 24 # 24시간마다 한 번은 모든 댓글을 다시 가져와 수정/삭제된 댓글과 오래된 댓글의 새 답글 반영
+COMMENT_COUNT_GATE = True # 영상에 표시된 댓글 수가 지난번에 댓글을 모두 가져왔을 때와 같으면 댓글 수집을 건너뜀 (COMMENT_FULL_SWEEP_HOURS가 지나면 수정된 댓글 반영을 위해 다시 수집)
+COMMENTS_DISABLED_RECHECK_HOURS = 168 # 댓글 사용이 중지된 영상은 7일 동안 댓글 수집을 건너뜀 (그 뒤 다시 확인)
+
+YTDLP_METADATA_ONLY = True # yt-dlp에서 DB에 저장하는 메타데이터만 추출 (포맷 목록, DASH/HLS 매니페스트, 플레이어 JS 처리 생략)
+
+# video_raw.raw_json에 저장할 info dict의 key (formats, thumbnails, automatic_captions, 곧 만료되는 서명된 스트림 url처럼 분석에 쓰지 않는 큰 값은 제외)
+# None이면 예전처럼 info dict 전체를 저장 (어느 쪽이든 RAW_JSON_COUNTER_FIELDS는 제외)
+RAW_JSON_FIELDS = (
+    "id", "title", "fulltitle", "description", "channel", "channel_id", "channel_url", "uploader", "uploader_id",
+    "duration", "live_status", "is_live", "was_live", "availability", "age_limit",
+    "timestamp", "release_timestamp", "upload_date",
+    "categories", "tags", "chapters", "webpage_url", "media_type",
+)
+# 활동 중인 영상이면 매시간 바뀌는 숫자 --> raw_json(지문 raw_hash와 video_raw_history의 비교 대상)에 넣지 않고 video_stats 테이블에 따로 기록
+RAW_JSON_COUNTER_FIELDS = ("view_count", "like_count", "comment_count", "channel_follower_count", "concurrent_view_count")
+# videos.list로는 알 수 없는 key --> api 방식으로 가져온 영상은 지난번 raw_json(yt-dlp)의 값을 그대로 둠 (방식이 바뀔 때마다 raw_json이 바뀌지 않도록)
+RAW_JSON_YTDLP_ONLY_FIELDS = ("uploader_id", "availability", "chapters", "media_type")
+RAW_JSON_FULL_ON_FIRST_SIGHT = False # True면 처음 보는 영상만 info dict 전체를 저장 (이후에는 video_raw_history의 첫 버전으로 남음)
+
+HTTP_POOL_SIZE = 10 # 호스트마다 재사용할 HTTP 연결(keep-alive) 수
+HTTP_RETRIES = 3 # 연결 실패, 429, 5xx 응답일 때 최대 3번 재시도
+HTTP_BACKOFF = 0.5 # 재시도 간격 (0.5초, 1초, 2초, ...)
+API_PARTIAL_RESPONSE = True # commentThreads 호출 시 fields=로 실제로 읽는 값만 받음
+
+API_DAILY_QUOTA = 10000 # API 키 하나의 하루 할당량(unit), 매일 태평양 시간 자정에 초기화
+API_QUOTA_RESERVE = 200 # 할당량이 200 unit 남으면 더 이상 호출하지 않음 (직접 확인할 때 쓸 여유분)
+API_QUOTA_LOW = 2000 # 남은 할당량이 2000 unit보다 적으면 새 댓글이 많을 것으로 예상되는 영상부터 댓글 수집
+API_QUOTA_BLOCK = 20 # DB에서 한 번에 20 unit씩 예약해 두고 사용 (호출할 때마다 DB에 쓰지 않도록)
+API_QUOTA_COSTS = {"videos": 1, "commentThreads": 1, "search": 100} # API 종류별 호출 1번의 비용(unit)
+API_MAX_RPS = 5.0 # 초당 최대 API 호출 수 (모든 스레드 합계)
+
+KST = datetime.timezone(datetime.timedelta(hours=9)) # 모든 시간은 KST를 기준으로 저장
+
+# API 할당량의 날짜 기준 (tzdata가 없는 Windows에서는 서머타임 없이 UTC-8로 계산)
+try:
+    PACIFIC = ZoneInfo("America/Los_Angeles") if ZoneInfo else datetime.timezone(datetime.timedelta(hours=-8))
+except Exception:
+    PACIFIC = datetime.timezone(datetime.timedelta(hours=-8))
+
+YOUTUBE_API_KEY = "YouTube Data API v3" # TODO: 본인의 YouTube Data API v3 키로 교체
+
+##########
+
+##### DB 초기화 #####
+
+##### 매시간 여러 프로세스(수집 작업, 크롬 데몬)가 같은 DB 파일에 동시에 쓰므로 #####
+##### WAL(읽기와 쓰기가 서로 막지 않음) + busy_timeout + 잠겨 있을 때 임의 시간 쉬었다가 재시도 #####
+
+db_stats = {"write_txns": 0, "lock_wait_sec": 0.0, "busy_retries": 0} # 이번 실행에서 연 쓰기 트랜잭션 수 / 쓰기 잠금을 얻기까지 걸린 시간 합계(재시도 대기 포함) / database is locked로 재시도한 횟수
+db_stats_lock = threading.Lock()
+
+
+def _is_busy_error(e: sqlite3.Error) -> bool: # 다른 연결이 DB를 잠가서 실패했는지 확인
+    message = str(e).lower()
+    return isinstance(e, sqlite3.OperationalError) and ("locked" in message or "busy" in message)
+
+
+def run_with_busy_retry(fn: Callable, *args): # fn(*args)가 database is locked로 실패하면 임의 시간(jitter) 쉬었다가 다시 실행
+    for attempt in range(DB_BUSY_RETRIES + 1):
+        try:
+            return fn(*args)
+        except sqlite3.OperationalError as e:
+            if not _is_busy_error(e) or attempt >= DB_BUSY_RETRIES:
+                raise
+            delay = random.uniform(0, DB_BUSY_BACKOFF * (2 ** attempt)) # 여러 프로세스가 같은 순간에 다시 부딪히지 않도록 임의 시간
+            with db_stats_lock:
+                db_stats["busy_retries"] += 1
+                db_stats["lock_wait_sec"] += delay
+            time.sleep(delay)
+
+
+class BusyRetryCursor(sqlite3.Cursor): # 트랜잭션 밖에서 실행하는 문장(읽기, 쓰기 트랜잭션을 여는 첫 쓰기)이 잠금 때문에 실패하면 재시도하는 Cursor
+    def execute(self, sql, parameters=()):
+        return self._run(super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self._run(super().executemany, sql, seq_of_parameters)
+
+    def _run(self, method: Callable, sql: str, parameters):
+        # 이미 트랜잭션 안이면 재시도할 수 없음 (앞에서 쓴 내용이 함께 취소되므로 호출한 쪽에서 처리)
+        if self.connection.in_transaction:
+            return method(sql, parameters)
+        started = time.perf_counter()
+        result = run_with_busy_retry(method, sql, parameters)
+        if self.connection.in_transaction: # 이 문장이 쓰기 트랜잭션을 열었음 (BEGIN IMMEDIATE에서 쓰기 잠금을 기다린 시간 포함)
+            with db_stats_lock:
+                db_stats["write_txns"] += 1
+                db_stats["lock_wait_sec"] += time.perf_counter() - started
+        return result
+
+
+def connect_db() -> sqlite3.Connection: # DB 연결 생성 (WAL, busy_timeout, synchronous=NORMAL / 쓰기 트랜잭션은 처음부터 쓰기 잠금을 잡는 BEGIN IMMEDIATE로 시작)
+    # timeout은 sqlite의 busy_timeout으로 설정됨
+    # isolation_level="IMMEDIATE": 읽은 뒤 쓰려다 잠금을 얻지 못해 바로 실패하는 일 없이, 첫 쓰기에서 busy_timeout만큼 기다림
+    db_conn = sqlite3.connect(DATABASE_FILE, timeout=DB_BUSY_TIMEOUT, isolation_level="IMMEDIATE")
+    db_cursor = db_conn.cursor(BusyRetryCursor)
+    db_cursor.execute("PRAGMA journal_mode=WAL")   # DB 파일에 기록되므로 한 번 바꾸면 다른 프로세스의 연결에도 적용
+    db_cursor.execute("PRAGMA synchronous=NORMAL") # WAL에서는 커밋마다 디스크 동기화를 하지 않아도 DB가 깨지지 않음
+    return db_conn
+
+
+def db_write_once(sql: str, params: tuple) -> None: # 새 연결로 쓰기 한 번 실행 후 커밋 (메인 스레드가 아닌 곳에서 DB에 쓸 때 사용)
+    db_conn = connect_db()
+    try:
+        db_conn.cursor(BusyRetryCursor).execute(sql, params)
+        db_conn.commit()
+    finally:
+        db_conn.close()
+
+
+def print_db_stats() -> None: # 이번 실행의 DB 쓰기 잠금 대기 통계 출력
+    if db_stats["write_txns"]:
+        print(f"🗄️ DB 쓰기 트랜잭션 {db_stats['write_txns']}회 / 쓰기 잠금 대기 합계 {db_stats['lock_wait_sec']:.2f}초 / database is locked 재시도 {db_stats['busy_retries']}회")
+
+
+conn = connect_db() # DB 파일에 연결
+cursor = conn.cursor(BusyRetryCursor) # SQL 명령어를 실행해줄 Cursor 생성 
+
+##### 스키마 마이그레이션 #####
+
+##### DB 파일의 PRAGMA user_version에 마지막으로 적용한 단계 번호를 기록하고, 그보다 큰 번호의 단계만 순서대로 적용 #####
+##### 각 단계는 BEGIN IMMEDIATE 트랜잭션 하나로 적용되므로 매시간 여러 프로세스가 동시에 시작해도 한 프로세스만 적용하고 나머지는 기다렸다가 건너뜀 #####
+##### 스키마를 바꿀 때는 기존 단계를 고치지 말고 MIGRATIONS 끝에 새 단계를 추가 #####
+
+def _add_column_if_missing(cur: sqlite3.Cursor, table_name: str, column_def: str) -> None: # 테이블에 특정 column이 없으면 해당 column을 추가
+    col_name = column_def.split()[0] # Ex) revised_contents TEXT --> revised_contents
+    cur.execute(f"PRAGMA table_info({table_name})") # 현재 테이블의 column 정보 조회
+    cols = [r[1] for r in cur.fetchall()] # 존재하는 column 이름들의 리스트 생성 
+    if col_name not in cols: # 만약 특정 column이 리스트에 없으면 해당 column을 추가
+        cur.execute(f"ALTER TABLE {table_name} ADD COLUMN {column_def}")
+
+
+def _migration_1_baseline(cur: sqlite3.Cursor) -> None: # user_version이 없던 시절의 스키마 (이미 일부가 만들어진 DB에서도 안전하게 맞춰줌)
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS videos (
+        id TEXT PRIMARY KEY, 
+        title TEXT,          
+        channel TEXT,        
+        publish_time TEXT,   
+        description TEXT,    
+        duration TEXT,       
+        status TEXT,         
+        url TEXT             
+    );
+    """) # videos 테이블(영상의 vid, 중복 불가 / 영상의 제목 / 영상을 업로드한 채널의 이름 / 영상을 업로드한 시간 / 영상에 대한 설명 / 영상의 길이 / 영상의 종류 / 영상의 url) 
+
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS comments (
+        video_id TEXT,                              
+        comment TEXT,                               
+        author_name TEXT,                           
+        author_channel_id TEXT,                     
+        author_channel_url TEXT,                    
+        comment_time_kst TEXT,                      
+        FOREIGN KEY(video_id) REFERENCES videos(id)
+    );
+    """) # comments 테이블(댓글이 속해있는 영상의 vid / 댓글 내용 / 댓글 작성자 채널의 이름 / 댓글 작성자 채널의 id / 댓글 작성자 채널의 url / 댓글을 작성한 시간 / videos 테이블의 id column을 참조해 videos_id를 foreign key로 설정)
+
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS video_queries (
+        video_id TEXT,
+        query TEXT,
+        filter_name TEXT,
+        first_seen_kst TEXT,
+        last_seen_kst TEXT,
+        PRIMARY KEY (video_id, query, filter_name),
+        FOREIGN KEY(video_id) REFERENCES videos(id)
+    );
+    """) # video_queries 테이블(검색된 영상의 vid / 영상을 찾아낸 검색어 / 영상을 찾아낸 필터의 이름 / 처음 찾아낸 시간 / 마지막으로 찾아낸 시간 / 세 값의 조합은 중복 불가)
+
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS comment_fetch_state (
+        video_id TEXT PRIMARY KEY,
+        newest_thread_id TEXT,
+        newest_comment_time_kst TEXT,
+        last_full_sweep_kst TEXT,
+        FOREIGN KEY(video_id) REFERENCES videos(id)
+    );
+    """) # comment_fetch_state 테이블(영상의 vid, 중복 불가 / 지금까지 가져온 가장 최신 댓글 스레드의 id / 그 댓글을 작성한 시간 / 마지막으로 모든 댓글을 다시 가져온 시간)
+
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS browser_daemon (
+        address TEXT PRIMARY KEY,
+        started_kst TEXT,
+        pages_loaded INTEGER DEFAULT 0,
+        lease_until REAL DEFAULT 0
+    );
+    """) # browser_daemon 테이블(youtube_browser_daemon.py가 띄운 크롬의 원격 디버깅 주소, 중복 불가 / 크롬을 실행한 시간 / 지금까지 연 페이지 수 / 수집 작업이 크롬을 사용 중인 기한(epoch 초))
+
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS api_quota (
+        quota_date TEXT PRIMARY KEY,
+        used_units INTEGER DEFAULT 0
+    );
+    """) # api_quota 테이블(할당량의 날짜(태평양 시간 기준), 중복 불가 / 그날 사용했거나 예약한 unit 수) --> 매시간 실행되는 여러 프로세스가 함께 사용
+
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS video_raw (
+        id TEXT PRIMARY KEY,                  
+        raw_json TEXT,                        
+        FOREIGN KEY(id) REFERENCES videos(id)
+    );
+    """) # video_raw 테이블(영상의 vid, 중복 불가 / JSON 원본 텍스트 / videos 테이블의 id column을 참조해 id를 foreign key로 설정)
+
+    ##### videos.revised_contents: videos 테이블의 수정 사항 기록 #####
+    ##### video_raw.revised_count: video_raw 테이블의 수정 사항 발생 횟수 기록 #####
+    ##### comments.revised_contents: comments 테이블의 수정 사항 기록 #####
+    _add_column_if_missing(cur, "videos", "revised_contents TEXT")
+    _add_column_if_missing(cur, "video_raw", "revised_count INTEGER DEFAULT 0")
+    _add_column_if_missing(cur, "comments", "revised_contents TEXT")
+
+    ##### comments.comment_id: API가 준 댓글 고유 ID (답글도 각자 고유 ID를 가짐) --> 중복 불가 #####
+    ##### comments.parent_id: 답글이면 댓글 스레드(최상위 댓글)의 ID, 최상위 댓글이면 빈 문자열 #####
+    ##### 예전에 저장한 댓글은 comment_id가 NULL이며, 다음 수집 때 [영상ID + 작성자채널ID + 작성시간]으로 찾아 ID를 채움 #####
+    _add_column_if_missing(cur, "comments", "comment_id TEXT")
+    _add_column_if_missing(cur, "comments", "parent_id TEXT")
+    cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_comments_comment_id ON comments (comment_id)") # NULL(예전 댓글)은 여러 개여도 됨
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_comments_legacy_key ON comments (video_id, author_channel_id, comment_time_kst)") # 예전 댓글에 ID를 채울 때, 영상별 댓글 수를 셀 때 사용
+
+
+def _migration_2_indexes(cur: sqlite3.Cursor) -> None: # 수집과 조회에 필요한 보조 인덱스
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_comments_video_time ON comments (video_id, comment_time_kst)")  # 영상별 댓글을 시간순으로 조회
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_comments_parent ON comments (parent_id)")                       # 댓글 스레드별 답글 조회
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_videos_publish_time ON videos (publish_time)")                  # 최근 업로드된 영상 조회 (load_recent_video_ids)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_videos_channel ON videos (channel, publish_time)")              # 채널별 영상을 시간순으로 조회
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_video_queries_query ON video_queries (query, filter_name)")     # 검색어(+필터)별 영상 조회
+
+
+##### 수정 이력 #####
+
+##### 예전에는 "1. (title: 예전 값 --> 새 값), (status: ... --> ...) 2. (...)" 형태의 문자열을 revised_contents에 이어 붙였으나 #####
+##### 이제는 video_revisions / comment_revisions 테이블에 바뀐 값 하나당 한 줄씩 추가 (수정 번호는 videos.revision_count / comments.revision_count에 보관) #####
+
+VIDEO_REVISION_FIELDS = ("title", "channel", "publish_time", "description", "duration", "status", "url") # videos 테이블에서 수정 이력을 남기는 column
+COMMENT_REVISION_FIELDS = ("comment", "author_name", "author_channel_url", "comment_time_kst")            # comments 테이블에서 수정 이력을 남기는 column
+LEGACY_COMMENT_ID_PREFIX = "legacy:" # ID가 없던 예전 댓글에 붙이는 임시 ID의 접두사 ("legacy:" + rowid), 다시 수집될 때 API가 준 ID로 바뀜
+
+
+def _legacy_comment_id_range() -> Tuple[str, str]: # 임시 ID의 범위 (comment_id >= 앞 AND comment_id < 뒤 --> comment_id 인덱스 사용)
+    return LEGACY_COMMENT_ID_PREFIX, LEGACY_COMMENT_ID_PREFIX[:-1] + chr(ord(LEGACY_COMMENT_ID_PREFIX[-1]) + 1)
+
+
+def _legacy_comment_sql() -> str: # ID가 없거나 임시 ID인 예전 댓글의 조건 (값을 그대로 넣어야 sqlite가 idx_comments_legacy 부분 인덱스를 사용)
+    low, high = _legacy_comment_id_range()
+    return f"(comment_id IS NULL OR (comment_id >= '{low}' AND comment_id < '{high}'))"
+
+
+def _parse_revised_contents(revised_contents: str, fields: Tuple[str, ...]) -> List[Tuple[int, str, str, str]]: # 예전 revised_contents 문자열을 (수정 번호, column, 예전 값, 새 값) 목록으로 변환
+    # 값 안에 "2." 같은 문자열이 있어도 잘못 나누지 않도록, 수정 번호는 1부터 차례로 "N. (column: " 형태일 때만 인정
+    if not revised_contents or not revised_contents.strip():
+        return []
+    field_pattern = "|".join(re.escape(f) for f in fields)
+    text = revised_contents.strip()
+
+    round_starts: List[Tuple[int, int]] = [] # (수정 번호, 그 수정의 내용이 시작하는 위치)
+    pos = 0
+    number = 1
+    while True:
+        m = re.compile(rf"(?:^| ){number}\. (?=\((?:{field_pattern}): )").search(text, pos)
+        if not m:
+            break
+        round_starts.append((number, m.end()))
+        pos = m.end()
+        number += 1
+
+    parsed: List[Tuple[int, str, str, str]] = []
+    for i, (number, start) in enumerate(round_starts):
+        end = round_starts[i + 1][1] - len(f" {round_starts[i + 1][0]}. ") if i + 1 < len(round_starts) else len(text)
+        round_text = text[start:end]
+        entries = list(re.finditer(rf"(?:^|, )\(({field_pattern}): ", round_text))
+        for j, entry in enumerate(entries):
+            entry_end = entries[j + 1].start() if j + 1 < len(entries) else len(round_text)
+            body = round_text[entry.end():entry_end]
+            if body.endswith(")"):
+                body = body[:-1]
+            old_value, _, new_value = body.partition(" --> ")
+            parsed.append((number, entry.group(1), old_value, new_value))
+    return parsed
+
+
+def _migration_3_revision_tables(cur: sqlite3.Cursor) -> None: # 수정 이력 테이블을 만들고 예전 revised_contents 문자열을 옮김
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS video_revisions (
+        video_id TEXT,
+        revision INTEGER,
+        field TEXT,
+        old_value TEXT,
+        new_value TEXT,
+        observed_kst TEXT,
+        FOREIGN KEY(video_id) REFERENCES videos(id)
+    );
+    """) # video_revisions 테이블(영상의 vid / 몇 번째 수정인지 / 바뀐 column / 예전 값 / 새 값 / 바뀐 것을 발견한 시간(예전 문자열에서 옮긴 이력은 NULL))
+
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS comment_revisions (
+        comment_id TEXT,
+        video_id TEXT,
+        revision INTEGER,
+        field TEXT,
+        old_value TEXT,
+        new_value TEXT,
+        observed_kst TEXT
+    );
+    """) # comment_revisions 테이블(댓글의 id / 댓글이 속해있는 영상의 vid / 몇 번째 수정인지 / 바뀐 column / 예전 값 / 새 값 / 바뀐 것을 발견한 시간)
+
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_video_revisions_video ON video_revisions (video_id, revision)")       # 영상별 수정 이력
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_video_revisions_field ON video_revisions (field, observed_kst)")      # Ex) 이번 주의 제목 변경
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_comment_revisions_comment ON comment_revisions (comment_id, revision)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_comment_revisions_video ON comment_revisions (video_id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_comment_revisions_field ON comment_revisions (field, observed_kst)")
+
+    _add_column_if_missing(cur, "videos", "revision_count INTEGER DEFAULT 0")   # 지금까지의 수정 횟수 (다음 수정 번호 = revision_count + 1)
+    _add_column_if_missing(cur, "comments", "revision_count INTEGER DEFAULT 0")
+
+    # 예전 문자열을 옮긴 뒤 revised_contents는 비움
+    # (comment_id가 아직 없는 예전 댓글은 마이그레이션 8단계에서 임시 ID를 붙인 뒤 옮김)
+    for vid, revised_contents in cur.execute("SELECT id, revised_contents FROM videos WHERE revised_contents IS NOT NULL AND revised_contents != ''").fetchall():
+        parsed = _parse_revised_contents(revised_contents, VIDEO_REVISION_FIELDS)
+        cur.executemany(
+            "INSERT INTO video_revisions (video_id, revision, field, old_value, new_value, observed_kst) VALUES (?, ?, ?, ?, ?, NULL)",
+            [(vid, number, field, old_value, new_value) for number, field, old_value, new_value in parsed],
+        )
+        cur.execute("UPDATE videos SET revision_count = ?, revised_contents = NULL WHERE id = ?", (max((r[0] for r in parsed), default=0), vid))
+
+    _move_comment_revised_contents(cur, "comment_id IS NOT NULL")
+
+
+def _move_comment_revised_contents(cur: sqlite3.Cursor, where_sql: str, params: tuple = ()) -> None: # where_sql에 해당하는 댓글의 revised_contents 문자열을 comment_revisions로 옮기고 비움
+    for comment_id, vid, revised_contents in cur.execute(
+        f"SELECT comment_id, video_id, revised_contents FROM comments WHERE {where_sql} AND revised_contents IS NOT NULL AND revised_contents != ''",
+        params,
+    ).fetchall():
+        parsed = _parse_revised_contents(revised_contents, COMMENT_REVISION_FIELDS)
+        cur.executemany(
+            "INSERT INTO comment_revisions (comment_id, video_id, revision, field, old_value, new_value, observed_kst) VALUES (?, ?, ?, ?, ?, ?, NULL)",
+            [(comment_id, vid, number, field, old_value, new_value) for number, field, old_value, new_value in parsed],
+        )
+        cur.execute("UPDATE comments SET revision_count = ?, revised_contents = NULL WHERE comment_id = ?", (max((r[0] for r in parsed), default=0), comment_id))
+
+
+def _migration_4_compact_deltas(cur: sqlite3.Cursor) -> None: # 설명 변경은 차이만, raw_json 변경은 JSON 패치만 압축해서 저장
+    ##### video_revisions.delta: 긴 텍스트(description)는 old_value / new_value 대신 새 값에서 예전 값을 다시 만드는 단어 단위 차이를 zlib으로 압축해 저장 #####
+    _add_column_if_missing(cur, "video_revisions", "delta BLOB")
+
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS video_raw_history (
+        video_id TEXT,
+        version INTEGER,
+        observed_kst TEXT,
+        patch BLOB,
+        PRIMARY KEY (video_id, version),
+        FOREIGN KEY(video_id) REFERENCES videos(id)
+    );
+    """) # video_raw_history 테이블(영상의 vid / 예전 raw_json의 버전 번호(처음 저장한 것이 0) / 새 raw_json으로 바뀐 것을 발견한 시간 / 새 raw_json에서 그 버전을 다시 만드는 JSON 패치(zlib 압축))
+
+
+def _migration_5_content_hashes(cur: sqlite3.Cursor) -> None: # 값이 바뀌지 않은 영상은 쓰지 않고 건너뛰기 위한 지문 column
+    ##### videos.fields_hash: 비교하는 column(VIDEO_REVISION_FIELDS) 값들의 지문 / video_raw.raw_hash: raw_json의 지문 #####
+    ##### 예전 행은 NULL이며, 다음 수집 때 값을 비교한 뒤 채움 #####
+    _add_column_if_missing(cur, "videos", "fields_hash TEXT")
+    _add_column_if_missing(cur, "video_raw", "raw_hash TEXT")
+
+
+def _migration_6_comment_gate(cur: sqlite3.Cursor) -> None: # 댓글 수가 그대로인 영상과 댓글 사용이 중지된 영상의 댓글 수집을 건너뛰기 위한 column
+    ##### comment_fetch_state.last_comment_count: 마지막으로 댓글을 끝까지 가져왔을 때 영상에 표시된 댓글 수 #####
+    ##### comment_fetch_state.comments_disabled: 댓글 사용이 중지된 영상(commentThreads가 403 commentsDisabled로 응답)이면 1 #####
+    ##### comment_fetch_state.disabled_checked_kst: 댓글 사용 중지를 마지막으로 확인한 시간 #####
+    _add_column_if_missing(cur, "comment_fetch_state", "last_comment_count INTEGER")
+    _add_column_if_missing(cur, "comment_fetch_state", "comments_disabled INTEGER DEFAULT 0")
+    _add_column_if_missing(cur, "comment_fetch_state", "disabled_checked_kst TEXT")
+
+
+def _migration_7_browser_leases(cur: sqlite3.Cursor) -> None: # 데몬의 크롬 사용 기한을 실행마다 따로 기록 (동시에 도는 실행이 서로의 기한을 지우지 않도록)
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS browser_leases (
+        address TEXT,
+        holder TEXT,
+        lease_until REAL DEFAULT 0,
+        PRIMARY KEY(address, holder)
+    );
+    """) # browser_leases 테이블(크롬의 원격 디버깅 주소 / 크롬을 사용 중인 실행의 이름 / 그 실행이 크롬을 사용 중인 기한(epoch 초)), 데몬은 가장 늦은 기한까지 재시작하지 않음
+
+
+def _migration_8_legacy_comment_ids(cur: sqlite3.Cursor) -> None: # ID가 없는 예전 댓글에 임시 ID를 붙이고 revised_contents 문자열을 수정 이력 테이블로 옮김
+    ##### 예전 댓글의 ID는 다시 수집될 때 채우지만, 검색 기간(지난 1시간)을 벗어난 영상은 다시 수집되지 않으므로 #####
+    ##### 임시 ID "legacy:" + rowid를 붙여 수정 이력을 지금 옮겨 둠 (다시 수집되면 _backfill_legacy_comment_ids가 API의 ID로 바꿈) #####
+    cur.execute("UPDATE comments SET comment_id = ? || rowid WHERE comment_id IS NULL", (LEGACY_COMMENT_ID_PREFIX,))
+    _move_comment_revised_contents(cur, "comment_id >= ? AND comment_id < ?", _legacy_comment_id_range())
+
+
+def _migration_9_video_stats(cur: sqlite3.Cursor) -> None: # raw_json에서 뺀 조회수, 좋아요 수 같은 숫자를 따로 기록하는 테이블
+    ##### 예전 video_raw.raw_json에 들어 있던 숫자는 다음 수집 때 raw_json이 바뀌면서 video_raw_history 패치로 남음 #####
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS video_stats (
+        video_id TEXT,
+        observed_kst TEXT,
+        view_count INTEGER,
+        like_count INTEGER,
+        comment_count INTEGER,
+        channel_follower_count INTEGER,
+        concurrent_view_count INTEGER,
+        FOREIGN KEY(video_id) REFERENCES videos(id)
+    );
+    """) # video_stats 테이블(영상의 vid / 숫자를 확인한 시간 / 조회수 / 좋아요 수 / 댓글 수 / 채널 구독자 수 / 실시간 시청자 수), 지난번과 숫자가 같으면 행을 추가하지 않음
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_video_stats_video ON video_stats (video_id, observed_kst)")
+
+
+def _migration_10_legacy_comment_index(cur: sqlite3.Cursor) -> None: # 새 댓글이 있는 페이지마다 "이 영상에 ID를 채울 예전 댓글이 남았는지" 확인할 때 영상의 댓글 전체를 훑지 않도록
+    ##### 예전 댓글(ID가 없거나 임시 ID)만 담는 부분 인덱스 --> API ID를 가진 댓글은 들어가지 않으므로 쓰기 비용이 없고, 예전 댓글에 ID를 채울수록 작아짐 #####
+    cur.execute(f"CREATE INDEX IF NOT EXISTS idx_comments_legacy ON comments (video_id) WHERE {_legacy_comment_sql()}")
+
+
+# (단계 번호, 설명, 적용 함수) --> 번호는 1부터 빠짐없이 증가
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Cursor], None]]] = [
+    (1, "기본 테이블과 column", _migration_1_baseline),
+    (2, "보조 인덱스", _migration_2_indexes),
+    (3, "수정 이력 테이블 (video_revisions, comment_revisions)", _migration_3_revision_tables),
+    (4, "설명과 raw_json의 압축된 변경 이력 (video_revisions.delta, video_raw_history)", _migration_4_compact_deltas),
+    (5, "변경 여부 비교용 지문 (videos.fields_hash, video_raw.raw_hash)", _migration_5_content_hashes),
+    (6, "댓글 수 기준 수집 생략 (comment_fetch_state.last_comment_count, comments_disabled)", _migration_6_comment_gate),
+    (7, "실행별 크롬 사용 기한 (browser_leases)", _migration_7_browser_leases),
+    (8, "ID가 없는 예전 댓글의 임시 ID와 수정 이력 (comments.comment_id = legacy:rowid)", _migration_8_legacy_comment_ids),
+    (9, "raw_json에서 뺀 조회수 등의 숫자 기록 (video_stats)", _migration_9_video_stats),
+    (10, "예전 댓글만 담는 부분 인덱스 (idx_comments_legacy)", _migration_10_legacy_comment_index),
+]
+
+
+def run_migrations(db_conn: sqlite3.Connection) -> None: # 아직 적용하지 않은 마이그레이션 단계를 순서대로 적용
+    cur = db_conn.cursor(BusyRetryCursor)
+    latest = MIGRATIONS[-1][0]
+    if cur.execute("PRAGMA user_version").fetchone()[0] >= latest:
+        return # 대부분의 실행은 여기서 끝남 (잠금 없이 한 번만 조회)
+
+    for version, description, apply in MIGRATIONS:
+        db_conn.commit() # 열려 있는 트랜잭션이 있으면 정리한 뒤 BEGIN IMMEDIATE 실행
+        cur.execute("BEGIN IMMEDIATE") # 쓰기 잠금: 다른 프로세스가 같은 단계를 적용 중이면 끝날 때까지 기다림
+        try:
+            # 잠금을 얻은 뒤 다시 확인: 기다리는 동안 다른 프로세스가 이미 적용했을 수 있음
+            if cur.execute("PRAGMA user_version").fetchone()[0] >= version:
+                db_conn.commit()
+                continue
+            apply(cur)
+            cur.execute(f"PRAGMA user_version = {int(version)}") # 같은 트랜잭션 안에서 기록되므로 단계 적용과 함께 확정되거나 함께 취소됨
+            db_conn.commit()
+            print(f"🛠️ DB 마이그레이션 {version}단계 적용: {description}")
+        except Exception:
+            db_conn.rollback()
+            print(f"[Error! DB 마이그레이션 {version}단계 실패: {description}]")
+            raise
+
+
+run_migrations(conn)
+
+##########
+
+##### Selenium 설정 #####
+
+chrome_options = Options()
+chrome_options.add_argument("--headless=new")     # 화면을 띄우지 않고 백그라운드에서 실행
+chrome_options.add_argument("--disable-gpu")      # GPU 가속 끄기
+chrome_options.add_argument("--no-sandbox")       # 리눅스 환경에선 보안 샌드박스 끄기
+chrome_options.add_argument(f"--window-size={WINDOW_SIZE}")
+if LEAN_PAGE_LOAD:
+    chrome_options.add_argument("--blink-settings=imagesEnabled=false")        # 이미지 그리지 않기
+    chrome_options.add_argument("--autoplay-policy=user-gesture-required")     # 미리보기 영상 자동 재생 끄기
+    chrome_options.add_argument("--mute-audio")
+    chrome_options.page_load_strategy = "eager" # 모든 리소스가 아니라 HTML만 준비되면 바로 다음 단계로 (첫 결과는 따로 기다림)
+# 페이지에서 실제로 받은 바이트 수를 재기 위해 네트워크 이벤트만 performance 로그로 기록
+chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+chrome_options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
+driver = None # 크롬은 selenium 방식이 실제로 필요할 때 처음 한 번만 실행
+driver_attached = False # 데몬의 크롬에 연결한 경우 True (종료 시 크롬은 끄지 않고 연결만 해제)
+DAEMON_LEASE_HOLDER = f"{os.getpid()}-{int(time.time())}" # browser_leases에 이 실행의 사용 기한을 기록할 때 쓰는 이름
+_daemon_lease = {"until": 0.0} # 이 실행이 마지막으로 기록한 사용 기한 (epoch 초)
+
+crawl_stats = {"pages": 0, "bytes": 0, "load_sec": 0.0} # 이번 실행에서 검색 결과를 가져오며 연 페이지(요청) 수, 받은 바이트 수, 페이지 로딩 시간 합계
+crawl_stats_lock = threading.Lock() # http 방식은 여러 스레드가 동시에 crawl_stats를 갱신하므로 잠금 사용
+
+# 검색 결과 탭에서 스크롤 1회차마다 한 번씩 실행되는 스크립트 (탭마다 상태를 window.__ytfa에 보관)
+#   1. 직전 스크롤 이후 (첫 회차는 페이지를 연 이후) 영상 개수가 늘어나거나 검색 결과의 끝에 도달하거나 시간이 초과될 때까지 대기
+#      - 신호는 스크롤 직후부터 MutationObserver가 기록하므로, 다른 탭을 처리하는 동안 이미 로딩이 끝났으면 바로 반환
+#   2. 지난번에 처리한 위치 이후의 영상 링크에서만 vid를 뽑음 (중복 제거도 페이지 안에서 처리)
+#      - href가 아직 비어 있는 링크는 건너뛰고 다음 회차부터 다시 확인 (HARVEST_RETRY_ROUNDS회차 동안 계속 비어 있으면 포기)
+#   3. 끝이 아니면 다시 맨 아래로 스크롤하고 다음 신호를 기다리기 시작
+# 검색 결과의 끝: 다음 결과를 불러오는 ytd-continuation-item-renderer(로딩 스피너)가 사라지거나 "결과 없음" 메시지가 뜬 상태
+_SCROLL_ROUND_JS = """
+const timeoutMs = arguments[0];
+const initialTimeoutMs = arguments[1];
+const retryRounds = arguments[2];
+const done = arguments[arguments.length - 1];
+let timer = null;
+let finished = false;
+
+const snapshot = () => {
+    const count = document.querySelectorAll("ytd-video-renderer").length;
+    const message = !!document.querySelector("ytd-section-list-renderer ytd-message-renderer");
+    const more = !!document.querySelector("ytd-continuation-item-renderer");
+    return {count: count, message: message, ended: message || (count > 0 && !more)};
+};
+
+const harvest = () => {
+    const links = document.querySelectorAll("a#video-title");
+    if (st.index > links.length) {
+        st.index = 0;
+        st.pending = new Map();
+    }
+    const ids = [];
+    const take = (href) => {
+        const match = href.match(/\\/watch\\?v=([^&#]+)/);
+        if (match && !st.seen.has(match[1])) {
+            st.seen.add(match[1]);
+            ids.push(match[1]);
+        }
+    };
+    let dropped = 0;
+    // 지난 회차까지 href가 비어 있던 링크를 다시 확인하고, retryRounds회차 동안 계속 비어 있으면 포기
+    for (const [i, tries] of st.pending) {
+        const href = links[i] && links[i].href;
+        if (href) {
+            st.pending.delete(i);
+            take(href);
+        } else if (tries + 1 >= retryRounds) {
+            st.pending.delete(i);
+            dropped++;
+        } else {
+            st.pending.set(i, tries + 1);
+        }
+    }
+    for (; st.index < links.length; st.index++) {
+        const href = links[st.index].href;
+        if (href) take(href);
+        else st.pending.set(st.index, 0); // href가 아직 채워지지 않았으면 건너뛰고 다음 회차에 다시 확인
+    }
+    return {ids: ids, dropped: dropped};
+};
+
+const detect = () => {
+    const s = snapshot();
+    if (st.first) return (s.count > 0 || s.message) ? "loaded" : null;
+    if (s.count > st.prevCount) return "grew";
+    if (s.ended) return "end";
+    return null;
+};
+
+const arm = (at) => {
+    st.armedAt = at;
+    st.signal = null;
+    const observer = new MutationObserver(() => {
+        if (st.signal) return;
+        const reason = detect();
+        if (reason) {
+            st.signal = {reason: reason, at: performance.now()};
+            observer.disconnect();
+            if (st.notify) st.notify();
+        }
+    });
+    observer.observe(document.querySelector("ytd-app") || document.documentElement, {childList: true, subtree: true});
+    st.observer = observer;
+};
+
+const finish = (reason, at) => {
+    if (finished) return;
+    finished = true;
+    clearTimeout(timer);
+    st.notify = null;
+    st.observer.disconnect();
+    const h = harvest();
+    const s = snapshot();
+    const result = {ids: h.ids, dropped: h.dropped, count: s.count, ended: s.ended, reason: reason, waited_ms: at - st.armedAt, first: st.first};
+    st.first = false;
+    st.prevCount = s.count;
+    if (!s.ended) {
+        window.scrollTo(0, document.documentElement.scrollHeight);
+        arm(performance.now());
+    }
+    done(result);
+};
+
+let st = window.__ytfa;
+if (!st) {
+    st = window.__ytfa = {index: 0, pending: new Map(), seen: new Set(), first: true, prevCount: 0, armedAt: 0, signal: null, notify: null, observer: null};
+    arm(0); // 첫 회차는 페이지를 열기 시작한 시점(performance.now() = 0)부터 잼
+}
+
+let reason = st.signal ? st.signal.reason : detect();
+if (reason) {
+    finish(reason, st.signal ? st.signal.at : performance.now());
+} else {
+    const budget = (st.first ? initialTimeoutMs : timeoutMs) - (performance.now() - st.armedAt);
+    st.notify = () => finish(st.signal.reason, st.signal.at);
+    timer = setTimeout(() => finish("timeout", performance.now()), Math.max(0, budget));
+}
+"""
+
+
+def _attach_to_browser_daemon() -> Optional[webdriver.Chrome]: # 데몬이 띄워둔 크롬에 연결하고 이 실행 전용 탭을 엶, 실패하면 None
+    attach_options = Options()
+    attach_options.debugger_address = BROWSER_DAEMON_ADDRESS
+    attach_options.page_load_strategy = chrome_options.page_load_strategy
+    attach_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    attach_options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+    try:
+        drv = webdriver.Chrome(options=attach_options)
+        drv.switch_to.new_window("tab") # 다른 실행과 겹치더라도 서로의 탭을 건드리지 않도록 새 탭 사용
+    except Exception as e:
+        print(f"[Error! 크롬 데몬({BROWSER_DAEMON_ADDRESS}) 연결 실패 --> 크롬 직접 실행]: {e}")
+        return None
+    print(f"🔗 크롬 데몬에 연결: {BROWSER_DAEMON_ADDRESS}")
+    return drv
+
+
+def _update_browser_daemon(sql: str, params: tuple) -> None: # browser_daemon 테이블 갱신 (selenium은 메인 스레드가 아닌 곳에서도 돌 수 있으므로 따로 연결)
+    try:
+        db_write_once(sql, params)
+    except sqlite3.Error as e:
+        print(f"[Error! 크롬 데몬 사용 기록 실패]: {e}")
+
+
+def _renew_daemon_lease() -> None: # 데몬의 크롬 사용 기한이 절반 이하로 남았으면 BROWSER_LEASE_SECONDS 뒤로 연장 (스크롤 회차마다 호출)
+    if not driver_attached:
+        return
+    now = time.time()
+    if _daemon_lease["until"] - now > BROWSER_LEASE_SECONDS / 2:
+        return # 아직 충분히 남았으면 DB에 쓰지 않음
+    until = now + BROWSER_LEASE_SECONDS
+    _update_browser_daemon(
+        "INSERT INTO browser_leases (address, holder, lease_until) VALUES (?, ?, ?) "
+        "ON CONFLICT(address, holder) DO UPDATE SET lease_until = excluded.lease_until",
+        (BROWSER_DAEMON_ADDRESS, DAEMON_LEASE_HOLDER, until),
+    )
+    _daemon_lease["until"] = until
+
+
+def _record_daemon_page_load() -> None: # 데몬의 크롬으로 페이지를 열 때마다 사용 기록과 사용 기한 갱신
+    if not driver_attached:
+        return
+    _update_browser_daemon("UPDATE browser_daemon SET pages_loaded = pages_loaded + 1 WHERE address = ?", (BROWSER_DAEMON_ADDRESS,))
+    _renew_daemon_lease()
+
+
+def _apply_lean_page_profile(drv: webdriver.Chrome) -> None: # 현재 탭에서 BLOCKED_URL_PATTERNS에 해당하는 요청을 차단
+    try:
+        drv.execute_cdp_cmd("Network.enable", {})
+        drv.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    except Exception as e:
+        print(f"[Error! 요청 차단 설정 실패]: {e}")
+
+
+def _drain_transferred_bytes(drv: webdriver.Chrome) -> int: # 지난 호출 이후 performance 로그에 쌓인 네트워크 응답의 실제 전송 바이트 합계
+    total = 0
+    try:
+        entries = drv.get_log("performance")
+    except Exception:
+        return 0
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError):
+            continue
+        if message.get("method") == "Network.loadingFinished":
+            total += int(message.get("params", {}).get("encodedDataLength") or 0)
+    return total
+
+
+def get_driver() -> webdriver.Chrome: # 실행 중인 크롬이 없으면 데몬의 크롬에 연결하거나 위 설정대로 크롬 실행
+    global driver, driver_attached
+    if driver is None:
+        if BROWSER_DAEMON_ADDRESS:
+            driver = _attach_to_browser_daemon()
+            driver_attached = driver is not None
+        if driver is None:
+            driver = webdriver.Chrome(options=chrome_options)
+        if LEAN_PAGE_LOAD:
+            _apply_lean_page_profile(driver)
+    return driver
+
+
+def release_driver() -> None: # 직접 실행한 크롬은 종료하고, 데몬의 크롬은 이 실행의 탭만 닫고 연결 해제
+    global driver, driver_attached
+    if driver is None:
+        return
+    try:
+        if driver_attached:
+            driver.close() # 이 실행이 연 탭만 닫음
+            # 이 실행의 사용 기한만 지움 (동시에 도는 다른 실행의 기한은 그대로 둠)
+            _update_browser_daemon("DELETE FROM browser_leases WHERE address = ? AND holder = ?", (BROWSER_DAEMON_ADDRESS, DAEMON_LEASE_HOLDER))
+            _daemon_lease["until"] = 0.0
+            driver.service.stop() # 크롬은 데몬의 것이므로 chromedriver만 종료
+        else:
+            driver.quit()
+    except Exception as e:
+        print(f"[Error! 크롬 정리 실패]: {e}")
+    driver = None
+    driver_attached = False
+
+##### yt-dlp 설정 #####
+
+# 다운로드는 하지 않고 JSON 정보만 가져옴
+ydl_opts = {
+    "quiet": True,
+    "skip_download": True,
+    "forcejson": True,
+    "extract_flat": False,
+}
+if YTDLP_METADATA_ONLY:
+    # 영상 파일 주소를 만들 때만 필요한 DASH/HLS 매니페스트, 번역 자막 목록, 플레이어 JS를 받지 않음
+    ydl_opts["extractor_args"] = {"youtube": {"skip": ["dash", "hls", "translated_subs"], "player_skip": ["js"]}}
+
+# 한 번 만든 YoutubeDL 객체를 실행이 끝날 때까지 재사용 (YoutubeDL은 여러 스레드가 함께 쓰면 안전하지 않으므로 스레드마다 하나씩)
+_ydl_local = threading.local()
+_ydl_instances: List[yt_dlp.YoutubeDL] = [] # 종료할 때 한꺼번에 정리하기 위해 만든 객체를 모두 보관
+_ydl_lock = threading.Lock()
+
+metadata_stats = {"videos": 0, "extract_sec": 0.0} # 이번 실행에서 yt-dlp로 메타데이터를 추출한 영상 수와 추출 시간 합계 (스레드별 시간의 합)
+comment_count_hints: Dict[str, int] = {} # 메타데이터에 표시된 영상별 댓글 수 (할당량이 부족할 때 댓글 수집 순서를 정하는 데 사용)
+
+
+def get_ydl() -> yt_dlp.YoutubeDL: # 현재 스레드의 YoutubeDL 객체가 아직 없으면 만들고, 있으면 그대로 반환
+    extractor = getattr(_ydl_local, "ydl", None)
+    if extractor is None:
+        extractor = yt_dlp.YoutubeDL(ydl_opts)
+        _ydl_local.ydl = extractor
+        with _ydl_lock:
+            _ydl_instances.append(extractor)
+    return extractor
+
+
+def extract_video_info(video_url: str) -> dict: # yt-dlp로 영상 정보 추출 (YTDLP_METADATA_ONLY면 포맷 선택/정리 단계를 건너뜀)
+    extractor = get_ydl()
+    if not YTDLP_METADATA_ONLY:
+        return extractor.extract_info(video_url, download=False)
+    info = extractor.extract_info(video_url, download=False, process=False)
+    return extractor.sanitize_info(info) # 처리 단계를 건너뛰면 JSON으로 바꿀 수 없는 값이 남을 수 있어 정리
+
+
+def release_ydl() -> None: # 재사용하던 YoutubeDL 객체 모두 정리
+    with _ydl_lock:
+        instances = list(_ydl_instances)
+        _ydl_instances.clear()
+    for extractor in instances:
+        try:
+            extractor.close()
+        except Exception as e:
+            print(f"[Error! yt-dlp 정리 실패]: {e}")
+
+##### HTTP 설정 #####
+
+# commentThreads 응답에서 iter_comment_pages가 실제로 읽는 값만 받기 위한 partial response 마스크
+COMMENT_THREADS_FIELDS = (
+    "nextPageToken,"
+    "items(id,"
+    "snippet(topLevelComment(id,snippet(textDisplay,textOriginal,authorDisplayName,authorChannelId,publishedAt))),"
+    "replies(comments(id,snippet(textDisplay,textOriginal,authorDisplayName,authorChannelId,publishedAt))))"
+)
+
+_api_session: Optional[requests.Session] = None
+_api_session_lock = threading.Lock()
+
+api_stats: Dict[str, dict] = {} # API 종류별 호출 수, 사용한 unit 수, 실제로 받은 바이트 수(압축된 크기), 응답 시간 합계
+api_stats_lock = threading.Lock()
+
+_quota_state = {"date": "", "units": 0} # DB에서 예약해 두고 아직 쓰지 않은 unit 수
+_quota_lock = threading.Lock()
+
+_rate_state = {"tokens": API_MAX_RPS, "updated": time.monotonic()} # 초당 호출 수 제한용 토큰 버킷
+_rate_lock = threading.Lock()
+
+
+class QuotaExhaustedError(Exception): # 하루 할당량을 모두 써서 API를 호출하지 않음
+    pass
+
+
+def new_http_session(headers: Optional[dict] = None) -> requests.Session: # 연결 재사용, gzip, 재시도가 설정된 Session 생성
+    session = requests.Session()
+    retry = Retry(
+        total=HTTP_RETRIES,
+        backoff_factor=HTTP_BACKOFF,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(["GET", "POST"]),
+        raise_on_status=False, # 재시도 후에도 실패하면 예외 대신 마지막 응답을 그대로 반환
+    )
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"})
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+def get_api_session() -> requests.Session: # 모든 YouTube Data API v3 호출이 함께 쓰는 Session (requests.Session은 여러 스레드에서 함께 써도 연결 풀은 안전)
+    global _api_session
+    with _api_session_lock:
+        if _api_session is None:
+            _api_session = new_http_session()
+        return _api_session
+
+
+def _quota_date() -> str: # 할당량이 초기화되는 기준(태평양 시간)의 오늘 날짜
+    return datetime.datetime.now(PACIFIC).strftime("%Y-%m-%d")
+
+
+def _update_api_quota(quota_date: str, units: int) -> int: # api_quota 테이블에서 units만큼 예약(음수면 반환)하고 실제로 예약한 unit 수를 반환
+    # 여러 프로세스가 동시에 예약해도 한도를 넘지 않도록 첫 쓰기(BEGIN IMMEDIATE)에서 잠금을 잡고 읽기와 쓰기를 한 트랜잭션에서 처리
+    limit = API_DAILY_QUOTA - API_QUOTA_RESERVE
+    quota_conn = connect_db()
+    quota_cursor = quota_conn.cursor(BusyRetryCursor)
+    try:
+        quota_cursor.execute("INSERT OR IGNORE INTO api_quota (quota_date, used_units) VALUES (?, 0)", (quota_date,))
+        used = quota_cursor.execute("SELECT used_units FROM api_quota WHERE quota_date = ?", (quota_date,)).fetchone()[0] or 0
+        granted = min(units, max(limit - used, 0)) if units > 0 else max(units, -used)
+        quota_cursor.execute("UPDATE api_quota SET used_units = ? WHERE quota_date = ?", (used + granted, quota_date))
+        quota_conn.commit()
+        return granted
+    except sqlite3.Error as e:
+        print(f"[Error! API 할당량 기록 실패]: {e}")
+        quota_conn.rollback()
+        return 0
+    finally:
+        quota_conn.close()
+
+
+def reserve_api_quota(endpoint: str) -> None: # API 호출 1번의 비용만큼 할당량 사용 (남은 할당량이 없으면 QuotaExhaustedError)
+    cost = API_QUOTA_COSTS.get(endpoint, 1)
+    with _quota_lock:
+        today = _quota_date()
+        if _quota_state["date"] != today: # 날짜가 바뀌면 어제 예약해 둔 unit은 의미가 없음
+            _quota_state["date"] = today
+            _quota_state["units"] = 0
+        if _quota_state["units"] < cost:
+            _quota_state["units"] += _update_api_quota(today, max(API_QUOTA_BLOCK, cost - _quota_state["units"]))
+        if _quota_state["units"] < cost:
+            raise QuotaExhaustedError(f"오늘({today}, 태평양 시간) API 할당량 소진")
+        _quota_state["units"] -= cost
+
+
+def release_api_quota() -> None: # 예약해 두고 쓰지 않은 unit을 DB에 돌려줌 (다음 실행이 사용할 수 있도록)
+    with _quota_lock:
+        if _quota_state["units"] > 0 and _quota_state["date"] == _quota_date():
+            _update_api_quota(_quota_state["date"], -_quota_state["units"])
+        _quota_state["units"] = 0
+
+
+def _mark_api_quota_exhausted() -> None: # API가 quotaExceeded로 응답하면 오늘 할당량을 모두 쓴 것으로 기록
+    with _quota_lock:
+        _quota_state["units"] = 0
+    try:
+        db_write_once(
+            "INSERT INTO api_quota (quota_date, used_units) VALUES (?, ?) ON CONFLICT(quota_date) DO UPDATE SET used_units = excluded.used_units",
+            (_quota_date(), API_DAILY_QUOTA),
+        )
+    except sqlite3.Error as e:
+        print(f"[Error! API 할당량 기록 실패]: {e}")
+
+
+def get_remaining_api_quota() -> int: # 오늘 더 쓸 수 있는 unit 수 (이 프로세스가 예약해 둔 unit 포함)
+    today = _quota_date()
+    cursor.execute("SELECT used_units FROM api_quota WHERE quota_date = ?", (today,))
+    row = cursor.fetchone()
+    used = (row[0] or 0) if row else 0
+    with _quota_lock:
+        local_units = _quota_state["units"] if _quota_state["date"] == today else 0
+    return max(API_DAILY_QUOTA - API_QUOTA_RESERVE - used, 0) + local_units
+
+
+def _acquire_rate_token() -> None: # 토큰 버킷: 초당 API_MAX_RPS번을 넘지 않도록 필요하면 잠시 대기
+    if API_MAX_RPS <= 0:
+        return
+    while True:
+        with _rate_lock:
+            now = time.monotonic()
+            tokens = min(API_MAX_RPS, _rate_state["tokens"] + (now - _rate_state["updated"]) * API_MAX_RPS)
+            _rate_state["updated"] = now
+            if tokens >= 1:
+                _rate_state["tokens"] = tokens - 1
+                return
+            _rate_state["tokens"] = tokens
+            delay = (1 - tokens) / API_MAX_RPS
+        time.sleep(delay)
+
+
+def api_get(endpoint: str, params: dict, fields: Optional[str] = None) -> requests.Response: # YouTube Data API v3 호출 (Ex: endpoint="commentThreads") 후 호출 통계 기록
+    params = dict(params, key=YOUTUBE_API_KEY)
+    if fields and API_PARTIAL_RESPONSE:
+        params["fields"] = fields
+
+    reserve_api_quota(endpoint)
+    _acquire_rate_token()
+
+    started = time.perf_counter()
+    resp = get_api_session().get(f"https://www.googleapis.com/youtube/v3/{endpoint}", params=params, timeout=HTTP_TIMEOUT)
+    elapsed = time.perf_counter() - started
+
+    if resp.status_code == 403 and "quotaExceeded" in resp.text:
+        _mark_api_quota_exhausted()
+
+    # resp.raw.tell()은 압축이 풀리기 전에 실제로 받은 본문 바이트 수
+    try:
+        wire_bytes = int(resp.raw.tell()) or len(resp.content)
+    except Exception:
+        wire_bytes = len(resp.content)
+
+    with api_stats_lock:
+        stats = api_stats.setdefault(endpoint, {"calls": 0, "units": 0, "bytes": 0, "sec": 0.0})
+        stats["calls"] += 1
+        stats["units"] += API_QUOTA_COSTS.get(endpoint, 1)
+        stats["bytes"] += wire_bytes
+        stats["sec"] += elapsed
+    return resp
+
+
+def print_api_stats() -> None: # 이번 실행의 API 종류별 호출 통계와 오늘 남은 할당량 출력
+    for endpoint, stats in sorted(api_stats.items()):
+        calls = stats["calls"] or 1
+        print(f"📶 {endpoint}: 호출 {stats['calls']}회 ({stats['units']} unit) / 받은 데이터 {stats['bytes'] / 1024:.0f}KB (호출당 {stats['bytes'] / calls / 1024:.1f}KB) / 호출당 평균 {stats['sec'] / calls * 1000:.0f}ms")
+    if api_stats:
+        print(f"📶 오늘 남은 API 할당량: {get_remaining_api_quota()} / {API_DAILY_QUOTA} unit (여유분 {API_QUOTA_RESERVE} unit 제외)")
+
+##### 유틸 함수 #####
+
+def build_search_url(query: str, sp: str) -> str: # 검색어와 필터를 합쳐 유튜브 검색 URL 생성
+    return f"https://www.youtube.com/results?search_query={query}&sp={sp}"
+
+
+def get_publish_time_kst(info: dict) -> str: # yt-dlp를 통해 얻은 JSON 원본 텍스트에서 업로드 시간을 찾아 KST로 변환
+    dt = None
+
+    # 먼저 정확한 초 단위 타임스탬프가 있는지 확인
+    ts = info.get("timestamp") or info.get("release_timestamp")
+    if ts:
+        try: # UTC 시간 객체로 변환
+            dt = datetime.datetime.fromtimestamp(int(ts), tz=datetime.timezone.utc)
+        except Exception:
+            dt = None
+
+    # 타임스탬프가 없으면 날짜 문자열 확인
+    if dt is None:
+        upload_date = info.get("upload_date")
+        if upload_date:
+            try:
+                dt = datetime.datetime.strptime(upload_date, "%Y%m%d")
+                dt = dt.replace(tzinfo=datetime.timezone.utc)
+            except Exception:
+                dt = None
+
+    if dt is None:
+        return "" # 둘 다 없으면 빈 문자열 반환
+
+    # 찾은 시간을 KST로 변환해 문자열로 반환
+    return dt.astimezone(KST).strftime("%Y-%m-%dT%H:%M:%S%z")
+
+
+def classify_video_type(info: dict) -> str: # 영상의 종류를 분류
+    live_status = info.get("live_status")
+    if info.get("is_live") or live_status == "is_live": # 라이브 방송 여부
+        return "live"
+    if live_status in ("is_upcoming", "upcoming"): # 라이브 방송 예정 여부
+        return "upcoming_live"
+    if info.get("was_live") or live_status in ("was_live", "post_live"): # 라이브 방송 종료 여부
+        return "live_archive"
+
+    # 영상의 길이가 1분 미만이면 쇼츠로 분류
+    duration = int(info.get("duration") or 0)
+    if duration < 60:
+        return "short"
+
+    # 나머지는 일반 영상으로 분류
+    return "vod"
+
+
+def parse_iso8601_duration(duration: str) -> int: # YouTube Data API v3의 contentDetails.duration(ISO8601, Ex: PT1H2M3S, P1DT2H)을 초 단위로 변환
+    match = re.fullmatch(r"P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+(?:\.\d+)?)S)?)?", duration or "")
+    if not match:
+        return 0
+    weeks, days, hours, minutes, seconds = match.groups()
+    return (
+        int(weeks or 0) * 604800
+        + int(days or 0) * 86400
+        + int(hours or 0) * 3600
+        + int(minutes or 0) * 60
+        + int(float(seconds or 0))
+    )
+
+
+def _iso8601_to_timestamp(dt_str: str) -> Optional[int]: # ISO8601(UTC) 문자열을 epoch 초로 변환, 없거나 잘못된 값이면 None
+    if not dt_str:
+        return None
+    try:
+        return int(datetime.datetime.fromisoformat(dt_str.replace("Z", "+00:00")).timestamp())
+    except ValueError:
+        return None
+
+
+# videos.list의 snippet.categoryId --> yt-dlp의 categories에 들어가는 이름
+YOUTUBE_CATEGORY_NAMES = {
+    "1": "Film & Animation", "2": "Autos & Vehicles", "10": "Music", "15": "Pets & Animals", "17": "Sports",
+    "19": "Travel & Events", "20": "Gaming", "22": "People & Blogs", "23": "Comedy", "24": "Entertainment",
+    "25": "News & Politics", "26": "Howto & Style", "27": "Education", "28": "Science & Technology", "29": "Nonprofits & Activism",
+}
+
+
+def _api_item_to_info(item: dict) -> dict: # videos.list의 항목 하나를 yt-dlp의 info dict와 같은 key, 같은 형식의 값으로 변환 (classify_video_type, get_publish_time_kst, video_raw를 그대로 사용하기 위해)
+    snippet = item.get("snippet") or {}
+    details = item.get("contentDetails") or {}
+    live = item.get("liveStreamingDetails") or {}
+    stats = item.get("statistics") or {}
+
+    # yt-dlp의 live_status와 같은 값으로 변환
+    broadcast = snippet.get("liveBroadcastContent")
+    if broadcast == "live":
+        live_status = "is_live"
+    elif broadcast == "upcoming":
+        live_status = "is_upcoming"
+    elif live.get("actualStartTime"):
+        live_status = "was_live"
+    else:
+        live_status = "not_live"
+
+    timestamp = _iso8601_to_timestamp(snippet.get("publishedAt", ""))
+    upload_date = ""
+    if timestamp is not None:
+        upload_date = datetime.datetime.fromtimestamp(timestamp, tz=datetime.timezone.utc).strftime("%Y%m%d")
+
+    def to_int(value) -> Optional[int]:
+        return int(value) if value not in (None, "") else None
+
+    channel_id = snippet.get("channelId", "")
+    category = YOUTUBE_CATEGORY_NAMES.get(snippet.get("categoryId", ""))
+    return {
+        "id": item.get("id"),
+        "title": snippet.get("title", ""),
+        "fulltitle": snippet.get("title", ""),
+        "channel": snippet.get("channelTitle", ""),
+        "channel_id": channel_id,
+        "channel_url": f"https://www.youtube.com/channel/{channel_id}" if channel_id else None,
+        "uploader": snippet.get("channelTitle", ""),
+        "description": snippet.get("description", ""),
+        "duration": parse_iso8601_duration(details.get("duration", "")),
+        "live_status": live_status,
+        "is_live": live_status == "is_live",
+        "was_live": live_status == "was_live",
+        "timestamp": timestamp,
+        "release_timestamp": _iso8601_to_timestamp(live.get("actualStartTime") or live.get("scheduledStartTime") or ""),
+        "upload_date": upload_date,
+        "view_count": to_int(stats.get("viewCount")),
+        "like_count": to_int(stats.get("likeCount")),
+        "comment_count": to_int(stats.get("commentCount")),
+        "age_limit": 18 if (details.get("contentRating") or {}).get("ytRating") == "ytAgeRestricted" else 0,
+        "categories": [category] if category else None,
+        "tags": snippet.get("tags") or [],
+        "webpage_url": f"https://www.youtube.com/watch?v={item.get('id')}",
+        "api_item": item, # videos.list가 돌려준 원본
+    }
+
+
+def project_raw_info(info: dict, first_sighting: bool = False, previous: Optional[dict] = None) -> dict: # info dict에서 video_raw에 저장할 값만 골라냄 (yt-dlp, api 어느 방식이든 같은 key)
+    # previous: 지난번에 저장한 raw_json (api 방식이면 RAW_JSON_YTDLP_ONLY_FIELDS의 값을 여기서 가져옴)
+    if RAW_JSON_FIELDS is None or (first_sighting and RAW_JSON_FULL_ON_FIRST_SIGHT):
+        return {key: value for key, value in info.items() if key not in RAW_JSON_COUNTER_FIELDS}
+    projected = {key: info.get(key) for key in RAW_JSON_FIELDS} # 없는 key도 null로 --> 방식이 바뀌어도 key 목록은 그대로
+
+    # yt-dlp가 처리 단계(YTDLP_METADATA_ONLY면 생략)에서 채우는 값은 어느 방식이든 같은 규칙으로 채움
+    live_status = info.get("live_status")
+    derived = {
+        "fulltitle": info.get("title"),
+        "is_live": live_status == "is_live" if live_status else None,
+        "was_live": live_status in ("was_live", "post_live") if live_status else None,
+    }
+    for key, value in derived.items():
+        if key in projected and projected[key] is None:
+            projected[key] = value
+
+    if "api_item" in info:
+        for key in RAW_JSON_YTDLP_ONLY_FIELDS:
+            if key in projected:
+                projected[key] = (previous or {}).get(key)
+    return projected
+
+
+def serialize_raw_info(info: dict, first_sighting: bool = False, previous: Optional[dict] = None) -> str: # video_raw.raw_json에 저장할 JSON 문자열 생성 후 시간과 크기 기록
+    started = time.perf_counter()
+    raw_json_str = json.dumps(project_raw_info(info, first_sighting, previous), ensure_ascii=False)
+    raw_stats["videos"] += 1
+    raw_stats["sec"] += time.perf_counter() - started
+    raw_stats["bytes"] += len(raw_json_str.encode("utf-8"))
+    return raw_json_str
+
+
+def iso8601_to_kst(dt_str: str) -> str: # YouTube Data API v3의 publishedAt이 반환해주는 시간(ISO8601, UTC)을 파싱해 KST 문자열로 변환
+    if not dt_str:
+        return ""
+    try:
+        # Z(UTC)를 +00:00으로 바꿔 fromisoformat 사용
+        dt = datetime.datetime.fromisoformat(dt_str.replace("Z", "+00:00"))
+        return dt.astimezone(KST).strftime("%Y-%m-%dT%H:%M:%S%z")
+    except Exception:
+        return ""
+
+
+##### 압축된 변경 이력 #####
+
+##### 최신 값은 원래 테이블(videos.description, video_raw.raw_json)에 그대로 두고, #####
+##### 이력에는 "새 값 --> 예전 값"으로 되돌리는 차이만 zlib으로 압축해 저장 (최신 값부터 거꾸로 적용하면 어떤 버전이든 다시 만들 수 있음) #####
+
+DELTA_FIELDS = {"description"} # video_revisions에 전체 값 대신 차이만 저장할 column
+
+delta_stats = {"raw_versions": 0, "raw_full_bytes": 0, "raw_patch_bytes": 0, "text_full_bytes": 0, "text_delta_bytes": 0} # 이번 실행에서 저장한 이력의 크기 (전체 값으로 저장했을 때와 비교)
+
+
+def _compress_json(obj) -> bytes: # JSON으로 바꾼 뒤 zlib으로 압축
+    return zlib.compress(json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+def _decompress_json(blob: bytes): # _compress_json의 반대
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+
+def _text_delta_ops(new_text: str, old_text: str) -> list: # new_text에서 old_text를 다시 만드는 단어 단위 차이 (압축 전)
+    # 차이 형식: [[i, j], "문자열", ...] --> [i, j]는 new_text의 i~j번째 단어를 그대로 사용, 문자열은 그대로 이어 붙임
+    new_tokens = re.findall(r"\S+|\s+", new_text or "")
+    old_tokens = re.findall(r"\S+|\s+", old_text or "")
+    ops: list = []
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, new_tokens, old_tokens, autojunk=False).get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j2 > j1:
+            ops.append("".join(old_tokens[j1:j2]))
+    return ops
+
+
+def _apply_text_delta_ops(new_text: str, ops: list) -> str: # _text_delta_ops로 만든 차이를 적용해 예전 텍스트를 다시 만듦
+    new_tokens = re.findall(r"\S+|\s+", new_text or "")
+    return "".join("".join(new_tokens[op[0]:op[1]]) if isinstance(op, list) else op for op in ops)
+
+
+def make_text_delta(new_text: str, old_text: str) -> bytes: # new_text에서 old_text를 다시 만드는 단어 단위 차이 (압축)
+    return _compress_json(_text_delta_ops(new_text, old_text))
+
+
+def apply_text_delta(new_text: str, delta: bytes) -> str: # make_text_delta로 만든 차이를 적용해 예전 텍스트를 다시 만듦
+    return _apply_text_delta_ops(new_text, _decompress_json(delta))
+
+
+def make_json_patch(new_doc, old_doc): # new_doc을 old_doc으로 되돌리는 패치 (바뀐 부분만)
+    # 패치 형식: {"v": 값} --> 통째로 값으로 교체 / {"s": {키: 값}, "d": [키], "p": {키: 하위 패치}, "t": {키: 단어 단위 차이}} --> 키 설정, 키 삭제, 하위 객체에 패치 적용, 문자열에 차이 적용
+    if not (isinstance(new_doc, dict) and isinstance(old_doc, dict)):
+        return {"v": old_doc}
+    patch: dict = {}
+    removed = [key for key in new_doc if key not in old_doc]
+    if removed:
+        patch["d"] = removed
+    for key, old_value in old_doc.items():
+        if key not in new_doc:
+            patch.setdefault("s", {})[key] = old_value
+        elif new_doc[key] != old_value:
+            if isinstance(new_doc[key], dict) and isinstance(old_value, dict):
+                patch.setdefault("p", {})[key] = make_json_patch(new_doc[key], old_value)
+                continue
+            # 설명처럼 긴 문자열은 예전 값 전체 대신 단어 단위 차이 (차이가 더 짧을 때만)
+            if isinstance(new_doc[key], str) and isinstance(old_value, str):
+                ops = _text_delta_ops(new_doc[key], old_value)
+                if len(json.dumps(ops, ensure_ascii=False)) < len(json.dumps(old_value, ensure_ascii=False)):
+                    patch.setdefault("t", {})[key] = ops
+                    continue
+            patch.setdefault("s", {})[key] = old_value
+    return patch
+
+
+def apply_json_patch(doc, patch: dict): # make_json_patch로 만든 패치를 적용 (doc은 바꾸지 않고 새 객체를 반환)
+    if "v" in patch:
+        return patch["v"]
+    result = dict(doc)
+    for key in patch.get("d", []):
+        result.pop(key, None)
+    result.update(patch.get("s", {}))
+    for key, sub_patch in patch.get("p", {}).items():
+        result[key] = apply_json_patch(result.get(key, {}), sub_patch)
+    for key, ops in patch.get("t", {}).items():
+        result[key] = _apply_text_delta_ops(result.get(key, ""), ops)
+    return result
+
+
+def content_hash(text: str) -> str: # 변경 여부를 빠르게 비교하기 위한 지문 (blake2b 128bit)
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _update_video_raw_revised_count(video_id: str, raw_json_str: str, changed: bool) -> None: # video_raw 테이블의 raw_json과 revised_count 갱신을 다음 커밋 묶음에 추가
+    # 지난번 raw_json과 지문(raw_hash)이 같고 videos에도 변경이 없으면 아무것도 쓰지 않음
+    raw_hash = content_hash(raw_json_str)
+    cursor.execute("SELECT raw_hash FROM video_raw WHERE id = ?", (video_id,))
+    row = cursor.fetchone()
+    stored_hash = row[0] if row else None
+    if stored_hash == raw_hash and not changed:
+        skip_stats["raw_skipped"] += 1
+        return
+
+    # raw_json이 바뀌었으면(지문이 없던 예전 행 포함) 예전 raw_json을 통째로 남기는 대신, 새 raw_json에서 예전 것을 다시 만드는 JSON 패치만 video_raw_history에 추가
+    row = None
+    if stored_hash != raw_hash:
+        cursor.execute("SELECT raw_json FROM video_raw WHERE id = ?", (video_id,))
+        row = cursor.fetchone()
+    if row and row[0] and row[0] != raw_json_str:
+        try:
+            old_doc = json.loads(row[0])
+        except ValueError:
+            old_doc = row[0] # JSON이 아닌 값이 저장되어 있었다면 그대로 보관
+        patch = _compress_json(make_json_patch(json.loads(raw_json_str), old_doc))
+        # 버전 번호는 커밋 묶음을 실행할 때 INSERT 안에서 정함 (모아 두는 사이에 겹쳐 도는 다른 실행이 먼저 버전을 추가할 수 있음)
+        queue_video_write(
+            "INSERT INTO video_raw_history (video_id, version, observed_kst, patch) "
+            "SELECT ?, COALESCE(MAX(version) + 1, 0), ?, ? FROM video_raw_history WHERE video_id = ?",
+            (video_id, datetime.datetime.now(KST).strftime("%Y-%m-%dT%H:%M:%S%z"), patch, video_id),
+        )
+        delta_stats["raw_versions"] += 1
+        delta_stats["raw_full_bytes"] += len(row[0].encode("utf-8"))
+        delta_stats["raw_patch_bytes"] += len(patch)
+
+    # 처음 보는 영상이면 INSERT, 이미 있으면 raw_json을 바꾸고 변경이 있었을 때만 revised_count + 1 (조회 없이 한 문장으로)
+    queue_video_write(
+        "INSERT INTO video_raw (id, raw_json, revised_count, raw_hash) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT(id) DO UPDATE SET raw_json = excluded.raw_json, revised_count = COALESCE(video_raw.revised_count, 0) + excluded.revised_count, raw_hash = excluded.raw_hash",
+        (video_id, raw_json_str, 1 if changed else 0, raw_hash),
+    )
+    skip_stats["raw_written"] += 1
+
+
+def _record_video_stats(video_id: str, info: dict) -> None: # 조회수 같은 숫자(RAW_JSON_COUNTER_FIELDS)가 지난번과 다르면 video_stats에 한 행 추가를 다음 커밋 묶음에 추가
+    counters = tuple(info.get(key) for key in RAW_JSON_COUNTER_FIELDS)
+    if all(value is None for value in counters):
+        return
+    columns = ", ".join(RAW_JSON_COUNTER_FIELDS)
+    cursor.execute(f"SELECT {columns} FROM video_stats WHERE video_id = ? ORDER BY observed_kst DESC LIMIT 1", (video_id,))
+    row = cursor.fetchone()
+    if row is not None and tuple(row) == counters:
+        skip_stats["stats_skipped"] += 1
+        return
+    queue_video_write(
+        f"INSERT INTO video_stats (video_id, observed_kst, {columns}) VALUES (?, ?, {', '.join('?' for _ in counters)})",
+        (video_id, datetime.datetime.now(KST).strftime("%Y-%m-%dT%H:%M:%S%z"), *counters),
+    )
+    skip_stats["stats_written"] += 1
+
+
+##### 영상 메타데이터 쓰기 묶음 #####
+
+##### videos, video_raw에 쓸 문장은 바로 실행하지 않고 모아 두었다가 flush_video_writes에서 한 트랜잭션으로 실행 #####
+##### 모으는 동안에는 DB 잠금을 잡지 않으므로 다른 프로세스나 이 프로세스의 다른 연결(API 할당량 기록)이 막히지 않음 #####
+
+_current_video_writes: List[Tuple[str, tuple]] = [] # 지금 모으고 있는 영상 하나의 (sql, params)
+_pending_video_writes: List[Tuple[str, List[Tuple[str, tuple]]]] = [] # 아직 실행하지 않은 영상별 (vid, 그 영상의 (sql, params) 목록)
+_pending_video_state = {"videos": 0, "since": 0.0} # 모아 둔 영상 수 / 첫 영상을 모은 시점
+
+skip_stats = {"videos_skipped": 0, "videos_written": 0, "raw_skipped": 0, "raw_written": 0, "stats_skipped": 0, "stats_written": 0} # 이번 실행에서 지문(숫자)이 같아 건너뛴 행 수 / 실제로 쓴 행 수 (videos, video_raw, video_stats)
+raw_stats = {"videos": 0, "sec": 0.0, "bytes": 0} # 이번 실행에서 raw_json으로 바꾼 영상 수 / JSON 변환 시간 합계 / 저장할 raw_json 크기 합계
+write_stats = {"videos": 0, "statements": 0, "commits": 0, "sec": 0.0, "failed": 0} # 이번 실행에서 커밋한 영상 수 / 실행한 문장 수 / 커밋 횟수 / 쓰기에 걸린 시간 합계 / 저장에 실패해 버린 영상 수
+
+
+def queue_video_write(sql: str, params: tuple) -> None: # 지금 저장 중인 영상의 문장 추가
+    _current_video_writes.append((sql, params))
+
+
+def finish_video_write(video_id: str) -> None: # 영상 하나의 문장을 모두 모았음을 알리고 다음 커밋 묶음에 추가, 커밋할 때가 되었으면 커밋
+    if not _current_video_writes: # 모든 값이 지난번과 같아 쓸 것이 없음
+        return
+    _pending_video_writes.append((video_id, list(_current_video_writes)))
+    _current_video_writes.clear()
+    if _pending_video_state["videos"] == 0:
+        _pending_video_state["since"] = time.monotonic()
+    _pending_video_state["videos"] += 1
+    flush_video_writes(force=False)
+
+
+def _execute_video_writes(batch: List[Tuple[str, List[Tuple[str, tuple]]]]) -> int: # 영상별 문장들을 실행 (커밋은 호출한 쪽에서), 실행한 문장 수 반환
+    count = 0
+    for _, statements in batch:
+        for sql, params in statements:
+            cursor.execute(sql, params)
+            count += 1
+    return count
+
+
+def flush_video_writes(force: bool = True) -> None: # 모아 둔 문장을 한 트랜잭션으로 실행 후 커밋 (force=False면 DB_DURABILITY 기준을 채웠을 때만)
+    if not _pending_video_writes:
+        return
+    if not force and DB_DURABILITY != "every":
+        due = (
+            _pending_video_state["videos"] >= COMMIT_BATCH_VIDEOS
+            or time.monotonic() - _pending_video_state["since"] >= COMMIT_BATCH_SECONDS
+        )
+        if not due:
+            return
+
+    # 묶음은 먼저 꺼내 둠: 실패한 문장이 다음 묶음에서 다시 실행되어 뒤의 영상까지 계속 실패하지 않도록
+    batch = list(_pending_video_writes)
+    _pending_video_writes.clear()
+    _pending_video_state["videos"] = 0
+
+    started = time.perf_counter()
+    try:
+        statements = _execute_video_writes(batch)
+        conn.commit()
+        write_stats["videos"] += len(batch)
+        write_stats["statements"] += statements
+        write_stats["commits"] += 1
+    except sqlite3.Error as e:
+        # 묶음 안의 어떤 영상 때문에 실패했는지 모르므로 영상마다 따로 커밋하고, 실패한 영상만 버림
+        conn.rollback()
+        print(f"[Error! 메타데이터 묶음 저장 실패 --> 영상 {len(batch)}개를 하나씩 저장]: {e}")
+        for item in batch:
+            try:
+                statements = _execute_video_writes([item])
+                conn.commit()
+            except sqlite3.Error as item_error:
+                conn.rollback()
+                write_stats["failed"] += 1
+                print(f"[Error! 메타데이터 저장 실패] {item[0]}: {item_error}")
+                continue
+            write_stats["videos"] += 1
+            write_stats["statements"] += statements
+            write_stats["commits"] += 1
+    except BaseException:
+        # DB 오류가 아니면(Ex: Ctrl+C) 묶음을 되돌려 두어 종료할 때 다시 저장할 수 있도록 함
+        conn.rollback()
+        _pending_video_writes[:0] = batch
+        _pending_video_state["videos"] += len(batch)
+        raise
+    finally:
+        write_stats["sec"] += time.perf_counter() - started
+
+
+def print_write_stats() -> None: # 이번 실행의 메타데이터 쓰기 통계 출력
+    if skip_stats["videos_skipped"] + skip_stats["videos_written"]:
+        print(f"🗄️ 변경 없음으로 건너뜀: videos {skip_stats['videos_skipped']}행 (쓴 행 {skip_stats['videos_written']}) / video_raw {skip_stats['raw_skipped']}행 (쓴 행 {skip_stats['raw_written']}) / video_stats {skip_stats['stats_skipped']}행 (쓴 행 {skip_stats['stats_written']})")
+    if write_stats["commits"]:
+        rate = write_stats["videos"] / write_stats["sec"] if write_stats["sec"] else 0.0
+        print(f"🗄️ 메타데이터 저장({DB_DURABILITY}): 영상 {write_stats['videos']}개 / 커밋 {write_stats['commits']}회 / 쓰기 시간 {write_stats['sec']:.2f}초 (초당 {rate:.0f}개)")
+    if write_stats["failed"]:
+        print(f"[Error! 메타데이터 저장에 실패해 버린 영상: {write_stats['failed']}개]")
+    if raw_stats["videos"]:
+        print(f"🗄️ raw_json: 영상당 평균 {raw_stats['bytes'] / raw_stats['videos'] / 1024:.1f}KB / JSON 변환 {raw_stats['sec'] / raw_stats['videos'] * 1000:.2f}ms ({'전체' if RAW_JSON_FIELDS is None else f'{len(RAW_JSON_FIELDS)}개 key만'})")
+    if delta_stats["raw_versions"]:
+        print(f"🗄️ raw_json 변경 {delta_stats['raw_versions']}건: 예전 raw_json {delta_stats['raw_full_bytes'] / 1024:.0f}KB 대신 패치 {delta_stats['raw_patch_bytes'] / 1024:.1f}KB 저장")
+    if delta_stats["text_full_bytes"]:
+        print(f"🗄️ 설명 변경: 전체 텍스트 {delta_stats['text_full_bytes'] / 1024:.1f}KB 대신 차이 {delta_stats['text_delta_bytes'] / 1024:.1f}KB 저장")
+
+
+##### 수정 이력 조회 #####
+
+def load_video_field_history(video_id: str, field: str) -> List[Tuple[int, Optional[str], str, str]]: # 영상의 column 하나의 수정 이력 (수정 번호, 발견한 시간, 예전 값, 새 값) 목록 (오래된 순)
+    if field not in VIDEO_REVISION_FIELDS:
+        raise ValueError(f"수정 이력을 남기지 않는 column: {field}")
+    cursor.execute(f"SELECT {field} FROM videos WHERE id = ?", (video_id,))
+    row = cursor.fetchone()
+    value = (row[0] or "") if row else "" # 차이만 저장된 수정은 현재 값에서부터 거꾸로 적용해 예전 값과 새 값을 다시 만듦
+
+    cursor.execute(
+        "SELECT revision, observed_kst, old_value, new_value, delta FROM video_revisions WHERE video_id = ? AND field = ? ORDER BY revision DESC",
+        (video_id, field),
+    )
+    history: List[Tuple[int, Optional[str], str, str]] = []
+    for revision, observed_kst, old_value, new_value, delta in cursor.fetchall():
+        if delta is not None:
+            new_value = value
+            old_value = apply_text_delta(value, delta)
+        history.append((revision, observed_kst, old_value or "", new_value or ""))
+        value = old_value or ""
+    history.reverse()
+    return history
+
+
+def load_raw_json_version(video_id: str, version: Optional[int] = None): # 영상의 raw_json을 특정 버전으로 다시 만들어 반환 (version이 None이면 최신, 0이면 처음 저장한 것)
+    cursor.execute("SELECT raw_json FROM video_raw WHERE id = ?", (video_id,))
+    row = cursor.fetchone()
+    if not row or not row[0]:
+        return None
+    doc = json.loads(row[0])
+    if version is None:
+        return doc
+    cursor.execute(
+        "SELECT patch FROM video_raw_history WHERE video_id = ? AND version >= ? ORDER BY version DESC",
+        (video_id, version),
+    )
+    for (patch,) in cursor.fetchall():
+        doc = apply_json_patch(doc, _decompress_json(patch))
+    return doc
+
+
+def load_recent_video_ids(hours: int, query: str) -> Set[str]: # 최근 hours시간 안에 업로드되어 저장된 영상 중 query로 찾아낸 적이 있는 영상 ID 조회
+    since = (datetime.datetime.now(KST) - datetime.timedelta(hours=hours)).strftime("%Y-%m-%dT%H:%M:%S%z")
+    # publish_time은 모두 KST(+0900) 문자열로 저장되므로 문자열 비교로 시간 비교 가능
+    cursor.execute(
+        "SELECT DISTINCT v.id FROM videos v JOIN video_queries q ON q.video_id = v.id WHERE q.query = ? AND v.publish_time >= ?",
+        (query, since),
+    )
+    return {row[0] for row in cursor.fetchall()}
+
+
+def record_video_queries(found: List[Tuple[str, str, str]]) -> None: # (vid, 검색어, 필터 이름) 목록을 video_queries 테이블에 기록
+    if not found:
+        return
+    now_kst = datetime.datetime.now(KST).strftime("%Y-%m-%dT%H:%M:%S%z")
+    cursor.executemany(
+        "INSERT INTO video_queries (video_id, query, filter_name, first_seen_kst, last_seen_kst) VALUES (?, ?, ?, ?, ?) "
+        "ON CONFLICT(video_id, query, filter_name) DO UPDATE SET last_seen_kst = excluded.last_seen_kst",
+        [(vid, query, filter_name, now_kst, now_kst) for vid, query, filter_name in found],
+    )
+    conn.commit()
+
+
+def _update_known_streak(streak: int, ids: List[str], known_ids: Set[str]) -> int: # 새로 나타난 순서대로 이미 저장된 영상이 연속으로 몇 개 나왔는지 갱신
+    for vid in ids:
+        streak = streak + 1 if vid in known_ids else 0
+    return streak
+
+
+def _open_search_tab(drv: webdriver.Chrome, job: dict) -> dict: # 새 탭에서 검색 결과 페이지를 열고 탭의 상태를 반환
+    url = build_search_url(job["query"], job["sp"])
+    print(f"🔍 [{job['label']}] 검색 URL: {url}")
+    drv.switch_to.new_window("tab")
+    if LEAN_PAGE_LOAD:
+        _apply_lean_page_profile(drv) # 요청 차단은 탭마다 따로 설정해야 함
+    _record_daemon_page_load()
+    drv.get(url) # 브라우저 주소창에 검색 URL을 입력해 이동 (첫 결과가 뜨는 것은 첫 회차 스크립트에서 기다림)
+    return {
+        "job": job,
+        "handle": drv.current_window_handle,
+        "ids": {},              # 먼저 발견된 순서를 유지하면서 중복 제거
+        "rounds": 0,
+        "stable_rounds": 0,
+        "known_streak": 0,
+        "latencies": [],        # 스크롤 1회당 새 결과를 기다린 시간(초)
+    }
+
+
+def _scroll_search_tab(drv: webdriver.Chrome, tab: dict, on_found: Optional[Callable[[List[str]], None]] = None) -> bool: # 탭에서 스크롤 1회차를 진행하고, 이 탭의 수집이 끝났으면 True 반환
+    job = tab["job"]
+    label = job["label"]
+    result = drv.execute_async_script(_SCROLL_ROUND_JS, int(SCROLL_WAIT_TIMEOUT * 1000), int(INITIAL_LOAD_TIMEOUT * 1000), HARVEST_RETRY_ROUNDS)
+
+    new_ids = result.get("ids") or []
+    for vid in new_ids:
+        tab["ids"].setdefault(vid)
+    if on_found and new_ids:
+        on_found(new_ids)
+    if result.get("dropped"):
+        print(f"[Error! [{label}] href가 {HARVEST_RETRY_ROUNDS}회차 동안 비어 있는 영상 링크 {result['dropped']}개 포기]")
+    tab["rounds"] += 1
+    waited = (result.get("waited_ms") or 0) / 1000
+
+    if result.get("first"):
+        # 첫 회차의 대기 시간 = 페이지를 열기 시작해 첫 결과가 뜰 때까지의 시간
+        with crawl_stats_lock:
+            crawl_stats["pages"] += 1
+            crawl_stats["load_sec"] += waited
+        print(f" --> [{label}] 페이지 로딩 시간(첫 결과 표시까지): {waited:.2f}초 / 수집된 영상 수: {len(tab['ids'])}개")
+    else:
+        tab["latencies"].append(waited)
+        print(f" --> [{label}] 스크롤 {tab['rounds'] - 1}회차 / 수집된 영상 수: {len(tab['ids'])}개 (대기 {waited:.2f}초 / 사유: {result.get('reason')})")
+
+    # 새로 나타난 영상이 KNOWN_ID_EARLY_STOP개 연속으로 이미 저장된 영상이면 그 뒤도 이미 본 영상으로 판단
+    known_ids = job.get("known_ids")
+    if known_ids is not None and KNOWN_ID_EARLY_STOP > 0:
+        tab["known_streak"] = _update_known_streak(tab["known_streak"], new_ids, known_ids)
+        if tab["known_streak"] >= KNOWN_ID_EARLY_STOP:
+            print(f"📌 [{label}] 이미 저장된 영상이 {tab['known_streak']}개 연속으로 나옴 --> 스크롤 종료")
+            return True
+
+    if result.get("ended"):
+        print(f"📌 [{label}] 검색 결과의 끝에 도달 --> 스크롤 종료")
+        return True
+
+    # 새 영상 없이 대기 시간을 SCROLL_STABLE_ROUNDS번 연속 다 쓰면 스크롤 종료
+    if result.get("reason") == "timeout":
+        tab["stable_rounds"] += 1
+        if tab["stable_rounds"] >= SCROLL_STABLE_ROUNDS:
+            print(f"📌 [{label}] 더 이상 로딩되는 영상 없음 --> 스크롤 종료")
+            return True
+    else:
+        tab["stable_rounds"] = 0 # 변화가 있으면 초기화
+
+    return tab["rounds"] > MAX_SCROLL_TRIES # 최대 MAX_SCROLL_TRIES 만큼만 스크롤
+
+
+def scroll_jobs_in_tabs(jobs: List[dict], on_found: Optional[Callable[[List[str]], None]] = None) -> Dict[int, List[str]]: # 여러 검색 작업을 하나의 크롬 안에서 최대 MAX_CONCURRENT_TABS개의 탭으로 동시에 스크롤
+    drv = get_driver()
+    drv.set_script_timeout(max(SCROLL_WAIT_TIMEOUT, INITIAL_LOAD_TIMEOUT) + 5)
+    home = drv.current_window_handle # 모든 탭을 닫아도 세션이 유지되도록 처음 탭은 남겨둠
+    _drain_transferred_bytes(drv) # 이전에 쌓인 로그 비우기
+
+    results: Dict[int, List[str]] = {}
+    pending = list(range(len(jobs)))
+    active: List[dict] = []
+
+    # 탭을 돌아가며 한 회차씩 진행: 한 탭이 다음 결과를 기다리는 동안 다른 탭들이 로딩됨
+    while pending or active:
+        while pending and len(active) < MAX_CONCURRENT_TABS:
+            idx = pending.pop(0)
+            try:
+                tab = _open_search_tab(drv, jobs[idx])
+            except Exception as e:
+                print(f"[Error! [{jobs[idx]['label']}] 검색 탭 열기 실패]: {e}")
+                results[idx] = []
+                continue
+            tab["index"] = idx
+            active.append(tab)
+
+        for tab in list(active):
+            _renew_daemon_lease() # 탭 하나의 스크롤이 BROWSER_LEASE_SECONDS보다 오래 걸려도 데몬이 크롬을 재시작하지 않도록
+            try:
+                drv.switch_to.window(tab["handle"])
+                finished = _scroll_search_tab(drv, tab, on_found)
+            except Exception as e:
+                print(f"[Error! [{tab['job']['label']}] 스크롤 실패]: {e}")
+                finished = True
+            if not finished:
+                continue
+
+            latencies = tab["latencies"]
+            if latencies:
+                print(f"⏱️ [{tab['job']['label']}] 스크롤 {len(latencies)}회 대기 시간: 평균 {sum(latencies) / len(latencies):.2f}초 / 최대 {max(latencies):.2f}초 / 합계 {sum(latencies):.1f}초")
+            print(f"📦 [{tab['job']['label']}] 최종 수집된 영상 수: {len(tab['ids'])}개")
+            results[tab["index"]] = list(tab["ids"])
+            active.remove(tab)
+            try:
+                drv.close() # 끝난 탭은 바로 닫아 메모리 반환
+            except Exception:
+                pass
+            drv.switch_to.window(home) # 닫은 탭에 머물러 있으면 다음 탭을 열 수 없음 (no such window)
+
+    drv.switch_to.window(home)
+    page_bytes = _drain_transferred_bytes(drv)
+    with crawl_stats_lock:
+        crawl_stats["bytes"] += page_bytes
+    print(f"📶 [selenium] 받은 데이터: {page_bytes / 1024:.0f}KB")
+    return results
+
+
+def scroll_and_collect_video_ids(query: str, sp: str, known_ids: Optional[Set[str]] = None) -> List[str]: # 검색 결과 페이지를 스크롤해 영상 ID만 수집
+    job = {"query": query, "filter": "", "sp": sp, "label": query, "known_ids": known_ids}
+    return scroll_jobs_in_tabs([job]).get(0, [])
+
+
+def _extract_json_after(text: str, marker: str) -> Optional[dict]: # text에서 marker 바로 뒤에 오는 JSON 객체 하나를 파싱
+    start = text.find(marker)
+    if start < 0:
+        return None
+    start = text.find("{", start + len(marker))
+    if start < 0:
+        return None
+    try:
+        obj, _ = json.JSONDecoder().raw_decode(text, start)
+    except ValueError:
+        return None
+    return obj if isinstance(obj, dict) else None
+
+
+def _extract_ytcfg(html: str) -> dict: # 검색 결과 HTML의 ytcfg.set({...}) 호출들을 모두 합쳐 하나의 설정 dict로 만듦
+    cfg: dict = {}
+    pos = 0
+    while True:
+        pos = html.find("ytcfg.set(", pos)
+        if pos < 0:
+            break
+        obj = _extract_json_after(html[pos:pos + 500000], "ytcfg.set(")
+        if obj:
+            cfg.update(obj)
+        pos += len("ytcfg.set(")
+    return cfg
+
+
+def _parse_search_results(data: dict) -> Tuple[List[str], Optional[str]]: # ytInitialData 또는 continuation 응답에서 영상 ID들과 다음 페이지 토큰 추출
+    video_ids: List[str] = []
+    token: Optional[str] = None
+
+    # 재귀 대신 스택으로 JSON 트리 전체를 순회
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            renderer = node.get("videoRenderer")
+            if isinstance(renderer, dict) and renderer.get("videoId"):
+                video_ids.append(renderer["videoId"])
+            cont = node.get("continuationItemRenderer")
+            if isinstance(cont, dict):
+                cmd = (cont.get("continuationEndpoint") or {}).get("continuationCommand") or {}
+                if cmd.get("token"):
+                    token = cmd["token"]
+            # 자식 노드는 역순으로 넣어야 원래 순서대로 꺼내짐
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+
+    return video_ids, token
+
+
+def collect_video_ids_via_http(query: str, sp: str, known_ids: Optional[Set[str]] = None, label: str = "", on_found: Optional[Callable[[List[str]], None]] = None) -> List[str]: # 브라우저 없이 검색 결과 페이지와 continuation JSON만으로 영상 ID 수집
+    label = label or query
+    url = build_search_url(query, sp)
+    print(f"🔍 [{label}] 검색 URL (http): {url}")
+
+    session = new_http_session(HTTP_HEADERS)
+    session.cookies.set("SOCS", "CAI", domain=".youtube.com") # 쿠키 동의 페이지 대신 검색 결과를 바로 받기 위한 쿠키
+
+    load_started = time.perf_counter()
+    resp = session.get(url, timeout=HTTP_TIMEOUT)
+    resp.raise_for_status()
+    html = resp.text
+    with crawl_stats_lock:
+        crawl_stats["pages"] += 1
+        crawl_stats["load_sec"] += time.perf_counter() - load_started
+        crawl_stats["bytes"] += len(resp.content)
+
+    # 페이지에 들어있는 첫 검색 결과(ytInitialData) 파싱
+    initial_data = _extract_json_after(html, "var ytInitialData = ") or _extract_json_after(html, 'window["ytInitialData"] = ')
+    if initial_data is None:
+        raise ValueError("검색 결과 페이지에서 ytInitialData를 찾지 못함")
+
+    ytcfg = _extract_ytcfg(html)
+    api_key = ytcfg.get("INNERTUBE_API_KEY")
+    context = ytcfg.get("INNERTUBE_CONTEXT")
+
+    video_ids: Dict[str, None] = {} # 먼저 발견된 순서를 유지하면서 중복 제거
+    ids, token = _parse_search_results(initial_data)
+    for vid in ids:
+        video_ids.setdefault(vid)
+    if on_found and video_ids:
+        on_found(list(video_ids))
+    print(f" --> [{label}] 페이지 1 / 수집된 영상 수: {len(video_ids)}개")
+    known_streak = _update_known_streak(0, ids, known_ids) if known_ids is not None else 0
+
+    # continuation 토큰이 있으면 다음 검색 결과를 계속 요청
+    for page in range(2, MAX_CONTINUATION_PAGES + 1):
+        if not token:
+            break
+        if known_ids is not None and 0 < KNOWN_ID_EARLY_STOP <= known_streak:
+            print(f"📌 [{label}] 이미 저장된 영상이 {known_streak}개 연속으로 나옴 --> 요청 종료")
+            break
+        if not api_key or not context:
+            print(f"📌 [{label}] ytcfg에서 INNERTUBE 설정을 찾지 못해 첫 페이지만 수집")
+            break
+
+        resp = session.post(
+            "https://www.youtube.com/youtubei/v1/search",
+            params={"key": api_key, "prettyPrint": "false"},
+            json={"context": context, "continuation": token},
+            timeout=HTTP_TIMEOUT,
+        )
+        resp.raise_for_status()
+        with crawl_stats_lock:
+            crawl_stats["pages"] += 1
+            crawl_stats["load_sec"] += resp.elapsed.total_seconds()
+            crawl_stats["bytes"] += len(resp.content)
+        ids, token = _parse_search_results(resp.json())
+
+        before = len(video_ids)
+        new_ids = [vid for vid in ids if vid not in video_ids]
+        for vid in new_ids:
+            video_ids.setdefault(vid)
+        if on_found and new_ids:
+            on_found(new_ids)
+        print(f" --> [{label}] 페이지 {page} / 수집된 영상 수: {len(video_ids)}개")
+        if known_ids is not None:
+            known_streak = _update_known_streak(known_streak, new_ids, known_ids)
+
+        # 새로 추가된 영상이 없으면 더 이상 결과가 없는 것으로 판단
+        if len(video_ids) == before:
+            print(f"📌 [{label}] 더 이상 새로운 영상 없음 --> 요청 종료")
+            break
+
+    print(f"📦 [{label}] 최종 수집된 영상 수: {len(video_ids)}개")
+    return list(video_ids)
+
+
+def _extract_video_info_timed(video_id: str) -> Tuple[str, Optional[dict], Optional[Exception], float]: # 작업 스레드에서 실행: (vid, 영상 정보, 실패 시 예외, 추출 시간) 반환
+    started = time.perf_counter()
+    try:
+        info = extract_video_info(f"https://www.youtube.com/watch?v={video_id}")
+        return video_id, info, None, time.perf_counter() - started
+    except Exception as e:
+        return video_id, None, e, time.perf_counter() - started
+
+
+def iter_video_infos(video_ids: List[str]) -> Iterator[Tuple[str, Optional[dict], Optional[Exception], float]]: # 영상 정보를 가져와 끝나는 순서대로 반환 (api 방식이면 50개씩, 나머지는 최대 METADATA_WORKERS개의 스레드로 yt-dlp)
+    if METADATA_BACKEND == "api":
+        missing: List[str] = []
+        for start in range(0, len(video_ids), 50):
+            chunk = video_ids[start:start + 50]
+            started = time.perf_counter()
+            infos = fetch_video_infos_via_api(chunk)
+            per_video = (time.perf_counter() - started) / max(len(infos), 1) # 호출 1번의 시간을 영상 수로 나눠 영상당 시간으로 기록
+            for vid in chunk:
+                if vid in infos:
+                    yield vid, infos[vid], None, per_video
+                else:
+                    missing.append(vid)
+
+        # 비공개, 삭제, 연령 제한 등으로 api가 돌려주지 않은 영상만 yt-dlp로 다시 시도
+        if missing:
+            print(f"\n📌 videos.list가 돌려주지 않은 영상 {len(missing)}개 --> yt-dlp로 대체")
+        video_ids = missing
+
+    if METADATA_WORKERS <= 1:
+        for vid in video_ids:
+            yield _extract_video_info_timed(vid)
+        return
+
+    with ThreadPoolExecutor(max_workers=METADATA_WORKERS) as pool:
+        remaining = iter(video_ids)
+        in_flight = set()
+
+        # 저장이 추출보다 느려도 결과가 메모리에 무한히 쌓이지 않도록 동시에 진행 중인 작업 수를 스레드 수의 2배로 제한
+        def fill() -> None:
+            while len(in_flight) < METADATA_WORKERS * 2:
+                vid = next(remaining, None)
+                if vid is None:
+                    return
+                in_flight.add(pool.submit(_extract_video_info_timed, vid))
+
+        fill()
+        while in_flight:
+            finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                yield future.result()
+            fill()
+
+
+def fetch_video_infos_via_api(video_ids: List[str]) -> Dict[str, dict]: # YouTube Data API v3(videos.list)로 최대 50개의 영상 정보를 한 번에 가져옴
+    params = {
+        "part": "snippet,contentDetails,liveStreamingDetails,statistics",
+        "id": ",".join(video_ids[:50]), # 한 번에 최대 50개
+        "maxResults": 50,
+    }
+    try:
+        resp = api_get("videos", params)
+    except (requests.RequestException, QuotaExhaustedError) as e:
+        print(f"[Error! videos 호출 실패]: {e}")
+        return {}
+    if resp.status_code != 200:
+        print(f"[Error! videos 호출 실패 ({resp.status_code}): {resp.text[:200]}]")
+        return {}
+
+    infos: Dict[str, dict] = {}
+    for item in resp.json().get("items", []):
+        if item.get("id"):
+            infos[item["id"]] = _api_item_to_info(item)
+    return infos
+
+
+def fetch_and_store_video_metadata(video_id: str) -> bool: # yt-dlp를 통해 DB에 영상 메타데이터 저장
+    _, info, error, extract_sec = _extract_video_info_timed(video_id)
+    return store_video_metadata(video_id, info, error, extract_sec)
+
+
+def store_video_metadata(video_id: str, info: Optional[dict], error: Optional[Exception], extract_sec: float) -> bool: # 추출한 영상 정보를 DB에 저장 (DB 연결을 가진 메인 스레드에서만 호출)
+    video_url = f"https://www.youtube.com/watch?v={video_id}"
+
+    if info is None:
+        print(f"[Error! 영상 메타데이터 추출 실패] {video_id}: {error}")
+        return False
+    _current_video_writes.clear() # 앞 영상이 저장 도중 예외로 끝났다면 남은 문장은 이 영상의 묶음에 섞이지 않도록 버림
+    metadata_stats["videos"] += 1
+    metadata_stats["extract_sec"] += extract_sec
+    if info.get("comment_count") is not None:
+        comment_count_hints[video_id] = info["comment_count"]
+
+    # 메타데이터 추출 및 전처리
+    title = info.get("title", "") or ""
+    channel = info.get("channel", "") or ""
+    description = info.get("description", "") or ""
+    duration_sec = info.get("duration", 0) or 0
+
+    status = classify_video_type(info)
+    publish_time = get_publish_time_kst(info)
+
+    minutes, seconds = divmod(duration_sec, 60)
+    duration_str = f"{minutes}분 {seconds}초"
+
+    # DB에 해당 영상이 이미 저장되어 있는지 확인
+    cursor.execute(
+        "SELECT id, title, channel, publish_time, description, duration, status, url, revised_contents, revision_count, fields_hash FROM videos WHERE id = ?",
+        (video_id,),
+    )
+    existing = cursor.fetchone()
+
+    # JSON을 문자열로 변환 (RAW_JSON_FIELDS에 있는 값만, api 방식이면 videos.list로 알 수 없는 값은 지난번 raw_json에서)
+    previous_raw = None
+    if existing is not None and "api_item" in info:
+        try:
+            previous_raw = load_raw_json_version(video_id)
+        except ValueError:
+            previous_raw = None # JSON이 아닌 예전 값
+    raw_json_str = serialize_raw_info(info, first_sighting=existing is None, previous=previous_raw if isinstance(previous_raw, dict) else None)
+
+    # 새로 저장하려는 값들
+    new_values = {
+        "title": title,
+        "channel": channel,
+        "publish_time": publish_time,
+        "description": description,
+        "duration": duration_str,
+        "status": status,
+        "url": video_url,
+    }
+    fields_hash = content_hash(json.dumps([new_values[key] or "" for key in VIDEO_REVISION_FIELDS], ensure_ascii=False))
+
+    changed = False
+    revision_changes: List[str] = []
+
+    # 지난번과 지문(fields_hash)이 같으면 값을 하나하나 비교하거나 UPDATE하지 않고 건너뜀
+    if existing and existing[10] == fields_hash and not existing[8]:
+        skip_stats["videos_skipped"] += 1
+
+    # 해당 영상이 이미 저장되어 있다면 변경 사항 비교
+    elif existing:
+        # existing = (id, title, channel, publish_time, description, duration, status, url, revised_contents, revision_count, fields_hash)
+        old_values = {
+            "title": existing[1] or "",
+            "channel": existing[2] or "",
+            "publish_time": existing[3] or "",
+            "description": existing[4] or "",
+            "duration": existing[5] or "",
+            "status": existing[6] or "",
+            "url": existing[7] or "",
+        }
+
+        revision_count = existing[9] or 0
+        now_kst = datetime.datetime.now(KST).strftime("%Y-%m-%dT%H:%M:%S%z")
+
+        # 예전 방식(revised_contents 문자열)으로 남은 이력이 있으면 먼저 수정 이력 테이블로 옮김 (예전 스크립트가 이어 붙인 경우)
+        legacy = _parse_revised_contents(existing[8] or "", VIDEO_REVISION_FIELDS)
+        for number, field, old_val, new_val in legacy:
+            queue_video_write(
+                "INSERT INTO video_revisions (video_id, revision, field, old_value, new_value, observed_kst) VALUES (?, ?, ?, ?, ?, NULL)",
+                (video_id, revision_count + number, field, old_val, new_val),
+            )
+        revision_count += max((r[0] for r in legacy), default=0)
+
+        # 하나하나 변경 사항 확인 후, 바뀐 column마다 수정 이력 한 줄씩 추가
+        for key in new_values:
+            old_val = old_values.get(key, "")
+            new_val = new_values[key] or ""
+            if old_val != new_val:
+                if not changed:
+                    changed = True
+                    revision_count += 1
+                # 변경 사항 기록
+                if key in DELTA_FIELDS: # 긴 텍스트는 전체 값 대신 새 값에서 예전 값을 다시 만드는 차이만 저장
+                    revision_changes.append(f"({key}: {len(old_val)}자 --> {len(new_val)}자)")
+                    delta = make_text_delta(new_val, old_val)
+                    delta_stats["text_full_bytes"] += len(old_val.encode("utf-8")) + len(new_val.encode("utf-8"))
+                    delta_stats["text_delta_bytes"] += len(delta)
+                    queue_video_write(
+                        "INSERT INTO video_revisions (video_id, revision, field, old_value, new_value, observed_kst, delta) VALUES (?, ?, ?, NULL, NULL, ?, ?)",
+                        (video_id, revision_count, key, now_kst, delta),
+                    )
+                    continue
+                revision_changes.append(f"({key}: {old_val} --> {new_val})")
+                queue_video_write(
+                    "INSERT INTO video_revisions (video_id, revision, field, old_value, new_value, observed_kst) VALUES (?, ?, ?, ?, ?, ?)",
+                    (video_id, revision_count, key, old_val, new_val, now_kst),
+                )
+
+        # DB 갱신 (다음 커밋 묶음에 추가)
+        queue_video_write(
+            "UPDATE videos SET title = ?, channel = ?, publish_time = ?, description = ?, duration = ?, status = ?, url = ?, revised_contents = NULL, revision_count = ?, fields_hash = ? WHERE id = ?",
+            (
+                new_values["title"],
+                new_values["channel"],
+                new_values["publish_time"],
+                new_values["description"],
+                new_values["duration"],
+                new_values["status"],
+                new_values["url"],
+                revision_count,
+                fields_hash,
+                video_id,
+            ),
+        )
+        skip_stats["videos_written"] += 1
+    else:
+        # 처음 보는 영상이라면 저장
+        revision_changes = []
+        queue_video_write(
+            "INSERT INTO videos (id, title, channel, publish_time, description, duration, status, url, revision_count, fields_hash) VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0, ?)",
+            (
+                video_id,
+                new_values["title"],
+                new_values["channel"],
+                new_values["publish_time"],
+                new_values["description"],
+                new_values["duration"],
+                new_values["status"],
+                new_values["url"],
+                fields_hash,
+            ),
+        )
+        skip_stats["videos_written"] += 1
+        changed = False
+    
+    # video_raw, video_stats 테이블 업데이트 후 커밋할 때가 되었으면 커밋
+    _update_video_raw_revised_count(video_id, raw_json_str, changed)
+    _record_video_stats(video_id, info)
+    finish_video_write(video_id)
+    
+    print(f"✅ 메타데이터 저장 완료: {video_id} / {title}")
+    print(f"  --> publish_time(KST): {publish_time}, status: {status}, 추출 시간: {extract_sec:.2f}초")
+    if changed and revision_changes:
+        print(f"  --> 변경사항: {', '.join(revision_changes)}")
+    return True
+
+
+def expected_new_comments(video_id: str) -> int: # 영상에 표시된 댓글 수 - DB에 저장된 댓글 수 (댓글 수를 모르면 1로 가정)
+    total = comment_count_hints.get(video_id)
+    if total is None:
+        return 1
+    cursor.execute("SELECT COUNT(*) FROM comments WHERE video_id = ?", (video_id,))
+    stored = cursor.fetchone()[0] or 0
+    return max(total - stored, 0)
+
+
+def prioritize_comment_fetch(video_ids: List[str]) -> List[str]: # 남은 할당량이 적으면 새 댓글이 많을 것으로 예상되는 영상부터, 새 댓글이 없을 영상은 건너뜀
+    remaining = get_remaining_api_quota()
+    if remaining >= API_QUOTA_LOW:
+        return list(video_ids)
+
+    expected = {vid: expected_new_comments(vid) for vid in video_ids}
+    ordered = sorted((vid for vid in video_ids if expected[vid] > 0), key=lambda vid: expected[vid], reverse=True)
+    print(f"📉 남은 API 할당량 {remaining} unit --> 새 댓글이 많을 것으로 예상되는 순서로 댓글 수집 ({len(video_ids) - len(ordered)}개 영상은 새 댓글이 없어 건너뜀)")
+    return ordered
+
+
+# 댓글 한 개: (영상ID, 댓글ID, 답글이면 댓글 스레드ID, 내용, 작성자 이름, 작성자 채널ID, 작성자 채널 url, 작성시간(KST))
+CommentRow = Tuple[str, str, str, str, str, str, str, str]
+
+
+def _hours_ago_kst(hours: float) -> str: # 지금으로부터 hours시간 전 (KST 문자열, 저장된 KST 시간과 문자열로 비교 가능)
+    return (datetime.datetime.now(KST) - datetime.timedelta(hours=hours)).strftime("%Y-%m-%dT%H:%M:%S%z")
+
+
+def load_comment_watermark(video_id: str) -> Optional[dict]: # 증분 수집의 기준(지난번에 가져온 가장 최신 댓글) 조회, 전체 수집이 필요하면 None
+    if not COMMENT_INCREMENTAL:
+        return None
+    cursor.execute(
+        "SELECT newest_thread_id, newest_comment_time_kst, last_full_sweep_kst FROM comment_fetch_state WHERE video_id = ?",
+        (video_id,),
+    )
+    row = cursor.fetchone()
+    if not row or not (row[0] or row[1]):
+        return None
+
+    # 마지막 전체 수집 후 COMMENT_FULL_SWEEP_HOURS가 지났으면 다시 전체 수집
+    if not row[2] or row[2] < _hours_ago_kst(COMMENT_FULL_SWEEP_HOURS):
+        return None
+    return {"thread_id": row[0] or "", "time_kst": row[1] or ""}
+
+
+comment_gate_stats = {"unchanged": 0, "disabled": 0} # 이번 실행에서 댓글 수가 그대로여서 / 댓글 사용이 중지되어 댓글 수집을 건너뛴 영상 수
+
+
+def should_fetch_comments(video_id: str) -> bool: # 댓글 사용이 중지되었거나 댓글 수가 지난번과 같은 영상이면 False (메타데이터를 저장한 뒤 호출)
+    cursor.execute(
+        "SELECT last_comment_count, comments_disabled, disabled_checked_kst, last_full_sweep_kst FROM comment_fetch_state WHERE video_id = ?",
+        (video_id,),
+    )
+    row = cursor.fetchone()
+    if not row:
+        return True
+    last_count, disabled, disabled_checked_kst, last_full_sweep_kst = row
+    count = comment_count_hints.get(video_id)
+
+    # 댓글 사용 중지: 다시 확인할 때가 되지 않았고, 메타데이터에도 댓글 수가 없으면 건너뜀
+    if disabled:
+        if count is None and disabled_checked_kst and disabled_checked_kst >= _hours_ago_kst(COMMENTS_DISABLED_RECHECK_HOURS):
+            comment_gate_stats["disabled"] += 1
+            return False
+        return True
+
+    # 댓글 수가 그대로면 건너뜀 (전체 수집할 때가 되었으면 수정된 댓글 반영을 위해 수집)
+    if not COMMENT_COUNT_GATE or count is None or last_count is None or count != last_count:
+        return True
+    if not last_full_sweep_kst or last_full_sweep_kst < _hours_ago_kst(COMMENT_FULL_SWEEP_HOURS):
+        return True
+    comment_gate_stats["unchanged"] += 1
+    return False
+
+
+def finish_comment_fetch(video_id: str, watermark: Optional[dict], result: dict) -> None: # 댓글 수집 결과(iter_comment_pages의 result)를 comment_fetch_state에 기록
+    now_kst = datetime.datetime.now(KST).strftime("%Y-%m-%dT%H:%M:%S%z")
+
+    # 댓글 사용이 중지된 영상은 COMMENTS_DISABLED_RECHECK_HOURS 동안 다시 호출하지 않도록 기록
+    if result.get("disabled"):
+        cursor.execute(
+            "INSERT INTO comment_fetch_state (video_id, comments_disabled, disabled_checked_kst) VALUES (?, 1, ?) "
+            "ON CONFLICT(video_id) DO UPDATE SET comments_disabled = 1, disabled_checked_kst = excluded.disabled_checked_kst",
+            (video_id, now_kst),
+        )
+        conn.commit()
+        print(f"  --> {video_id}: 댓글 사용이 중지된 영상 ({COMMENTS_DISABLED_RECHECK_HOURS}시간 동안 댓글 수집 건너뜀)")
+        return
+
+    if not result.get("complete"): # 수집이 중간에 실패했으면 기준을 바꾸지 않음 (다음 실행에서 다시 수집)
+        return
+
+    # 이번에 가져온 가장 최신 댓글을 다음 증분 수집의 기준으로, 지금 댓글 수를 다음 실행의 비교 기준으로 저장
+    newest = result.get("newest") or {}
+    cursor.execute(
+        "INSERT INTO comment_fetch_state (video_id, newest_thread_id, newest_comment_time_kst, last_full_sweep_kst, last_comment_count, comments_disabled) "
+        "VALUES (?, ?, ?, ?, ?, 0) "
+        "ON CONFLICT(video_id) DO UPDATE SET "
+        "newest_thread_id = COALESCE(excluded.newest_thread_id, comment_fetch_state.newest_thread_id), "
+        "newest_comment_time_kst = COALESCE(excluded.newest_comment_time_kst, comment_fetch_state.newest_comment_time_kst), "
+        "last_full_sweep_kst = COALESCE(excluded.last_full_sweep_kst, comment_fetch_state.last_full_sweep_kst), "
+        "last_comment_count = excluded.last_comment_count, comments_disabled = 0",
+        (
+            video_id,
+            newest.get("thread_id"),
+            newest.get("time_kst"),
+            now_kst if watermark is None else None,
+            comment_count_hints.get(video_id),
+        ),
+    )
+    conn.commit()
+
+
+def print_comment_gate_stats() -> None: # 이번 실행에서 댓글 수집을 건너뛴 영상 수 출력
+    if comment_gate_stats["unchanged"] or comment_gate_stats["disabled"]:
+        print(f"💬 댓글 수집 건너뜀: 댓글 수가 그대로인 영상 {comment_gate_stats['unchanged']}개 / 댓글 사용이 중지된 영상 {comment_gate_stats['disabled']}개")
+
+
+def iter_comment_pages(video_id: str, watermark: Optional[dict] = None, result: Optional[dict] = None) -> Iterator[List[CommentRow]]: # YouTube Data API v3(commentThreads)를 통해 댓글과 답글을 한 페이지(최대 100 스레드)씩 반환
+    # watermark가 있으면 그보다 오래된 댓글 스레드가 나오는 페이지까지만 가져옴 (order=time이라 그 뒤는 모두 이미 가져온 댓글)
+    # 한 페이지씩 돌려주므로 댓글이 아무리 많아도 메모리에는 한 페이지만 남고, 받은 페이지는 바로 저장할 수 있음
+    # 끝까지 돌면 result["complete"] = True, result["newest"]에 이번에 본 가장 최신 댓글 스레드 {"thread_id", "time_kst"} 기록 / 수집이 중간에 실패했으면 None
+    # 댓글 사용이 중지된 영상이면 result["disabled"] = True
+    if result is None:
+        result = {}
+    result.update(newest=None, complete=False, disabled=False)
+    newest: Optional[dict] = None
+    complete = False
+    pages = 0
+    params = {
+        "part": "snippet,replies", # snippet(댓글), replies(답글)
+        "videoId": video_id,
+        "maxResults": 100,
+        "textFormat": "plainText", 
+        "order": "time",           # 최신순
+    }
+
+    while True:
+        try:
+            resp = api_get("commentThreads", params, fields=COMMENT_THREADS_FIELDS) # request 전송
+        except QuotaExhaustedError as e:
+            print(f"[Error! commentThreads 호출 중단]: {e}")
+            break
+        if resp.status_code == 403 and "commentsDisabled" in resp.text:
+            result["disabled"] = True
+            break
+        if resp.status_code != 200:
+            print(f"[Error! commentThreads 호출 실패 ({resp.status_code}): {resp.text[:200]}]")
+            break
+        pages += 1
+
+        data = resp.json()
+        items = data.get("items", []) # 댓글 목록
+        page_token = data.get("nextPageToken") # 다음 페이지 토큰 (data는 yield 전에 지우므로 미리 꺼내둠)
+        reached_watermark = False
+        rows: List[CommentRow] = [] # 이 페이지의 댓글과 답글
+
+        for item in items:
+            # 댓글 처리
+            try:
+                top = item["snippet"]["topLevelComment"]["snippet"]
+            except KeyError:
+                continue
+
+            # 가장 최신 댓글 스레드(첫 페이지의 첫 항목)를 다음 증분 수집의 기준으로 기억
+            thread_id = item.get("id", "")
+            thread_time_kst = iso8601_to_kst(top.get("publishedAt", ""))
+            if newest is None:
+                newest = {"thread_id": thread_id, "time_kst": thread_time_kst}
+
+            # 지난번 기준에 도달했는지 확인 (이 페이지까지는 끝까지 처리)
+            if watermark and (
+                (watermark["thread_id"] and thread_id == watermark["thread_id"])
+                or (watermark["time_kst"] and thread_time_kst and thread_time_kst < watermark["time_kst"])
+            ):
+                reached_watermark = True
+
+            # 정보 추출
+            comment_text = top.get("textDisplay") or top.get("textOriginal") or ""
+            author_name = top.get("authorDisplayName", "")
+
+            author_channel_id = ""
+            author_channel_url = ""
+            ch_obj = top.get("authorChannelId") or {}
+            if isinstance(ch_obj, dict):
+                author_channel_id = ch_obj.get("value", "") or ""
+            if author_channel_id:
+                author_channel_url = f"https://www.youtube.com/channel/{author_channel_id}"
+
+            published_at = top.get("publishedAt", "")
+            comment_time_kst = iso8601_to_kst(published_at)
+
+            # 결과 리스트에 추가
+            top_comment_id = item["snippet"]["topLevelComment"].get("id") or thread_id
+            rows.append(
+                (
+                    video_id,
+                    top_comment_id,
+                    "",
+                    comment_text,
+                    author_name,
+                    author_channel_id,
+                    author_channel_url,
+                    comment_time_kst,
+                )
+            )
+
+            # 답글 처리
+            replies = (item.get("replies") or {}).get("comments") or []
+            for rep in replies:
+                rs = rep.get("snippet", {})
+
+                # 정보 추출
+                r_text = rs.get("textDisplay") or rs.get("textOriginal") or ""
+                r_author_name = rs.get("authorDisplayName", "")
+
+                r_author_channel_id = ""
+                r_author_channel_url = ""
+                r_ch_obj = rs.get("authorChannelId") or {}
+                if isinstance(r_ch_obj, dict):
+                    r_author_channel_id = r_ch_obj.get("value", "") or ""
+                if r_author_channel_id:
+                    r_author_channel_url = f"https://www.youtube.com/channel/{r_author_channel_id}"
+
+                r_published_at = rs.get("publishedAt", "")
+                r_comment_time_kst = iso8601_to_kst(r_published_at)
+
+                rows.append(
+                    (
+                        video_id,
+                        rep.get("id", ""),
+                        thread_id,
+                        r_text,
+                        r_author_name,
+                        r_author_channel_id,
+                        r_author_channel_url,
+                        r_comment_time_kst,
+                    )
+                )
+
+        del data, items
+        yield rows
+
+        # 지난번 기준에 도달했으면 그 뒤는 이미 가져온 댓글이므로 종료
+        if reached_watermark:
+            complete = True
+            break
+
+        # 다음 페이지가 있는지(댓글이 100개가 넘는지) 확인
+        if not page_token:
+            complete = True
+            break # 없으면 종료
+        params["pageToken"] = page_token # 다음 페이지 토큰 설정 후 루프
+
+    print(f"  --> {video_id}: commentThreads {pages}페이지 호출 ({'증분 수집' if watermark else '전체 수집'})")
+    if not complete:
+        newest = None
+    elif newest is None and watermark:
+        newest = watermark # 새 댓글이 없으면 기준 유지
+    result["newest"] = newest
+    result["complete"] = complete
+
+
+def scroll_and_collect_all_comments(video_id: str) -> None: # 댓글과 답글을 한 페이지씩 수집해 바로 DB에 저장
+    print(f"  --> 댓글 수집 시작 (YouTube Data API v3): {video_id}")
+    watermark = load_comment_watermark(video_id)
+    result: dict = {}
+    for rows in iter_comment_pages(video_id, watermark, result):
+        store_comments(video_id, rows)
+    finish_comment_fetch(video_id, watermark, result)
+
+
+def collect_comments_for_videos(video_ids: List[str]) -> None: # 여러 영상의 댓글을 COMMENT_WORKERS개 스레드에서 동시에 가져오고, 받은 페이지는 이 스레드에서 바로 DB에 저장
+    order = prioritize_comment_fetch([vid for vid in video_ids if should_fetch_comments(vid)])
+    if not order:
+        return
+    watermarks = {vid: load_comment_watermark(vid) for vid in order} # DB 조회는 이 스레드에서 미리
+
+    # 수집 스레드 --> 저장(이 스레드): ("page", vid, 댓글 목록) / ("done", vid, 수집 결과) / ("error", vid, 예외)
+    # 큐가 가득 차면 수집 스레드가 기다리므로 메모리에는 최대 COMMENT_PAGE_QUEUE_SIZE 페이지만 남음
+    page_queue: queue.Queue = queue.Queue(maxsize=COMMENT_PAGE_QUEUE_SIZE)
+    stop = threading.Event() # 저장 루프가 예외로 끝나면 설정 --> 수집 스레드가 가득 찬 큐 앞에서 영원히 기다리지 않고 종료
+
+    def put(item: tuple) -> bool: # 큐에 넣기 (stop이 설정되면 넣지 않고 False)
+        while not stop.is_set():
+            try:
+                page_queue.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def fetch_worker(vid: str) -> None:
+        if stop.is_set():
+            return
+        result: dict = {}
+        try:
+            for rows in iter_comment_pages(vid, watermarks[vid], result):
+                if not put(("page", vid, rows)):
+                    return
+        except Exception as e:
+            put(("error", vid, e))
+            return
+        put(("done", vid, result))
+
+    with ThreadPoolExecutor(max_workers=max(COMMENT_WORKERS, 1)) as pool:
+        for vid in order:
+            pool.submit(fetch_worker, vid)
+        remaining = len(order)
+        try:
+            while remaining:
+                kind, vid, payload = page_queue.get()
+                if kind == "page":
+                    try:
+                        store_comments(vid, payload)
+                    except Exception as e:
+                        print(f"[Error! 댓글 저장 실패] {vid}: {e}")
+                    continue
+                remaining -= 1
+                if kind == "error":
+                    print(f"[Error! 댓글 수집 실패] {vid}: {payload}")
+                    continue
+                try:
+                    finish_comment_fetch(vid, watermarks[vid], payload)
+                except Exception as e:
+                    print(f"[Error! 댓글 수집 상태 저장 실패] {vid}: {e}")
+        finally:
+            stop.set() # 정상 종료면 모든 작업이 이미 끝났으므로 영향 없음
+
+
+def _backfill_legacy_comment_ids(video_id: str, rows: List[CommentRow]) -> None: # ID가 없거나 임시 ID("legacy:" + rowid)인 예전 댓글을 [영상ID + 작성자채널ID + 작성시간]으로 찾아 ID를 채움
+    legacy_sql = _legacy_comment_sql()
+    cursor.execute(f"SELECT 1 FROM comments WHERE video_id = ? AND {legacy_sql} LIMIT 1", (video_id,)) # idx_comments_legacy로 예전 댓글만 확인
+    if not cursor.fetchone():
+        return
+    # 같은 작성자가 같은 초에 쓴 댓글이 여러 개면 하나씩 차례로 ID를 받음
+    for vid, comment_id, parent_id, _, _, author_channel_id, _, comment_time_kst in rows:
+        cursor.execute(
+            f"SELECT rowid, comment_id FROM comments WHERE video_id = ? AND author_channel_id = ? AND comment_time_kst = ? AND {legacy_sql} LIMIT 1",
+            (vid, author_channel_id or "", comment_time_kst),
+        )
+        found = cursor.fetchone()
+        if not found:
+            continue
+        cursor.execute("UPDATE comments SET comment_id = ?, parent_id = ? WHERE rowid = ?", (comment_id, parent_id, found[0]))
+        if found[1]: # 임시 ID로 옮겨 둔 수정 이력도 새 ID로
+            cursor.execute("UPDATE comment_revisions SET comment_id = ? WHERE comment_id = ?", (comment_id, found[1]))
+
+
+def store_comments(video_id: str, rows: List[CommentRow]) -> None: # 수집한 댓글과 답글(보통 한 페이지)을 한 번에 DB에 저장 (DB 연결을 가진 메인 스레드에서만 호출)
+    rows = [row for row in rows if row[1]] # 댓글 ID가 없으면 식별할 수 없으므로 제외
+    if not rows:
+        return
+
+    # 이번 페이지의 댓글 ID로 이미 저장된 댓글을 한 번에 조회 (ID가 없던 예전 댓글은 먼저 ID를 채움)
+    def load_existing() -> Dict[str, tuple]:
+        found: Dict[str, tuple] = {}
+        ids = [row[1] for row in rows]
+        for i in range(0, len(ids), 500): # sqlite의 ? 개수 제한 때문에 500개씩
+            chunk = ids[i:i + 500]
+            cursor.execute(
+                f"SELECT comment_id, comment, author_name, author_channel_url, comment_time_kst, revised_contents, revision_count FROM comments WHERE comment_id IN ({','.join('?' * len(chunk))})",
+                chunk,
+            )
+            for r in cursor.fetchall():
+                found[r[0]] = r[1:]
+        return found
+
+    existing = load_existing()
+    if len(existing) < len({row[1] for row in rows}):
+        _backfill_legacy_comment_ids(video_id, [row for row in rows if row[1] not in existing])
+        existing = load_existing()
+
+    # 새 댓글과 바뀐 댓글만 골라 한 번에 저장 (바뀌지 않은 댓글은 쓰지 않음)
+    upserts: List[tuple] = []
+    revisions: List[tuple] = []
+    new_count = 0
+    changed_count = 0
+    now_kst = datetime.datetime.now(KST).strftime("%Y-%m-%dT%H:%M:%S%z")
+    for vid, comment_id, parent_id, comment_text, author_name, author_channel_id, author_channel_url, comment_time_kst in rows:
+        new_values = {
+            "comment": comment_text or "",
+            "author_name": author_name or "",
+            "author_channel_url": author_channel_url or "",
+            "comment_time_kst": comment_time_kst or "",
+        }
+        old = existing.get(comment_id)
+        if old is None:
+            new_count += 1
+            revision_count = 0
+        else:
+            # old = (comment, author_name, author_channel_url, comment_time_kst, revised_contents, revision_count)
+            old_values = dict(zip(COMMENT_REVISION_FIELDS, (v or "" for v in old[:4])))
+            changes = [(key, old_values[key], new_values[key]) for key in COMMENT_REVISION_FIELDS if old_values[key] != new_values[key]]
+            # ID를 채운 예전 댓글에 revised_contents 문자열이 남아 있으면 수정 이력 테이블로 옮김
+            legacy = _parse_revised_contents(old[4] or "", COMMENT_REVISION_FIELDS)
+            if not changes and not legacy:
+                continue
+            revision_count = old[5] or 0
+            revisions.extend((comment_id, vid, revision_count + number, field, old_val, new_val, None) for number, field, old_val, new_val in legacy)
+            revision_count += max((r[0] for r in legacy), default=0)
+            if changes:
+                changed_count += 1
+                revision_count += 1
+                revisions.extend((comment_id, vid, revision_count, key, old_val, new_val, now_kst) for key, old_val, new_val in changes)
+        existing[comment_id] = (*new_values.values(), None, revision_count) # 같은 배치에 같은 댓글이 또 나오면 방금 값과 비교
+        upserts.append((
+            vid, comment_id, parent_id or "", new_values["comment"], new_values["author_name"],
+            author_channel_id or "", new_values["author_channel_url"], new_values["comment_time_kst"], revision_count,
+        ))
+
+    cursor.executemany(
+        "INSERT INTO comments (video_id, comment_id, parent_id, comment, author_name, author_channel_id, author_channel_url, comment_time_kst, revision_count) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT(comment_id) DO UPDATE SET parent_id = excluded.parent_id, comment = excluded.comment, author_name = excluded.author_name, "
+        "author_channel_url = excluded.author_channel_url, comment_time_kst = excluded.comment_time_kst, revised_contents = NULL, revision_count = excluded.revision_count",
+        upserts,
+    )
+    cursor.executemany(
+        "INSERT INTO comment_revisions (comment_id, video_id, revision, field, old_value, new_value, observed_kst) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        revisions,
+    )
+    conn.commit()
+    print(f"💬 [{video_id}] 댓글(+답글) {len(rows)}개 중 새 댓글 {new_count}개 / 수정된 댓글 {changed_count}개 저장 완료")
+
+def build_search_jobs(queries: List[dict]) -> List[dict]: # QUERIES 설정을 (검색어, 필터) 단위의 검색 작업 목록으로 펼침
+    jobs: List[dict] = []
+    known_by_query: Dict[str, Set[str]] = {}
+
+    for entry in queries:
+        query = entry["query"]
+        filter_names = entry.get("filters") or list(SEARCH_FILTERS)
+        for name in filter_names:
+            if name not in SEARCH_FILTERS:
+                print(f"[Error! [{query}] 알 수 없는 필터 이름: {name}]")
+                continue
+
+            # 조기 중단을 적용할 필터면 검색어별로 최근에 저장된 영상 ID를 한 번만 불러옴
+            known_ids: Optional[Set[str]] = None
+            if KNOWN_ID_EARLY_STOP > 0 and name in EARLY_STOP_FILTERS:
+                if query not in known_by_query:
+                    known_by_query[query] = load_recent_video_ids(KNOWN_ID_LOOKBACK_HOURS, query)
+                    print(f"📚 [{query}] 최근 {KNOWN_ID_LOOKBACK_HOURS}시간 안에 저장된 영상 수: {len(known_by_query[query])}개")
+                known_ids = known_by_query[query]
+
+            jobs.append({
+                "query": query,
+                "filter": name,
+                "sp": SEARCH_FILTERS[name],
+                "label": f"{query}/{name}",
+                "known_ids": known_ids,
+            })
+
+    return jobs
+
+
+def run_search_jobs(jobs: List[dict], on_found: Optional[Callable[[List[str]], None]] = None) -> Tuple[List[str], List[Tuple[str, str, str]]]: # 검색 작업들을 동시에 실행해 (중복 제거된 영상 ID, (vid, 검색어, 필터 이름) 목록) 반환 (DB는 사용하지 않음)
+    # on_found가 있으면 새로 찾은 영상 ID를 찾는 즉시 넘겨줌 (여러 필터에서 같은 영상이 중복으로 넘어갈 수 있음)
+    print(f"\n🧭 검색 작업 {len(jobs)}개 시작 (동시 {MAX_CONCURRENT_TABS}개)")
+    started = time.perf_counter()
+
+    results: Dict[int, List[str]] = {}
+    selenium_jobs = list(range(len(jobs)))
+
+    # http 방식: 스레드 여러 개로 동시에 요청하고, 실패한 작업만 selenium으로 대체
+    if DISCOVERY_BACKEND == "http":
+        def run_http_job(idx: int) -> Optional[List[str]]:
+            job = jobs[idx]
+            try:
+                return collect_video_ids_via_http(job["query"], job["sp"], job["known_ids"], job["label"], on_found)
+            except Exception as e:
+                print(f"[Error! [{job['label']}] http 검색 실패 --> selenium으로 대체]: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_TABS) as pool:
+            http_results = list(pool.map(run_http_job, range(len(jobs))))
+        selenium_jobs = [idx for idx, ids in enumerate(http_results) if ids is None]
+        results.update({idx: ids for idx, ids in enumerate(http_results) if ids is not None})
+
+    # selenium 방식: 하나의 크롬 안에서 여러 탭으로 동시에 스크롤
+    if selenium_jobs:
+        try:
+            tab_results = scroll_jobs_in_tabs([jobs[idx] for idx in selenium_jobs], on_found)
+        except Exception as e:
+            print(f"[Error! selenium 검색 실패]: {e}")
+            tab_results = {}
+        for pos, idx in enumerate(selenium_jobs):
+            results[idx] = tab_results.get(pos, [])
+
+    # 작업 순서대로 합치면서 중복 제거 (dict의 key 사용)
+    merged: Dict[str, None] = {}
+    found: List[Tuple[str, str, str]] = []
+    for idx, job in enumerate(jobs):
+        ids = results.get(idx, [])
+        new_count = sum(1 for vid in ids if vid not in merged)
+        for vid in ids:
+            merged.setdefault(vid)
+            found.append((vid, job["query"], job["filter"]))
+        print(f"  --> [{job['label']}] 영상 수: {len(ids)}개 (새로 추가: {new_count}개)")
+
+    print(f"\n📦 모든 검색어와 필터 합산 후 중복 제거된 영상 수: {len(merged)}개 / 소요 시간: {time.perf_counter() - started:.1f}초")
+    print(f"📶 검색 결과 수집: 페이지(요청) {crawl_stats['pages']}개 / 받은 데이터 {crawl_stats['bytes'] / 1024:.0f}KB / 로딩 시간 합계 {crawl_stats['load_sec']:.1f}초")
+    return list(merged), found
+
+
+def collect_video_ids_for_queries(queries: List[dict]) -> List[str]: # 모든 검색어와 필터의 검색 결과를 동시에 수집해 합치고 video_queries에 기록
+    jobs = build_search_jobs(queries)
+    video_ids, found = run_search_jobs(jobs)
+    record_video_queries(found)
+    return video_ids
+
+##### 전체 파이프라인 #####
+
+def run_pipeline(queries: List[dict]):
+    # 모든 검색어와 필터의 결과를 합친 뒤 영상 하나당 메타데이터와 댓글을 한 번씩만 처리
+    video_ids = collect_video_ids_for_queries(queries)
+    started = time.perf_counter()
+
+    # 메타데이터 추출은 여러 스레드에서 동시에 진행하고, 끝나는 순서대로 이 스레드에서 DB 저장
+    stored_ids: List[str] = []
+    for idx, (vid, info, error, extract_sec) in enumerate(iter_video_infos(video_ids), 1):
+        print(f"\n====== {idx} / {len(video_ids)} 처리 중: {vid} ======")
+        if store_video_metadata(vid, info, error, extract_sec):
+            stored_ids.append(vid)
+    flush_video_writes()
+
+    # 댓글은 저장한 영상 전체를 대상으로 남은 할당량에 맞춰 순서를 정한 뒤 동시에 수집
+    print(f"\n====== 댓글 수집: 영상 {len(stored_ids)}개 (동시 수집 {COMMENT_WORKERS}개) ======")
+    collect_comments_for_videos(stored_ids)
+
+    if metadata_stats["videos"]:
+        print(f"\n⏱️ 메타데이터 추출: 영상 {metadata_stats['videos']}개 / 영상당 평균 {metadata_stats['extract_sec'] / metadata_stats['videos']:.2f}초 / 메타데이터+댓글 단계 소요 시간 {time.perf_counter() - started:.1f}초 (동시 추출 {METADATA_WORKERS}개)")
+
+async def _run_streaming_pipeline(queries: List[dict]) -> None: # 검색 --> 메타데이터 --> 댓글 단계를 asyncio 큐로 연결해 동시에 진행
+    # 네트워크를 기다리는 작업(selenium, http, yt-dlp, API)은 단계별 스레드 풀에서 실행하고,
+    # DB 저장은 모두 이 이벤트 루프(메인 스레드)에서만 실행해 sqlite 연결을 하나로 유지
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    first_stored: List[float] = [] # 첫 영상을 저장한 시점 (검색 시작 기준, 초)
+    stored_count = [0]
+
+    id_queue: asyncio.Queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)       # 검색 --> 메타데이터
+    ytdlp_queue: asyncio.Queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)    # 메타데이터(api가 돌려주지 않은 영상) --> yt-dlp
+    comment_queue: asyncio.PriorityQueue = asyncio.PriorityQueue(maxsize=STREAM_QUEUE_SIZE)  # 메타데이터 --> 댓글 ((우선순위, 순번, vid), 작을수록 먼저)
+    comment_seq = [0]
+
+    discovery_pool = ThreadPoolExecutor(max_workers=1)
+    metadata_pool = ThreadPoolExecutor(max_workers=max(METADATA_WORKERS, 1))
+    comment_pool = ThreadPoolExecutor(max_workers=max(COMMENT_WORKERS, 1))
+
+    jobs = build_search_jobs(queries) # DB 조회가 있으므로 메인 스레드에서 미리 준비
+
+    def on_found(ids: List[str]) -> None: # 검색 스레드에서 호출: 큐가 가득 차 있으면 빌 때까지 검색을 멈추고 기다림
+        for vid in ids:
+            asyncio.run_coroutine_threadsafe(id_queue.put(vid), loop).result()
+
+    async def discovery() -> None:
+        try:
+            _, found = await loop.run_in_executor(discovery_pool, run_search_jobs, jobs, on_found)
+            record_video_queries(found)
+        except Exception as e:
+            print(f"[Error! 검색 단계 실패]: {e}")
+        finally:
+            await id_queue.put(None) # 검색 종료 신호
+
+    async def store_and_forward(vid: str, info: Optional[dict], error: Optional[Exception], extract_sec: float) -> None:
+        try:
+            ok = store_video_metadata(vid, info, error, extract_sec)
+        except Exception as e:
+            print(f"[Error! 메타데이터 저장 실패] {vid}: {e}")
+            return
+        if ok:
+            stored_count[0] += 1
+            if not first_stored:
+                first_stored.append(time.perf_counter() - started)
+                print(f"⏱️ 검색 시작 후 첫 영상 저장까지: {first_stored[0]:.1f}초")
+
+            # 댓글 사용이 중지되었거나 댓글 수가 지난번과 같으면 건너뜀
+            if not should_fetch_comments(vid):
+                return
+
+            # 남은 할당량이 적으면 새 댓글이 많을 것으로 예상되는 영상부터, 새 댓글이 없을 영상은 건너뜀
+            priority = 0
+            if get_remaining_api_quota() < API_QUOTA_LOW:
+                expected = expected_new_comments(vid)
+                if expected == 0:
+                    print(f"  --> 남은 API 할당량이 적고 새 댓글이 없을 것으로 예상되어 댓글 수집 건너뜀: {vid}")
+                    return
+                priority = -expected
+            comment_seq[0] += 1
+            await comment_queue.put((priority, comment_seq[0], vid))
+
+    async def metadata_dispatcher() -> None: # 중복을 걸러내고, api 방식이면 최대 50개씩 묶어 videos.list 호출, 나머지는 yt-dlp 작업자에게 전달
+        seen: Set[str] = set()
+        batch: List[str] = []
+
+        async def flush() -> None:
+            if not batch:
+                return
+            chunk = list(batch)
+            batch.clear()
+            call_started = time.perf_counter()
+            infos = await loop.run_in_executor(metadata_pool, fetch_video_infos_via_api, chunk)
+            per_video = (time.perf_counter() - call_started) / max(len(infos), 1)
+            for vid in chunk:
+                if vid in infos:
+                    await store_and_forward(vid, infos[vid], None, per_video)
+                else:
+                    await ytdlp_queue.put(vid) # api가 돌려주지 않은 영상은 yt-dlp로 대체
+
+        while True:
+            if METADATA_BACKEND == "api" and batch:
+                try:
+                    vid = await asyncio.wait_for(id_queue.get(), timeout=STREAM_BATCH_WAIT)
+                except asyncio.TimeoutError:
+                    await flush()
+                    continue
+            else:
+                vid = await id_queue.get()
+            if vid is None:
+                break
+            if vid in seen:
+                continue
+            seen.add(vid)
+
+            if METADATA_BACKEND == "api":
+                batch.append(vid)
+                if len(batch) >= 50:
+                    await flush()
+            else:
+                await ytdlp_queue.put(vid)
+
+        await flush()
+        for _ in range(max(METADATA_WORKERS, 1)):
+            await ytdlp_queue.put(None) # yt-dlp 작업자 종료 신호
+
+    async def ytdlp_worker() -> None:
+        while True:
+            vid = await ytdlp_queue.get()
+            if vid is None:
+                break
+            result = await loop.run_in_executor(metadata_pool, _extract_video_info_timed, vid)
+            await store_and_forward(*result)
+
+    async def comment_worker() -> None:
+        while True:
+            _, _, vid = await comment_queue.get()
+            if vid is None:
+                break
+            print(f"  --> 댓글 수집 시작 (YouTube Data API v3): {vid}")
+            try:
+                # 한 페이지씩 스레드에서 받아오고, 받은 페이지는 이벤트 루프에서 바로 저장
+                watermark = load_comment_watermark(vid)
+                result: dict = {}
+                pages = iter_comment_pages(vid, watermark, result)
+                while True:
+                    rows = await loop.run_in_executor(comment_pool, next, pages, None)
+                    if rows is None:
+                        break
+                    store_comments(vid, rows)
+                finish_comment_fetch(vid, watermark, result)
+            except Exception as e:
+                print(f"[Error! 댓글 수집 실패] {vid}: {e}")
+
+    async def commit_timer() -> None: # 새 영상이 들어오지 않아도 모아 둔 메타데이터가 COMMIT_BATCH_SECONDS보다 오래되면 커밋
+        while True:
+            await asyncio.sleep(min(COMMIT_BATCH_SECONDS, 1.0))
+            try:
+                flush_video_writes(force=False)
+            except Exception as e:
+                print(f"[Error! 메타데이터 저장 실패]: {e}")
+
+    timer_task = asyncio.create_task(commit_timer())
+    try:
+        comment_tasks = [asyncio.create_task(comment_worker()) for _ in range(max(COMMENT_WORKERS, 1))]
+        ytdlp_tasks = [asyncio.create_task(ytdlp_worker()) for _ in range(max(METADATA_WORKERS, 1))]
+        await asyncio.gather(discovery(), metadata_dispatcher(), *ytdlp_tasks)
+        flush_video_writes() # 메타데이터 단계가 끝났으므로 남은 묶음 커밋
+        for _ in comment_tasks:
+            comment_seq[0] += 1
+            await comment_queue.put((float("inf"), comment_seq[0], None)) # 댓글 작업자 종료 신호 (남은 영상을 모두 처리한 뒤)
+        await asyncio.gather(*comment_tasks)
+    finally:
+        timer_task.cancel()
+        discovery_pool.shutdown(wait=False)
+        metadata_pool.shutdown(wait=False)
+        comment_pool.shutdown(wait=False)
+
+    print(f"\n⏱️ 전체 소요 시간: {time.perf_counter() - started:.1f}초 / 저장한 영상 수: {stored_count[0]}개")
+    if metadata_stats["videos"]:
+        print(f"⏱️ 메타데이터 추출: 영상 {metadata_stats['videos']}개 / 영상당 평균 {metadata_stats['extract_sec'] / metadata_stats['videos']:.2f}초")
+
+
+def run_streaming_pipeline(queries: List[dict]):
+    asyncio.run(_run_streaming_pipeline(queries))
+
+##### main #####
+
+if __name__ == "__main__":
+    try:
+        if PIPELINE_MODE == "streaming":
+            run_streaming_pipeline(QUERIES)
+        else:
+            run_pipeline(QUERIES)
+    finally:
+        try:
+            flush_video_writes() # 아직 커밋하지 않은 메타데이터 저장
+        except Exception as e:
+            print(f"[Error! 메타데이터 저장 실패]: {e}")
+        release_api_quota()
+        print_api_stats()
+        print_db_stats()
+        print_write_stats()
+        print_comment_gate_stats()
+        release_driver()
+        release_ydl()
+        conn.close()
+        print("\n✅ 종료")
\ No newline at end of file